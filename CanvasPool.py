@@ -0,0 +1,45 @@
+import queue
+import matplotlib
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+
+class CanvasPool:
+    # Agg figures of one size handed out and taken back, cleared in between.
+    # No pyplot state is touched, so threads can each draw on their own
+    # figure. A figure that is never released is simply garbage collected
+
+    def __init__(self, width, height, size=8):
+        self.width = width
+        self.height = height
+        self.figures = queue.LifoQueue(maxsize=size)
+
+    def acquire(self):
+        try:
+            fig = self.figures.get_nowait()
+        except queue.Empty:
+            fig = Figure(figsize=(self.width, self.height))
+            FigureCanvasAgg(fig)
+        return fig, fig.add_subplot()
+
+    def acquireGrid(self, rows, cols):
+        # Same figure with a rows x cols grid of axes instead of one
+        fig, ax = self.acquire()
+        ax.remove()
+        return fig, fig.subplots(rows, cols, squeeze=False)
+
+    def release(self, fig):
+        fig.clear()
+        # clear() keeps the layout, so put back what tight_layout and
+        # subplots_adjust changed
+        fig.set_size_inches(self.width, self.height)
+        fig.subplots_adjust(
+            **{
+                param: matplotlib.rcParams[f"figure.subplot.{param}"]
+                for param in ["left", "bottom", "right", "top", "wspace", "hspace"]
+            }
+        )
+        try:
+            self.figures.put_nowait(fig)
+        except queue.Full:
+            pass
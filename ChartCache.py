@@ -0,0 +1,82 @@
+import os
+import json
+import shutil
+from pathlib import Path
+
+
+class ChartCache:
+    # Rendered slide images keyed by a hash of everything that went into
+    # them. Each entry is a png plus a small json with the path the slide is
+    # written to and any player lists the stat picked. A native chart has
+    # no png, its chart data is kept in the json. Least recently used
+    # entries are dropped once the directory grows past maxBytes
+
+    def __init__(self, path=".chart_cache", maxBytes=512 * 1024 * 1024):
+        self.path = Path(path)
+        self.maxBytes = maxBytes
+        self.totalBytes = None
+
+    def getEntryPaths(self, key):
+        return self.path / f"{key}.png", self.path / f"{key}.json"
+
+    def get(self, key):
+        imagePath, metaPath = self.getEntryPaths(key)
+        try:
+            with open(metaPath) as f:
+                entry = json.load(f)
+            if isinstance(entry["path"], str):
+                Path(entry["path"]).parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(imagePath, entry["path"])
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        # Touch the entry so eviction sees it as recently used
+        os.utime(metaPath)
+        return entry
+
+    def put(self, key, statPath, state):
+        self.path.mkdir(parents=True, exist_ok=True)
+        imagePath, metaPath = self.getEntryPaths(key)
+        size = 0
+        # Copy then rename so a reader never sees half an entry
+        if isinstance(statPath, str):
+            tmpPath = imagePath.with_name(f"{key}.png.tmp")
+            shutil.copyfile(statPath, tmpPath)
+            os.replace(tmpPath, imagePath)
+            size += imagePath.stat().st_size
+        tmpPath = metaPath.with_name(f"{key}.json.tmp")
+        with open(tmpPath, "w") as f:
+            json.dump({"path": statPath, "state": state}, f)
+        os.replace(tmpPath, metaPath)
+        size += metaPath.stat().st_size
+
+        if self.totalBytes is None:
+            self.totalBytes = sum(size for _, size, _ in self.getEntries())
+        else:
+            self.totalBytes += size
+        if self.totalBytes > self.maxBytes:
+            self.evict()
+
+    def getEntries(self):
+        # (last used, bytes, key) for every entry on disk
+        entries = []
+        for metaPath in self.path.glob("*.json"):
+            imagePath = metaPath.with_suffix(".png")
+            try:
+                lastUsed = metaPath.stat().st_mtime
+                size = metaPath.stat().st_size
+                if imagePath.exists():
+                    size += imagePath.stat().st_size
+            except FileNotFoundError:
+                continue
+            entries.append((lastUsed, size, metaPath.stem))
+        return entries
+
+    def evict(self):
+        entries = sorted(self.getEntries())
+        self.totalBytes = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if self.totalBytes <= self.maxBytes:
+                break
+            for entryPath in self.getEntryPaths(key):
+                entryPath.unlink(missing_ok=True)
+            self.totalBytes -= size
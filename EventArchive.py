@@ -0,0 +1,269 @@
+import json
+import os
+import argparse
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from EventTable import EventTable, Dimension
+
+
+class EventArchive:
+    # One flat binary file per column; the manifest holds the row counts,
+    # the games and the dimension names that the integer ids point into
+    eventColumns = {
+        "game": np.int32,
+        "id": np.int32,
+        "start": np.float64,
+        "end": np.float64,
+        "code": np.int32,
+        "xStart": np.float32,
+        "yStart": np.float32,
+        "xEnd": np.float32,
+        "yEnd": np.float32,
+    }
+    labelColumns = {
+        "event": np.int32,
+        "group": np.int32,
+        "value": np.int32,
+    }
+    # The table's timeline key, kept so opening never rebuilds it
+    indexColumns = {"timeKey": np.float64}
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.manifestPath = self.path / "manifest.json"
+        if self.manifestPath.is_file():
+            with open(self.manifestPath) as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = {
+                "games": [],
+                "eventCount": 0,
+                "labelCount": 0,
+                "codes": [],
+                "groups": [],
+                "values": [],
+            }
+
+    @staticmethod
+    def getSourceKey(xmlFile):
+        xmlFile = Path(xmlFile)
+        fileStat = xmlFile.stat()
+        return f"{xmlFile.resolve()}:{fileStat.st_size}:{fileStat.st_mtime_ns}"
+
+    @staticmethod
+    def getGameSource(game):
+        # The archive keeps each game's source key, otherwise stat the file
+        source = getattr(game, "source", None)
+        if source is None:
+            try:
+                source = EventArchive.getSourceKey(game.file)
+            except FileNotFoundError:
+                source = Path(game.file).name
+        return source
+
+    @staticmethod
+    def getSourcePath(source):
+        # The resolved path a source key was taken from
+        return source.rsplit(":", 2)[0]
+
+    @staticmethod
+    def addSourceArgument(parser):
+        parser.add_argument(
+            "source", help="Folder of XML files or an event archive directory"
+        )
+
+    @classmethod
+    def openSource(cls, source):
+        # The table of an archive directory, or of every XML file in a folder
+        archive = cls(source)
+        if archive.manifestPath.is_file():
+            return archive.open()
+        return EventTable(sorted(archive.path.glob("*.xml")))
+
+    def append(self, xmlFiles):
+        # Games are keyed by resolved path, so a file that changed since it
+        # was archived replaces its old game instead of being added twice
+        archived = {
+            self.getSourcePath(game["source"]): game["source"]
+            for game in self.manifest["games"]
+        }
+        sources = {str(f): self.getSourceKey(f) for f in xmlFiles}
+        newFiles = [
+            f
+            for f in xmlFiles
+            if archived.get(self.getSourcePath(sources[str(f)])) != sources[str(f)]
+        ]
+        replaced = {self.getSourcePath(sources[str(f)]) for f in newFiles}
+        keep = np.array(
+            [
+                self.getSourcePath(game["source"]) not in replaced
+                for game in self.manifest["games"]
+            ],
+            dtype=bool,
+        )
+        if not keep.all() or not self.hasTimeKey():
+            self.compact(keep)
+        if not newFiles:
+            return 0
+        table = EventTable(newFiles)
+
+        dimensions = {
+            name: Dimension(self.manifest[name])
+            for name in ["codes", "groups", "values"]
+        }
+        gameOffset = len(self.manifest["games"])
+        events, labels = table.remapped(
+            dimensions["codes"],
+            dimensions["groups"],
+            dimensions["values"],
+            gameOffset,
+            self.manifest["eventCount"],
+        )
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.writeColumns("events", self.eventColumns, events, "eventCount")
+        self.writeColumns("labels", self.labelColumns, labels, "labelCount")
+        self.writeColumns(
+            "events",
+            self.indexColumns,
+            {"timeKey": EventTable.getTimeKey(events["game"], events["start"])},
+            "eventCount",
+        )
+
+        for game in table.games.itertuples():
+            self.manifest["games"].append(
+                {
+                    "game": gameOffset + game.game,
+                    "file": game.file,
+                    "date": game.date,
+                    "source": sources[game.file],
+                }
+            )
+        self.manifest["eventCount"] += len(table)
+        self.manifest["labelCount"] += len(labels["event"])
+        for name in ["codes", "groups", "values"]:
+            self.manifest[name] = dimensions[name].names
+        self.saveManifest()
+        return len(table.games)
+
+    def saveManifest(self):
+        # Write then rename so a crash never leaves a half written manifest
+        tmpPath = self.manifestPath.with_suffix(".tmp")
+        with open(tmpPath, "w") as f:
+            json.dump(self.manifest, f)
+        os.replace(tmpPath, self.manifestPath)
+
+    def hasTimeKey(self):
+        # Archives written before the timeline key was kept lack the column
+        path = self.path / "events.timeKey.bin"
+        committed = self.manifest["eventCount"] * np.dtype(np.float64).itemsize
+        return path.is_file() and path.stat().st_size >= committed
+
+    def compact(self, keep):
+        # Rewrite every column with only the kept games, renumbered in
+        # order, and a fresh timeline key. Each column is written aside and
+        # renamed into place, then the manifest
+        if not self.manifestPath.is_file():
+            return
+        table = self.open()
+        keepEvents = keep[table.events["game"]]
+        keepLabels = keepEvents[table.labels["event"]]
+        newGames = np.cumsum(keep) - 1
+        newRows = np.cumsum(keepEvents) - 1
+        events = {
+            column: table.events[column][keepEvents] for column in self.eventColumns
+        }
+        events["game"] = newGames[events["game"]]
+        labels = {
+            column: table.labels[column][keepLabels] for column in self.labelColumns
+        }
+        labels["event"] = newRows[labels["event"]]
+        index = {"timeKey": EventTable.getTimeKey(events["game"], events["start"])}
+        # Let go of the memmaps before renaming over their files
+        del table
+        tmpPaths = {}
+        for prefix, columns, arrays in [
+            ("events", self.eventColumns, events),
+            ("labels", self.labelColumns, labels),
+            ("events", self.indexColumns, index),
+        ]:
+            for column, dtype in columns.items():
+                columnPath = self.path / f"{prefix}.{column}.bin"
+                tmpPaths[columnPath] = columnPath.with_suffix(".tmp")
+                np.ascontiguousarray(arrays[column], dtype=dtype).tofile(
+                    tmpPaths[columnPath]
+                )
+        for columnPath, tmpPath in tmpPaths.items():
+            os.replace(tmpPath, columnPath)
+        self.manifest["games"] = [
+            dict(game, game=int(newGames[i]))
+            for i, game in enumerate(self.manifest["games"])
+            if keep[i]
+        ]
+        self.manifest["eventCount"] = len(events["game"])
+        self.manifest["labelCount"] = len(labels["event"])
+        self.saveManifest()
+
+    def writeColumns(self, prefix, columns, arrays, countKey):
+        for column, dtype in columns.items():
+            columnPath = self.path / f"{prefix}.{column}.bin"
+            # Drop rows left behind by an append that never reached the manifest
+            committed = self.manifest[countKey] * np.dtype(dtype).itemsize
+            with open(columnPath, "ab") as f:
+                f.truncate(committed)
+                np.ascontiguousarray(arrays[column], dtype=dtype).tofile(f)
+
+    def mapColumn(self, name, dtype, count):
+        if count == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(self.path / name, dtype=dtype, mode="r", shape=(count,))
+
+    def open(self):
+        # Columns are memory mapped read only, nothing is copied until a
+        # stat actually touches the pages it needs
+        events = {
+            column: self.mapColumn(
+                f"events.{column}.bin", dtype, self.manifest["eventCount"]
+            )
+            for column, dtype in self.eventColumns.items()
+        }
+        labels = {
+            column: self.mapColumn(
+                f"labels.{column}.bin", dtype, self.manifest["labelCount"]
+            )
+            for column, dtype in self.labelColumns.items()
+        }
+        games = pd.DataFrame(
+            self.manifest["games"], columns=["game", "file", "date", "source"]
+        )
+        timeKey = None
+        if self.hasTimeKey():
+            timeKey = self.mapColumn(
+                "events.timeKey.bin", np.float64, self.manifest["eventCount"]
+            )
+        return EventTable.fromColumns(
+            games,
+            events,
+            labels,
+            Dimension(self.manifest["codes"]),
+            Dimension(self.manifest["groups"]),
+            Dimension(self.manifest["values"]),
+            timeKey,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Append match XML files to a memory mapped event archive"
+    )
+    parser.add_argument("archive", help="Archive directory, created if missing")
+    parser.add_argument("folder", help="Path to folder containing XML files")
+    args = parser.parse_args()
+    archive = EventArchive(args.archive)
+    added = archive.append(sorted(Path(args.folder).glob("*.xml")))
+    print(f"Added {added} games, {len(archive.manifest['games'])} in archive")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+import sys
+import time
+import hashlib
+import argparse
+import numpy as np
+from EventArchive import EventArchive
+from PitchGrid import PitchGrid
+
+
+class EventCube:
+    # Event counts pre-aggregated over team, game, code, player and pitch
+    # zone, and the same again per label (group, value). Cells are sparse:
+    # one row per distinct combination with its count and the first event
+    # row it came from, so counts come out in the order an event scan would
+    # have found them. Per code, the game, player, zone and team rollups are
+    # dense arrays, so counting one code is a row lookup.
+    #
+    # Team is the team whose name starts the code, player the first Player
+    # label and zone the PitchGrid cell of the start location, all as the
+    # stats read them. A label count matches labelMask(group, value); events
+    # with two label conditions at once still need the event table
+    cellDims = ["team", "game", "code", "player", "zone"]
+    rollupDims = ["game", "player", "zone", "team"]
+    tryZone = 20
+    fieldWidth = 68
+
+    def __init__(self, table, grid="channels"):
+        self.table = table
+        self.grid = PitchGrid(grid)
+        keys = self.getEventKeys(table)
+        rows = np.arange(len(table), dtype=np.int64)
+        self.cells = self.aggregate(keys, rows, np.ones(len(table), dtype=np.int64))
+
+        # Each (event, group, value) once, like labelMask
+        events, groups, values = np.unique(
+            np.stack(
+                [
+                    np.asarray(table.labels[column], dtype=np.int64)
+                    for column in ["event", "group", "value"]
+                ]
+            ),
+            axis=1,
+        )
+        labelKeys = {dim: keys[dim][events] for dim in self.cellDims}
+        labelKeys["group"] = groups
+        labelKeys["value"] = values
+        self.labelCells = self.aggregate(
+            labelKeys, events, np.ones(len(events), dtype=np.int64)
+        )
+        self.buildRollups()
+
+    @classmethod
+    def fromCells(cls, table, cells, labelCells, grid="channels"):
+        cube = cls.__new__(cls)
+        cube.table = table
+        cube.grid = PitchGrid(grid)
+        cube.cells = cells
+        cube.labelCells = labelCells
+        cube.buildRollups()
+        return cube
+
+    def getEventKeys(self, table):
+        # Cube coordinates of every event
+        codes = np.asarray(table.events["code"], dtype=np.int64)
+        return {
+            "team": table.codeTeams()[codes],
+            "game": np.asarray(table.events["game"], dtype=np.int64),
+            "code": codes,
+            "player": table.labelCodes("Player").astype(np.int64),
+            "zone": self.grid.cellIndex(
+                table.events["xStart"] + self.tryZone,
+                self.fieldWidth - table.events["yStart"],
+            ),
+        }
+
+    @staticmethod
+    def aggregate(columns, first, counts):
+        # Sum counts over rows with the same key columns, keeping the
+        # smallest first row of each
+        names = list(columns)
+        if len(first) == 0:
+            cells = {name: np.zeros(0, dtype=np.int32) for name in names}
+            cells["count"] = np.zeros(0, dtype=np.int64)
+            cells["first"] = np.zeros(0, dtype=np.int64)
+            return cells
+        keys = np.stack([np.asarray(columns[name], dtype=np.int64) for name in names])
+        order = np.lexsort(keys[::-1])
+        keys = keys[:, order]
+        starts = np.flatnonzero(
+            np.concatenate([[True], np.any(keys[:, 1:] != keys[:, :-1], axis=0)])
+        )
+        cells = {name: keys[i, starts].astype(np.int32) for i, name in enumerate(names)}
+        cells["count"] = np.add.reduceat(counts[order], starts)
+        cells["first"] = np.minimum.reduceat(first[order], starts)
+        return cells
+
+    def getAxis(self, dim):
+        # Ids along a rollup's second axis
+        match dim:
+            case "game":
+                return np.arange(len(self.table.games))
+            case "zone":
+                return np.arange(self.grid.cellCount())
+            case _:
+                ids = self.cells[dim]
+                return np.unique(ids[ids >= 0])
+
+    def buildRollups(self):
+        # (counts, first rows) of shape (codes, axis) for each rollup dim
+        self.axes = {}
+        self.rollups = {}
+        codes = self.cells["code"]
+        for dim in self.rollupDims:
+            axis = self.getAxis(dim)
+            ids = self.cells[dim]
+            keep = (ids >= 0) & (codes >= 0)
+            index = np.searchsorted(axis, ids[keep])
+            counts = np.zeros((len(self.table.codes), len(axis)), dtype=np.int64)
+            first = np.full(counts.shape, np.iinfo(np.int64).max)
+            np.add.at(counts, (codes[keep], index), self.cells["count"][keep])
+            np.minimum.at(first, (codes[keep], index), self.cells["first"][keep])
+            self.axes[dim] = axis
+            self.rollups[dim] = (counts, first)
+
+    def select(
+        self, code=None, label=None, team=None, player=None, zone=None, games=None
+    ):
+        # Cells and the mask of those matching every filter. label is a
+        # (group, value) pair, games a boolean mask over the table's games
+        table = self.table
+        if label is None:
+            cells = self.cells
+            mask = np.ones(len(cells["count"]), dtype=bool)
+            names = []
+        else:
+            cells = self.labelCells
+            mask = np.ones(len(cells["count"]), dtype=bool)
+            names = [("group", label[0], table.groups), ("value", label[1], table.values)]
+        names += [
+            ("code", code, table.codes),
+            ("team", team, table.values),
+            ("player", player, table.values),
+        ]
+        for dim, name, dimension in names:
+            if name is not None:
+                mask &= cells[dim] == dimension.lookup(name)
+        if zone is not None:
+            mask &= cells["zone"] == zone
+        if games is not None:
+            mask &= np.asarray(games, dtype=bool)[cells["game"]]
+        return cells, mask
+
+    def totals(self, dim, **filters):
+        # Count and first row per id along a rollup dim, straight out of the
+        # rollup when the only filter is a known code
+        axis = self.axes[dim]
+        code = self.table.codes.lookup(filters.get("code"))
+        if filters.keys() == {"code"} and code >= 0:
+            counts, first = self.rollups[dim]
+            return axis, counts[code], first[code]
+        cells, mask = self.select(**filters)
+        ids = cells[dim][mask]
+        keep = ids >= 0
+        index = np.searchsorted(axis, ids[keep])
+        counts = np.bincount(
+            index, weights=cells["count"][mask][keep], minlength=len(axis)
+        ).astype(np.int64)
+        first = np.full(len(axis), np.iinfo(np.int64).max)
+        np.minimum.at(first, index, cells["first"][mask][keep])
+        return axis, counts, first
+
+    def count(self, **filters):
+        cells, mask = self.select(**filters)
+        return int(cells["count"][mask].sum())
+
+    def countBy(self, dim, **filters):
+        # {name: count} over one dimension, first seen first like countCodes
+        if dim not in self.axes:
+            # Any other dimension, e.g. "code" or "value" of a label
+            cells, mask = self.select(**filters)
+            grouped = self.aggregate(
+                {dim: cells[dim][mask]}, cells["first"][mask], cells["count"][mask]
+            )
+            ids, counts, first = grouped[dim], grouped["count"], grouped["first"]
+            keep = ids >= 0
+            ids, counts, first = ids[keep], counts[keep], first[keep]
+        else:
+            ids, counts, first = self.totals(dim, **filters)
+            keep = counts > 0
+            ids, counts, first = ids[keep], counts[keep], first[keep]
+        order = np.argsort(first, kind="stable")
+        return dict(zip(self.decode(dim, ids[order]), counts[order].tolist()))
+
+    def gameCounts(self, **filters):
+        # Count per game of the table, zeros included
+        return self.totals("game", **filters)[1]
+
+    def zoneCounts(self, **filters):
+        # Counts shaped like PitchGrid.bin for the cube's grid
+        counts = self.totals("zone", **filters)[1]
+        return counts.reshape(len(self.grid.xEdges) - 1, len(self.grid.yEdges) - 1)
+
+    def decode(self, dim, ids):
+        table = self.table
+        match dim:
+            case "code":
+                return table.codes.decode(ids).tolist()
+            case "group":
+                return table.groups.decode(ids).tolist()
+            case "game":
+                return table.games["date"].to_numpy()[ids].tolist()
+            case "zone":
+                # Metres along then across the pitch of each cell
+                xEdges, yEdges = self.grid.xEdges, self.grid.yEdges
+                cells = [divmod(int(id), len(yEdges) - 1) for id in ids]
+                return [
+                    f"{xEdges[x]:g}-{xEdges[x + 1]:g} x {yEdges[y]:g}-{yEdges[y + 1]:g}"
+                    for x, y in cells
+                ]
+            case _:
+                return table.values.decode(ids).tolist()
+
+    def save(self, path, sourceKey):
+        np.savez(
+            path,
+            sourceKey=sourceKey,
+            **{f"cells.{name}": column for name, column in self.cells.items()},
+            **{f"labels.{name}": column for name, column in self.labelCells.items()},
+        )
+
+    @classmethod
+    def openArchive(cls, archive, table):
+        # The archive's saved cube, rebuilt and saved again whenever the
+        # archive's games are not the ones it was built from
+        path = archive.path / "cube.npz"
+        sources = "\n".join(game["source"] for game in archive.manifest["games"])
+        sourceKey = hashlib.sha1(sources.encode()).hexdigest()
+        cube = cls.load(path, table, sourceKey)
+        if cube is None:
+            cube = cls(table)
+            cube.save(path, sourceKey)
+        return cube
+
+    @classmethod
+    def openSource(cls, source):
+        # EventArchive.openSource's table, with the cube saved alongside
+        # when the source is an archive
+        archive = EventArchive(source)
+        if archive.manifestPath.is_file():
+            return cls.openArchive(archive, archive.open())
+        return cls(EventArchive.openSource(source))
+
+    @classmethod
+    def load(cls, path, table, sourceKey, grid="channels"):
+        # The saved cube if it was built from these sources, else None
+        try:
+            saved = np.load(path)
+        except FileNotFoundError:
+            return None
+        with saved:
+            if "sourceKey" not in saved.files or saved["sourceKey"] != sourceKey:
+                return None
+            cells = {}
+            labelCells = {}
+            for key in saved.files:
+                prefix, _, name = key.partition(".")
+                if prefix == "cells":
+                    cells[name] = saved[key]
+                elif prefix == "labels":
+                    labelCells[name] = saved[key]
+        return cls.fromCells(table, cells, labelCells, grid)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Count events from the pre-aggregated cube, optionally broken down by one dimension"
+    )
+    EventArchive.addSourceArgument(parser)
+    parser.add_argument("--code", help="Event code, e.g. 'Chicago Hounds Kick'")
+    parser.add_argument("--label", help="One label filter as Group=Value")
+    parser.add_argument("--team", help="Team the code belongs to")
+    parser.add_argument("--player", help="First Player label")
+    parser.add_argument("--from", dest="start", help="First game date, YYYY-MM-DD")
+    parser.add_argument("--to", dest="end", help="Last game date, YYYY-MM-DD")
+    parser.add_argument(
+        "--by",
+        help="Break the count down by team, game, code, player, zone, or the label's value",
+    )
+    args = parser.parse_args()
+
+    cube = EventCube.openSource(args.source)
+    table = cube.table
+
+    filters = {"code": args.code, "team": args.team, "player": args.player}
+    if args.label:
+        if "=" not in args.label:
+            parser.error("--label looks like Group=Value")
+        filters["label"] = tuple(args.label.split("=", 1))
+    if args.start or args.end:
+        dates = table.games["date"]
+        games = np.ones(len(table.games), dtype=bool)
+        if args.start:
+            games &= (dates >= args.start).to_numpy()
+        if args.end:
+            games &= (dates <= args.end).to_numpy()
+        filters["games"] = games
+    filters = {name: value for name, value in filters.items() if value is not None}
+
+    start = time.perf_counter()
+    if args.by:
+        for name, count in cube.countBy(args.by, **filters).items():
+            print(f"{name}\t{count}")
+    else:
+        print(cube.count(**filters))
+    elapsed = (time.perf_counter() - start) * 1000
+    print(
+        f"{len(cube.cells['count'])} cells, {len(cube.labelCells['count'])} label cells over {len(table)} events, {elapsed:.1f} ms",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
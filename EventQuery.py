@@ -0,0 +1,181 @@
+import re
+import sys
+import time
+import argparse
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from EventArchive import EventArchive
+
+
+class EventQuery:
+    # Filters are "field op value" terms that are all ANDed together:
+    #   code=Chicago Hounds Kick       code, any of a|b|c
+    #   code~Kick                      code containing the text
+    #   Kick Descriptor=Low|Bomb       label group with any of the values
+    #   Kick Descriptor!=Touch Kick    label group without the value
+    #   Player~Chicago                 label value containing the text
+    #   Maul Metres=5..                numeric label value in a range
+    #   player=Chicago Player 9        first Player label, like the stats
+    #   xStart=..22 start=2400..       event column in a range, either end open
+    #   date=2024-03-01..2024-04-30    game date range, or one date
+    termPattern = re.compile(r"^(?P<field>[^=!~]+?)\s*(?P<op>!=|=|~)\s*(?P<value>.*)$")
+    eventColumns = ["start", "end", "xStart", "yStart", "xEnd", "yEnd"]
+
+    def __init__(self, table):
+        self.table = table
+
+    def getMask(self, terms):
+        mask = np.ones(len(self.table), dtype=bool)
+        for term in terms:
+            mask &= self.getTermMask(term)
+        return mask
+
+    def getTermMask(self, term):
+        table = self.table
+        match = self.termPattern.match(term)
+        if match is None:
+            raise ValueError(f"Can't read filter {term!r}, expected field=value")
+        field, op, value = match.group("field", "op", "value")
+        if field == "date":
+            if op != "=":
+                raise ValueError(f"Dates only take = ranges, got {term!r}")
+            games = self.getRangeMask(table.games["date"].to_numpy(), value, str)
+            return games[table.events["game"]]
+        if field in self.eventColumns:
+            if op != "=":
+                raise ValueError(f"{field} only takes = ranges, got {term!r}")
+            return self.getRangeMask(table.events[field], value, float)
+        if field == "player":
+            playerIds = self.getValueIds(table.values, op, value, field)
+            mask = np.isin(table.labelCodes("Player"), playerIds)
+        elif field == "code":
+            codeIds = self.getValueIds(table.codes, op, value, field)
+            mask = np.isin(table.events["code"], codeIds)
+        elif table.groups.lookup(field) < 0:
+            raise ValueError(f"No label group {field!r} in the events")
+        elif op == "=" and ".." in value:
+            return self.getRangeMask(table.labelNumbers(field), value, float)
+        else:
+            valueIds = self.getValueIds(table.values, op, value, field)
+            selected = (table.labels["group"] == table.groups.lookup(field)) & np.isin(
+                table.labels["value"], valueIds
+            )
+            mask = np.zeros(len(table), dtype=bool)
+            mask[table.labels["event"][selected]] = True
+        return ~mask if op == "!=" else mask
+
+    def getValueIds(self, dimension, op, value, field):
+        if op == "~":
+            return [
+                id
+                for id, name in enumerate(dimension.names)
+                if name is not None and value in name
+            ]
+        # A name no event has is most likely a typo, so say so rather than
+        # quietly matching nothing
+        names = value.split("|")
+        unknown = [name for name in names if dimension.lookup(name) < 0]
+        if unknown:
+            raise ValueError(
+                f"No {field} {', '.join(map(repr, unknown))} in the events"
+            )
+        return [dimension.lookup(name) for name in names]
+
+    def getRangeMask(self, values, value, convert):
+        # "a..b" inclusive, either end may be left off; a lone value is a..a
+        low, dots, high = value.partition("..")
+        if not dots:
+            high = low
+        mask = np.ones(len(values), dtype=bool)
+        try:
+            if low:
+                mask &= values >= convert(low)
+            if high:
+                mask &= values <= convert(high)
+        except ValueError:
+            raise ValueError(f"Can't read range {value!r}")
+        return mask
+
+    def getColumn(self, name, mask):
+        # Decoded values of one output column for the matching events
+        table = self.table
+        games = table.events["game"][mask]
+        match name:
+            case "code":
+                return table.codes.decode(table.events["code"][mask])
+            case "date":
+                return table.games["date"].to_numpy()[games]
+            case "game":
+                files = table.games["file"].to_numpy()[games]
+                return np.array([Path(f).name for f in files], dtype=object)
+            case _ if name in table.events:
+                return table.events[name][mask]
+            case _:
+                return table.values.decode(table.labelCodes(name)[mask])
+
+    def groupBy(self, mask, groups):
+        frame = pd.DataFrame({group: self.getColumn(group, mask) for group in groups})
+        counts = frame.groupby(groups, dropna=False, sort=False).size()
+        return counts.sort_values(ascending=False, kind="stable").rename("count")
+
+    def getRows(self, mask, labels):
+        columns = ["date", "game", "id", "start", "end", "code"]
+        columns += self.eventColumns[2:] + labels
+        return pd.DataFrame({column: self.getColumn(column, mask) for column in columns})
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Filter match events and print a count, a group by or the rows as CSV",
+        epilog="Filters are field=value, field!=value or field~text, all ANDed. Fields are code, player, date, an event column (start, xStart, ...) or a label group. = takes a|b alternatives or an a..b range.",
+    )
+    EventArchive.addSourceArgument(parser)
+    parser.add_argument(
+        "filters",
+        nargs="*",
+        help='Filter terms such as "code=Chicago Hounds Kick" "Kick Descriptor=Low" "xStart=..22" "date=2024-03-01.."',
+    )
+    parser.add_argument(
+        "--group-by",
+        nargs="+",
+        metavar="GROUP",
+        help="Count matches by label groups or code, date, game",
+    )
+    parser.add_argument(
+        "--rows",
+        action="store_true",
+        help="Print every matching event as CSV",
+    )
+    parser.add_argument(
+        "--labels",
+        nargs="+",
+        default=["Player"],
+        metavar="GROUP",
+        help="Label groups included as columns with --rows",
+    )
+    args = parser.parse_args()
+
+    table = EventArchive.openSource(args.source)
+    query = EventQuery(table)
+
+    start = time.perf_counter()
+    try:
+        mask = query.getMask(args.filters)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.rows:
+        query.getRows(mask, args.labels).to_csv(sys.stdout, index=False)
+    elif args.group_by:
+        print(query.groupBy(mask, args.group_by).to_string())
+    else:
+        print(int(mask.sum()))
+    elapsed = (time.perf_counter() - start) * 1000
+    print(
+        f"{int(mask.sum())} of {len(table)} events in {len(table.games)} games, {elapsed:.1f} ms",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,458 @@
+from pathlib import Path
+from lxml import etree
+import pandas as pd
+import numpy as np
+from Intervals import Intervals
+
+
+class Dimension:
+    # Interns each distinct string to a small integer id; -1 means missing
+    # What lookup gives for a name never interned, so it matches no code,
+    # not even the -1 of a missing one
+    unknown = -2
+
+    def __init__(self, names=()):
+        self.names = []
+        self.ids = {}
+        self.nameArray = None
+        self.numberArray = None
+        for name in names:
+            self.intern(name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def intern(self, name):
+        id = self.ids.get(name)
+        if id is None:
+            id = len(self.names)
+            self.ids[name] = id
+            self.names.append(name)
+            self.nameArray = None
+            self.numberArray = None
+        return id
+
+    def lookup(self, name):
+        return self.ids.get(name, self.unknown)
+
+    def decode(self, codes):
+        # Trailing None so that a -1 code decodes to None
+        if self.nameArray is None or len(self.nameArray) != len(self.names) + 1:
+            self.nameArray = np.array(self.names + [None], dtype=object)
+        return self.nameArray[codes]
+
+    def numbers(self):
+        # Every value parsed as a float, NaN where it is not a number, with a
+        # trailing NaN for the -1 code
+        if self.numberArray is None:
+            numbers = pd.to_numeric(
+                pd.Series(self.names, dtype=object), errors="coerce"
+            )
+            self.numberArray = np.append(numbers.to_numpy(dtype=float), np.nan)
+        return self.numberArray
+
+
+class EventTable:
+    # Label groups whose text is a team name, used to work out who played
+    teamGroups = [
+        "Attacking Quality",
+        "Carry",
+        "Tackle",
+        "Penalty Conceded",
+        "Turnover Won",
+        "Kick",
+        "Pass",
+        "Restart",
+    ]
+
+    # Label groups stored as float32 event columns
+    coordinateColumns = {
+        "xStart": "X_Start",
+        "yStart": "Y_Start",
+        "xEnd": "X_End",
+        "yEnd": "Y_End",
+    }
+
+    # Code suffixes of instances where play is stopped, cut out of live time
+    deadBallCodes = ["Goal Kick", "Penalty Conceded"]
+    # Seconds per game in the timeline key, far past any video clock
+    timeSpan = 1e6
+
+    def __init__(self, xmlFiles, contents=None):
+        # Codes, label groups and label values (players, teams, descriptors)
+        # are interned at ingest and every column is a compact numpy array.
+        # events and labels are plain dicts of arrays so archive memmaps can
+        # back them without a copy. contents optionally maps a file to bytes
+        # already read, so reading and parsing can run as separate stages
+        self.codes = Dimension()
+        self.groups = Dimension()
+        self.values = Dimension()
+        games = []
+        gameCol = []
+        idCol = []
+        startCol = []
+        endCol = []
+        codeCol = []
+        labelEvents = []
+        labelGroups = []
+        labelValues = []
+        # Files and instances that can't be used are skipped and recorded
+        # here with the reason, so one bad event never stops a batch run
+        self.quarantine = []
+        for xmlFile in xmlFiles:
+            try:
+                if contents is not None and xmlFile in contents:
+                    root = etree.fromstring(contents[xmlFile])
+                else:
+                    root = etree.parse(str(xmlFile)).getroot()
+            except (etree.XMLSyntaxError, OSError) as e:
+                print(f"Error parsing {Path(xmlFile).name}: {e}")
+                self.addQuarantine(xmlFile, None, f"Unreadable file: {e}")
+                continue
+            sessionInfo = root.xpath("//SESSION_INFO")
+            if not sessionInfo or not (sessionInfo[0].text or "").split():
+                self.addQuarantine(xmlFile, None, "No SESSION_INFO date")
+                continue
+            game = len(games)
+            games.append(
+                {
+                    "game": game,
+                    "file": str(xmlFile),
+                    "date": sessionInfo[0].text.split()[0],
+                }
+            )
+            for instance in root.iter("instance"):
+                id = -1
+                start = np.nan
+                end = np.nan
+                code = -1
+                instanceLabels = []
+                try:
+                    for child in instance:
+                        match child.tag:
+                            case "ID":
+                                text = child.text or ""
+                                id = int(text) if text.isdigit() else -1
+                            case "start":
+                                start = float(child.text)
+                            case "end":
+                                end = float(child.text)
+                            case "code":
+                                code = self.codes.intern(child.text)
+                            case "label":
+                                instanceLabels.append(
+                                    (
+                                        self.groups.intern(child.findtext("group")),
+                                        self.values.intern(child.findtext("text")),
+                                    )
+                                )
+                except (TypeError, ValueError):
+                    self.addQuarantine(
+                        xmlFile, instance, "start or end is not a number"
+                    )
+                    continue
+                if np.isnan(start) or np.isnan(end):
+                    self.addQuarantine(xmlFile, instance, "No start or end time")
+                    continue
+                event = len(gameCol)
+                for group, value in instanceLabels:
+                    labelEvents.append(event)
+                    labelGroups.append(group)
+                    labelValues.append(value)
+                gameCol.append(game)
+                idCol.append(id)
+                startCol.append(start)
+                endCol.append(end)
+                codeCol.append(code)
+
+        self.games = pd.DataFrame(games, columns=["game", "file", "date"])
+        self.events = {
+            "game": np.array(gameCol, dtype=np.int32),
+            "id": np.array(idCol, dtype=np.int32),
+            "start": np.array(startCol, dtype=np.float64),
+            "end": np.array(endCol, dtype=np.float64),
+            "code": np.array(codeCol, dtype=np.int32),
+        }
+        self.labels = {
+            "event": np.array(labelEvents, dtype=np.int32),
+            "group": np.array(labelGroups, dtype=np.int32),
+            "value": np.array(labelValues, dtype=np.int32),
+        }
+        self.sortTimeline()
+        self.indexTimeline()
+        for column, group in self.coordinateColumns.items():
+            self.events[column] = self.labelNumbers(group).astype(np.float32)
+
+    @classmethod
+    def fromColumns(cls, games, events, labels, codes, groups, values, timeKey=None):
+        # Wrap already sorted columns, e.g. memmaps from an EventArchive,
+        # which also keeps the timeline key so it isn't rebuilt on open
+        table = cls.__new__(cls)
+        table.games = games
+        table.events = events
+        table.labels = labels
+        table.codes = codes
+        table.groups = groups
+        table.values = values
+        table.quarantine = []
+        table.indexTimeline(timeKey)
+        return table
+
+    @classmethod
+    def concat(cls, tables):
+        # One table over several, e.g. per-file tables kept by the watcher
+        if not tables:
+            return cls([])
+        codes = Dimension()
+        groups = Dimension()
+        values = Dimension()
+        games = []
+        events = []
+        labels = []
+        gameOffset = 0
+        eventOffset = 0
+        for table in tables:
+            tableEvents, tableLabels = table.remapped(
+                codes, groups, values, gameOffset, eventOffset
+            )
+            events.append(tableEvents)
+            labels.append(tableLabels)
+            games.append(table.games.assign(game=table.games["game"] + gameOffset))
+            gameOffset += len(table.games)
+            eventOffset += len(table)
+        merged = cls.fromColumns(
+            pd.concat(games, ignore_index=True),
+            {column: np.concatenate([e[column] for e in events]) for column in events[0]},
+            {column: np.concatenate([l[column] for l in labels]) for column in labels[0]},
+            codes,
+            groups,
+            values,
+        )
+        merged.quarantine = [entry for table in tables for entry in table.quarantine]
+        return merged
+
+    def addQuarantine(self, xmlFile, instance, reason):
+        self.quarantine.append(
+            {
+                "file": Path(xmlFile).name,
+                "id": None if instance is None else instance.findtext("ID"),
+                "start": None if instance is None else instance.findtext("start"),
+                "code": None if instance is None else instance.findtext("code"),
+                "stat": "ingest",
+                "reason": reason,
+            }
+        )
+
+    def remapped(self, codes, groups, values, gameOffset=0, eventOffset=0):
+        # Copies of the columns re-keyed onto other dimensions (interning any
+        # new names into them) and shifted to sit after existing rows. The
+        # trailing -1 keeps missing ids missing
+        idMaps = {}
+        for name, dimension in [("codes", codes), ("groups", groups), ("values", values)]:
+            idMaps[name] = np.array(
+                [dimension.intern(n) for n in getattr(self, name).names] + [-1],
+                dtype=np.int32,
+            )
+        events = dict(self.events)
+        events["game"] = events["game"] + gameOffset
+        events["code"] = idMaps["codes"][events["code"]]
+        labels = dict(self.labels)
+        labels["event"] = labels["event"] + eventOffset
+        labels["group"] = idMaps["groups"][labels["group"]]
+        labels["value"] = idMaps["values"][labels["value"]]
+        return events, labels
+
+    def sortTimeline(self):
+        # Keep each game's instances in start order so sequence queries are
+        # binary searches over one sorted key instead of nested loops
+        starts = np.nan_to_num(self.events["start"])
+        order = np.lexsort((starts, self.events["game"]))
+        for column in self.events:
+            self.events[column] = self.events[column][order]
+        newRows = np.empty(len(order), dtype=np.int32)
+        newRows[order] = np.arange(len(order))
+        labelOrder = np.argsort(newRows[self.labels["event"]], kind="stable")
+        for column in self.labels:
+            self.labels[column] = self.labels[column][labelOrder]
+        self.labels["event"] = newRows[self.labels["event"]]
+
+    @classmethod
+    def getTimeKey(cls, games, starts):
+        # game * span + start is sorted across the whole table
+        return games * cls.timeSpan + np.nan_to_num(starts)
+
+    def indexTimeline(self, timeKey=None):
+        games = self.events["game"]
+        if timeKey is None:
+            timeKey = self.getTimeKey(games, self.events["start"])
+        self.timeKey = timeKey
+        self.gameOffsets = np.searchsorted(games, np.arange(len(self.games) + 1))
+        self.liveIntervals = {}
+        self.labelCodeCache = {}
+        self.codeSplit = None
+
+    def __len__(self):
+        return len(self.events["game"])
+
+    def codeMask(self, code):
+        return self.events["code"] == self.codes.lookup(code)
+
+    def labelMask(self, group, text):
+        # Events carrying a label with this group and text
+        match = (self.labels["group"] == self.groups.lookup(group)) & (
+            self.labels["value"] == self.values.lookup(text)
+        )
+        mask = np.zeros(len(self), dtype=bool)
+        mask[self.labels["event"][match]] = True
+        return mask
+
+    def labelCodes(self, group):
+        # Value id of the first label in a group per event, like
+        # label[group=...][position()=1], -1 where the event has none
+        if group not in self.labelCodeCache:
+            selected = np.flatnonzero(
+                self.labels["group"] == self.groups.lookup(group)
+            )
+            # Labels are sorted by event so unique's first index is position 1
+            events, first = np.unique(
+                self.labels["event"][selected], return_index=True
+            )
+            codes = np.full(len(self), -1, dtype=np.int32)
+            codes[events] = self.labels["value"][selected[first]]
+            self.labelCodeCache[group] = codes
+        return self.labelCodeCache[group]
+
+    def labelValues(self, group):
+        return pd.Series(self.values.decode(self.labelCodes(group)), dtype=object)
+
+    def labelNumbers(self, group):
+        return self.values.numbers()[self.labelCodes(group)]
+
+    def playerMask(self, player):
+        return self.labelCodes("Player") == self.values.lookup(player)
+
+    def gameRows(self, game):
+        return slice(self.gameOffsets[game], self.gameOffsets[game + 1])
+
+    def getLiveIntervals(self, game):
+        # Ball-in-play time of a game: every instance merged into one set of
+        # intervals, less the stoppages
+        if game not in self.liveIntervals:
+            rows = self.gameRows(game)
+            starts = self.events["start"][rows]
+            ends = self.events["end"][rows]
+            deadCodes = [
+                id
+                for id, code in enumerate(self.codes.names)
+                if code is not None
+                and any(code.endswith(f" {dead}") for dead in self.deadBallCodes)
+            ]
+            dead = np.isin(self.events["code"][rows], deadCodes)
+            self.liveIntervals[game] = Intervals(
+                starts[~dead], ends[~dead]
+            ).difference(Intervals(starts[dead], ends[dead]))
+        return self.liveIntervals[game]
+
+    def nextEvent(self, fromMask, toMask, side="left"):
+        # For each fromMask event, the first toMask event in the same game
+        # starting at (side="left") or after (side="right") it, -1 if none
+        fromRows = np.flatnonzero(fromMask)
+        toRows = np.flatnonzero(toMask)
+        found = np.full(len(fromRows), -1, dtype=np.int64)
+        if len(toRows) == 0:
+            return fromRows, found
+        positions = np.searchsorted(
+            self.timeKey[toRows], self.timeKey[fromRows], side=side
+        )
+        inRange = positions < len(toRows)
+        candidates = toRows[positions[inRange]]
+        games = self.events["game"]
+        sameGame = games[candidates] == games[fromRows[inRange]]
+        found[np.flatnonzero(inRange)[sameGame]] = candidates[sameGame]
+        return fromRows, found
+
+    def getSequenceOutcomes(self, fromMask, outcomes, untilMask=None, grace=0):
+        # Name of the first outcome event inside each fromMask event's window,
+        # or None. The window runs from the event start to its end plus grace,
+        # cut short by the next untilMask event
+        names = list(outcomes.keys())
+        kinds = np.full(len(self), -1)
+        for i, name in reversed(list(enumerate(names))):
+            kinds[outcomes[name]] = i
+        fromRows, nextRows = self.nextEvent(fromMask, kinds >= 0)
+
+        starts = self.events["start"]
+        ends = self.events["end"]
+        windowEnds = np.fmax(ends[fromRows], starts[fromRows]) + grace
+        if untilMask is not None:
+            _, untilRows = self.nextEvent(fromMask, untilMask, side="right")
+            untilStarts = np.where(untilRows >= 0, starts[untilRows], np.inf)
+            windowEnds = np.minimum(windowEnds, untilStarts)
+
+        hit = nextRows >= 0
+        hit[hit] = starts[nextRows[hit]] <= windowEnds[hit]
+        result = np.full(len(fromRows), None, dtype=object)
+        result[hit] = np.asarray(names, dtype=object)[kinds[nextRows[hit]]]
+        return pd.Series(result, index=fromRows, dtype=object)
+
+    def gameTeams(self):
+        # The two most referenced team names in each game
+        teamGroupIds = [self.groups.lookup(group) for group in self.teamGroups]
+        selected = np.isin(self.labels["group"], teamGroupIds)
+        events = self.labels["event"][selected]
+        teamLabels = pd.DataFrame(
+            {
+                "game": self.events["game"][events],
+                "value": self.labels["value"][selected],
+            }
+        )
+        counts = teamLabels.groupby(["game", "value"]).size().rename("count")
+        counts = counts.reset_index().sort_values(
+            ["game", "count"], ascending=[True, False], kind="stable"
+        )
+        teams = counts.groupby("game").head(2)
+        return pd.DataFrame(
+            {
+                "game": teams["game"].to_numpy(),
+                "team": self.values.decode(teams["value"].to_numpy()),
+            }
+        )
+
+    def codeTeams(self):
+        # Value id of the team name each code starts with, -1 for codes that
+        # aren't a team's. Indexed by code id with a trailing -1, so
+        # codeTeams()[events["code"]] is every event's team
+        return self.splitCodes()[0]
+
+    def codeSuffixes(self):
+        # What follows the team name in each code, e.g. "Kick", None for
+        # codes that aren't a team's; indexed like codeTeams
+        return self.splitCodes()[1]
+
+    def splitCodes(self):
+        if self.codeSplit is None:
+            teams = set(self.gameTeams()["team"].dropna())
+            codeTeams = np.full(len(self.codes) + 1, -1, dtype=np.int64)
+            codeSuffixes = np.full(len(self.codes) + 1, None, dtype=object)
+            for id, code in enumerate(self.codes.names):
+                prefixes = [
+                    team
+                    for team in teams
+                    if code is not None and code.startswith(f"{team} ")
+                ]
+                if prefixes:
+                    # Longest matching team name wins
+                    team = max(prefixes, key=len)
+                    codeTeams[id] = self.values.lookup(team)
+                    codeSuffixes[id] = code[len(team) + 1 :]
+            self.codeSplit = (codeTeams, codeSuffixes)
+        return self.codeSplit
+
+    def getOpponents(self, teamName):
+        # Per game, the team that teamName played, None if they did not play
+        opponents = np.full(len(self.games), None, dtype=object)
+        teams = self.gameTeams()
+        playing = teams[teams["team"] == teamName]["game"]
+        others = teams[teams["game"].isin(playing) & (teams["team"] != teamName)]
+        opponents[others["game"].to_numpy()] = others["team"].to_numpy()
+        return opponents
@@ -0,0 +1,213 @@
+import json
+import os
+import hashlib
+import argparse
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from EventArchive import EventArchive
+
+
+class ExpectedPoints:
+    # Expected points of a 22 entry, tap pen or maul, fitted by least squares
+    # on what every team went on to score from the same kind of event. The
+    # coefficients are saved with a key of the games they were fitted on, so
+    # a run only refits when the season's games changed
+    kinds = ["22 Entry", "Tap Pen", "Maul"]
+    points = {"Try": 5, "Penalty": 3, "Turnover": 0}
+    features = [
+        "22 Entry",
+        "Tap Pen",
+        "Maul",
+        "22 Entry Distance",
+        "Tap Pen Distance",
+        "Maul Distance",
+        "Distance Squared",
+        "Width",
+        "No Location",
+        "Phase",
+        "No Phase",
+    ]
+    # Seconds after the event ends that a score still counts for it
+    scoreGrace = 90
+    # Bumped whenever the features or outcomes change, to refit old files
+    version = 1
+
+    def __init__(self, path=".xpoints.json"):
+        self.path = Path(path)
+        self.coefficients = None
+        self.key = None
+        self.samples = 0
+
+    def getTrainingKey(self, table):
+        digest = hashlib.sha1(repr((self.version, self.features)).encode())
+        # Each game's source key, so a rewritten file refits too
+        for game in table.games.itertuples():
+            digest.update(f"{EventArchive.getGameSource(game)}\x1f".encode())
+        return digest.hexdigest()
+
+    def getModel(self, table):
+        # Saved coefficients when they were fitted on these games, else refit
+        key = self.getTrainingKey(table)
+        if self.key != key and not self.load(key):
+            self.fit(table)
+            self.save()
+        return self
+
+    def load(self, key):
+        try:
+            with open(self.path) as f:
+                saved = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+        if saved.get("key") != key:
+            return False
+        self.key = key
+        self.coefficients = np.array(
+            [saved["coefficients"][feature] for feature in self.features]
+        )
+        self.samples = saved["samples"]
+        return True
+
+    def save(self):
+        tmpPath = self.path.with_name(f"{self.path.name}.tmp")
+        with open(tmpPath, "w") as f:
+            json.dump(
+                {
+                    "key": self.key,
+                    "samples": self.samples,
+                    "coefficients": dict(
+                        zip(self.features, self.coefficients.tolist())
+                    ),
+                },
+                f,
+                indent=1,
+            )
+        os.replace(tmpPath, self.path)
+
+    def fit(self, table):
+        events = self.getEvents(table)
+        if len(events) == 0:
+            self.coefficients = np.zeros(len(self.features))
+        else:
+            self.coefficients, *_ = np.linalg.lstsq(
+                self.getFeatures(table, events),
+                events["points"].to_numpy(dtype=float),
+                rcond=None,
+            )
+        self.key = self.getTrainingKey(table)
+        self.samples = len(events)
+        return self
+
+    def score(self, table):
+        # Every 22 entry, tap pen and maul with what it scored and its
+        # expected points, from one matrix product
+        self.getModel(table)
+        events = self.getEvents(table)
+        events["xPoints"] = self.getFeatures(table, events) @ self.coefficients
+        return events
+
+    def getEvents(self, table):
+        # row, game, team, kind and points scored of each event
+        codeKinds = np.array(
+            [
+                self.kinds.index(suffix) if suffix in self.kinds else -1
+                for suffix in table.codeSuffixes()
+            ]
+        )
+        codeTeams = table.values.decode(table.codeTeams())
+        codes = table.events["code"]
+        kinds = codeKinds[codes]
+        # Only the first entry of a visit to the 22 is scored
+        entries = table.labelMask("22 Entry", "New Entry")
+        selected = (kinds >= 0) & ((kinds != 0) | entries)
+        rows = np.flatnonzero(selected)
+        teams = codeTeams[codes[rows]]
+
+        points = np.zeros(len(rows))
+        for team in pd.unique(teams):
+            teamRows = np.zeros(len(table), dtype=bool)
+            teamRows[rows[teams == team]] = True
+            # Scores before the ball is lost or the next 22 entry count
+            results = self.getOutcomes(table, team, teamRows, entries)
+            points[teams == team] = results.map(self.points).fillna(0).to_numpy()
+
+        return pd.DataFrame(
+            {
+                "row": rows,
+                "game": table.events["game"][rows],
+                "team": teams,
+                "kind": np.asarray(self.kinds, dtype=object)[kinds[rows]],
+                "points": points,
+            }
+        )
+
+    @classmethod
+    def getOutcomes(cls, table, team, fromMask, untilMask):
+        # The team's first try, penalty goal or turnover after each fromMask
+        # event, within scoreGrace of its end and before the next untilMask
+        # event, named as in points
+        outcomes = {
+            "Try": table.codeMask(f"{team} Try"),
+            "Penalty": table.codeMask(f"{team} Goal Kick")
+            & table.labelMask("Goal Type", "Penalty Goal")
+            & table.labelMask("Goal Outcome", "Goal Kicked"),
+            "Turnover": table.codeMask(f"{team} Turnover"),
+        }
+        return table.getSequenceOutcomes(
+            fromMask, outcomes, untilMask=untilMask, grace=cls.scoreGrace
+        )
+
+    def getFeatures(self, table, events):
+        rows = events["row"].to_numpy()
+        kinds = np.array([self.kinds.index(kind) for kind in events["kind"]], dtype=int)
+        # Metres to the opposition try line and from the middle of the pitch
+        # in XML coordinates, scaled to about 0..1
+        xStart = table.events["xStart"][rows].astype(float)
+        yStart = table.events["yStart"][rows].astype(float)
+        distance = np.clip(100 - xStart, 0, 100) / 100
+        width = np.abs(yStart - 34) / 34
+        noLocation = np.isnan(distance) | np.isnan(width)
+        phase = np.clip(table.labelNumbers("Phase Number")[rows], 0, 30) / 10
+        noPhase = np.isnan(phase)
+
+        features = np.zeros((len(rows), len(self.features)))
+        features[np.arange(len(rows)), kinds] = 1
+        features[np.arange(len(rows)), 3 + kinds] = np.nan_to_num(distance)
+        features[:, 6] = np.nan_to_num(distance) ** 2
+        features[:, 7] = np.nan_to_num(width)
+        features[:, 8] = noLocation
+        features[:, 9] = np.nan_to_num(phase)
+        features[:, 10] = noPhase
+        return features
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fit the expected-points model and compare expected and actual points per team"
+    )
+    EventArchive.addSourceArgument(parser)
+    parser.add_argument(
+        "--model",
+        default=".xpoints.json",
+        help="Where the fitted coefficients are kept between runs",
+    )
+    parser.add_argument("--team", help="Only this team's events")
+    args = parser.parse_args()
+
+    table = EventArchive.openSource(args.source)
+    events = ExpectedPoints(args.model).score(table)
+    if args.team:
+        events = events[events["team"] == args.team]
+    summary = events.groupby(["team", "kind"]).agg(
+        count=("points", "size"),
+        points=("points", "sum"),
+        xPoints=("xPoints", "sum"),
+    )
+    summary["perEvent"] = summary["points"] / summary["count"]
+    summary["xPerEvent"] = summary["xPoints"] / summary["count"]
+    print(summary.round(2).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import numpy as np
+
+
+class GameBootstrap:
+    # Confidence intervals for ratio stats by resampling whole games with
+    # replacement. Each resample is a row of how many times each game was
+    # drawn, so every stat's resampled totals come out of one matrix product
+    # of those weights with the per-game numerators and denominators
+
+    def __init__(self, gameCount, resamples=2000, seed=0):
+        rng = np.random.default_rng(seed)
+        self.weights = rng.multinomial(
+            gameCount, np.full(gameCount, 1 / gameCount), size=resamples
+        ).astype(float)
+
+    def intervals(self, numerators, denominators, level=0.95):
+        # numerators and denominators are (stats, games); returns (stats, 2)
+        # low and high rates, NaN for a stat no resample has a denominator for
+        numerators = np.asarray(numerators, dtype=float)
+        denominators = np.asarray(denominators, dtype=float)
+        tops = self.weights @ numerators.T
+        bottoms = self.weights @ denominators.T
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rates = np.where(bottoms > 0, tops / bottoms, np.nan)
+        tail = (1 - level) / 2 * 100
+        bounds = np.full((numerators.shape[0], 2), np.nan)
+        valid = ~np.all(np.isnan(rates), axis=0)
+        bounds[valid] = np.nanpercentile(
+            rates[:, valid], [tail, 100 - tail], axis=0
+        ).T
+        return bounds
@@ -0,0 +1,83 @@
+import numpy as np
+
+
+class Intervals:
+    # A set of time intervals kept as sorted, disjoint [start, end] arrays.
+    # Building one is a single sort and a running maximum over the ends, and
+    # union and intersection are one sweep over both sets' boundaries, so
+    # thousands of instance intervals merge without pairwise overlap checks
+
+    def __init__(self, starts=(), ends=()):
+        starts = np.asarray(starts, dtype=float)
+        ends = np.fmax(np.asarray(ends, dtype=float), starts)
+        keep = ~np.isnan(starts)
+        starts, ends = starts[keep], ends[keep]
+        order = np.argsort(starts, kind="stable")
+        starts, ends = starts[order], ends[order]
+        # An interval opens a new run unless it starts inside an earlier one
+        opens = np.ones(len(starts), dtype=bool)
+        opens[1:] = starts[1:] > np.maximum.accumulate(ends)[:-1]
+        runs = np.flatnonzero(opens)
+        self.starts = starts[runs]
+        self.ends = np.maximum.reduceat(ends, runs) if len(runs) else ends
+
+    def __len__(self):
+        return len(self.starts)
+
+    def duration(self):
+        return float(np.sum(self.ends - self.starts))
+
+    def union(self, other):
+        return Intervals(
+            np.concatenate([self.starts, other.starts]),
+            np.concatenate([self.ends, other.ends]),
+        )
+
+    def intersection(self, other):
+        # Sweep both sets' boundaries in time order counting how many are
+        # open; with each set disjoint, both are where the count reaches two
+        times = np.concatenate([self.starts, other.starts, self.ends, other.ends])
+        steps = np.repeat([1, 1, -1, -1], [len(self), len(other)] * 2)
+        # Ends before starts at the same time, so touching runs don't meet
+        order = np.lexsort((steps, times))
+        times, depth = times[order], np.cumsum(steps[order])
+        both = np.flatnonzero(depth == 2)
+        both = both[times[both + 1] > times[both]]
+        return Intervals(times[both], times[both + 1])
+
+    def complement(self, start, end):
+        # The gaps between intervals from start to end
+        starts = np.concatenate([[start], self.ends])
+        ends = np.concatenate([self.starts, [end]])
+        starts, ends = np.clip(starts, start, end), np.clip(ends, start, end)
+        gaps = ends > starts
+        return Intervals(starts[gaps], ends[gaps])
+
+    def difference(self, other):
+        if len(self) == 0:
+            return self
+        return self.intersection(other.complement(self.starts[0], self.ends[-1]))
+
+    def locate(self, times):
+        # Index of the interval each time falls in, -1 for times outside them
+        times = np.asarray(times, dtype=float)
+        positions = np.searchsorted(self.starts, times, side="right") - 1
+        inside = positions >= 0
+        inside[inside] = times[inside] <= self.ends[positions[inside]]
+        return np.where(inside, positions, -1)
+
+    def covered(self, times):
+        # Total interval time before each time
+        times = np.asarray(times, dtype=float)
+        if len(self) == 0:
+            return np.zeros(len(times))
+        lengths = self.ends - self.starts
+        before = np.concatenate([[0], np.cumsum(lengths)])
+        # The last interval starting at or before each time, partly covered
+        last = np.searchsorted(self.starts, times, side="right") - 1
+        partial = np.clip(times - self.starts[last], 0, lengths[last])
+        return np.where(last >= 0, before[last] + partial, 0)
+
+    def measure(self, starts, ends):
+        # How much of each [start, end] the intervals cover
+        return self.covered(ends) - self.covered(starts)
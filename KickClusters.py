@@ -0,0 +1,103 @@
+import hashlib
+import argparse
+import numpy as np
+import pandas as pd
+from EventArchive import EventArchive
+from KickIndex import KickIndex
+
+
+class KickClusters:
+    # k-means over (xStart, yStart, xEnd, yEnd) kick vectors, so a season of
+    # kicks can be drawn as a few representative arrows. Every iteration is
+    # one (kicks, clusters) distance matrix, and assignments are kept by the
+    # vectors' content so re-rendering the same kicks doesn't refit
+
+    def __init__(self, clusters=8, iterations=50, seed=0):
+        self.clusters = clusters
+        self.iterations = iterations
+        self.seed = seed
+        self.cache = {}
+
+    def fit(self, vectors):
+        # (labels, centers, counts): each kick's cluster, the mean vector of
+        # each cluster and how many kicks it has, largest cluster first
+        vectors = np.asarray(vectors, dtype=float)
+        key = hashlib.sha1(vectors.tobytes()).hexdigest()
+        if key not in self.cache:
+            self.cache[key] = self.kMeans(vectors)
+        return self.cache[key]
+
+    def kMeans(self, vectors):
+        rng = np.random.default_rng(self.seed)
+        count = min(self.clusters, len(np.unique(vectors, axis=0)))
+        if count == 0:
+            return np.zeros(0, dtype=int), np.zeros((0, 4)), np.zeros(0, dtype=int)
+        # k-means++ starting centers, spread out by squared distance
+        centers = vectors[[rng.integers(len(vectors))]]
+        for _ in range(1, count):
+            nearest = self.getDistances(vectors, centers).min(axis=1)
+            pick = rng.choice(len(vectors), p=nearest / nearest.sum())
+            centers = np.vstack([centers, vectors[pick]])
+
+        labels = None
+        for _ in range(self.iterations):
+            newLabels = self.getDistances(vectors, centers).argmin(axis=1)
+            if labels is not None and np.array_equal(labels, newLabels):
+                break
+            labels = newLabels
+            counts = np.bincount(labels, minlength=count)
+            sums = np.zeros_like(centers)
+            np.add.at(sums, labels, vectors)
+            # A cluster left empty keeps its old center
+            filled = counts > 0
+            centers[filled] = sums[filled] / counts[filled, None]
+
+        counts = np.bincount(labels, minlength=count)
+        order = np.argsort(-counts, kind="stable")
+        rank = np.empty_like(order)
+        rank[order] = np.arange(count)
+        return rank[labels], centers[order], counts[order]
+
+    @staticmethod
+    def getDistances(vectors, centers):
+        # Squared distance of every vector to every center
+        return ((vectors[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Summarize a team's or kicker's kicks as k-means clusters of start and landing spots"
+    )
+    EventArchive.addSourceArgument(parser)
+    parser.add_argument("team", help="Team whose kicks are clustered")
+    parser.add_argument("--player", help="Only this kicker's kicks")
+    parser.add_argument("--clusters", type=int, default=8)
+    args = parser.parse_args()
+
+    table = EventArchive.openSource(args.source)
+    try:
+        index = KickIndex(table, args.team)
+    except ValueError as e:
+        parser.error(str(e))
+    rows = index.rows
+    if args.player:
+        rows = rows[table.playerMask(args.player)[rows]]
+    labels, centers, counts = KickClusters(args.clusters).fit(
+        index.getKickVectors(rows)
+    )
+    descriptors = table.values.decode(table.labelCodes("Kick Descriptor")[rows])
+    mainDescriptors = (
+        pd.Series(descriptors)
+        .groupby(labels)
+        .agg(lambda d: d.mode().iat[0] if d.notna().any() else None)
+    )
+    summary = pd.DataFrame(
+        centers.round(1), columns=["xStart", "yStart", "xEnd", "yEnd"]
+    )
+    summary.insert(0, "kicks", counts)
+    summary["descriptor"] = mainDescriptors.reindex(summary.index).to_numpy()
+    print(summary.to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import sys
+import time
+import argparse
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from EventArchive import EventArchive
+
+
+class KickIndex:
+    # Kicks as (xStart, yStart, xEnd, yEnd) points in the StatMonkey pitch
+    # frame, bucketed into a uniform grid over all four coordinates. A query
+    # searches a growing box of cells around the kick it is given until the
+    # k nearest found are closer than anything outside the box could be, so
+    # only a handful of cells are read however many kicks the season has
+    cellSize = 10
+    fieldLength = 140
+    fieldWidth = 68
+    tryZone = 20
+
+    def __init__(self, table, team=None):
+        self.table = table
+        teams = table.gameTeams()["team"].dropna().unique()
+        if team is not None:
+            if team not in teams:
+                raise ValueError(f"No team {team!r} in the events")
+            teams = [team]
+        kicks = np.isin(
+            table.events["code"],
+            [table.codes.lookup(f"{name} Kick") for name in teams],
+        )
+        rows = np.flatnonzero(kicks)
+        vectors = self.getKickVectors(rows)
+        located = ~np.isnan(vectors).any(axis=1)
+        rows, vectors = rows[located], vectors[located]
+
+        self.shape = np.array(
+            [
+                -(-self.fieldLength // self.cellSize),
+                -(-self.fieldWidth // self.cellSize),
+            ]
+            * 2
+        )
+        cells = self.getCells(vectors)
+        order = np.argsort(self.getCellIds(cells), kind="stable")
+        self.rows = rows[order]
+        self.vectors = vectors[order]
+        # Kicks of cell i are self.rows[cellStarts[i]:cellStarts[i + 1]]
+        self.cellStarts = np.searchsorted(
+            self.getCellIds(cells[order]), np.arange(self.shape.prod() + 1)
+        )
+
+    def __len__(self):
+        return len(self.rows)
+
+    def getKickVectors(self, rows):
+        # (kicks, 4) start and end points, NaN where a coordinate is missing
+        events = self.table.events
+        return np.stack(
+            [
+                events["xStart"][rows] + self.tryZone,
+                self.fieldWidth - events["yStart"][rows],
+                events["xEnd"][rows] + self.tryZone,
+                self.fieldWidth - events["yEnd"][rows],
+            ],
+            axis=1,
+        ).astype(float)
+
+    def getCells(self, vectors):
+        cells = np.floor(np.asarray(vectors, dtype=float) / self.cellSize)
+        return np.clip(cells, 0, self.shape - 1).astype(np.int64)
+
+    def getCellIds(self, cells):
+        return np.ravel_multi_index(np.moveaxis(cells, -1, 0), self.shape)
+
+    def query(self, vector, k=10, exclude=None):
+        # Event rows of the k kicks nearest vector and their distances in
+        # metres, nearest first. exclude is a row to leave out, e.g. the
+        # kick the query was taken from
+        vector = np.asarray(vector, dtype=float)
+        center = self.getCells(vector)
+        want = min(k, len(self) - (exclude is not None))
+        if want <= 0:
+            return self.rows[:0], np.zeros(0)
+        ring = 0
+        while True:
+            low = np.maximum(center - ring, 0)
+            high = np.minimum(center + ring, self.shape - 1)
+            candidates = self.getBoxKicks(low, high)
+            if exclude is not None:
+                candidates = candidates[self.rows[candidates] != exclude]
+            distances = np.linalg.norm(self.vectors[candidates] - vector, axis=1)
+            nearest = np.argsort(distances, kind="stable")[:k]
+            # Anything outside the box is more than ring cells away
+            covered = np.all(low == 0) and np.all(high == self.shape - 1)
+            if covered or (
+                len(nearest) >= want
+                and distances[nearest[-1]] <= ring * self.cellSize
+            ):
+                return self.rows[candidates[nearest]], distances[nearest]
+            ring += 1
+
+    def getBoxKicks(self, low, high):
+        # Positions in self.rows of every kick in the cells from low to high
+        ranges = [np.arange(lo, hi + 1) for lo, hi in zip(low, high)]
+        ids = self.getCellIds(np.stack(np.meshgrid(*ranges, indexing="ij"), -1))
+        ids = ids.ravel()
+        starts = self.cellStarts[ids]
+        counts = self.cellStarts[ids + 1] - starts
+        # Each kick's place within its cell, added to the cell's start
+        cellOffsets = np.repeat(np.cumsum(counts) - counts, counts)
+        return np.repeat(starts, counts) + np.arange(counts.sum()) - cellOffsets
+
+    def queryRow(self, row, k=10):
+        # Kicks like the kick at an event row, not counting itself
+        return self.query(self.getKickVectors([row])[0], k, exclude=row)
+
+    def describe(self, rows, distances):
+        table = self.table
+        games = table.events["game"][rows]
+        codes = table.events["code"][rows]
+        vectors = self.getKickVectors(rows).round(1)
+        return pd.DataFrame(
+            {
+                "date": table.games["date"].to_numpy()[games],
+                "file": [Path(f).name for f in table.games["file"].to_numpy()[games]],
+                "id": table.events["id"][rows],
+                "team": table.values.decode(table.codeTeams()[codes]),
+                "player": table.values.decode(table.labelCodes("Player")[rows]),
+                "descriptor": table.values.decode(
+                    table.labelCodes("Kick Descriptor")[rows]
+                ),
+                "style": table.values.decode(table.labelCodes("Kick Style")[rows]),
+                "xStart": vectors[:, 0],
+                "yStart": vectors[:, 1],
+                "xEnd": vectors[:, 2],
+                "yEnd": vectors[:, 3],
+                "distance": np.round(distances, 1),
+            }
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Find the kicks most like a given kick across the season or archive"
+    )
+    EventArchive.addSourceArgument(parser)
+    parser.add_argument(
+        "--kick",
+        nargs=4,
+        type=float,
+        metavar=("X_START", "Y_START", "X_END", "Y_END"),
+        help="Start and landing spot in metres as on the kick path slides, try line at x=20",
+    )
+    parser.add_argument("--id", type=int, help="Event id of a kick to match instead")
+    parser.add_argument("--game", help="Date of the game the --id kick is in")
+    parser.add_argument("--team", help="Only search this team's kicks")
+    parser.add_argument("-k", type=int, default=10, help="Number of kicks to return")
+    args = parser.parse_args()
+    if (args.kick is None) == (args.id is None):
+        parser.error("give either --kick or --id")
+
+    table = EventArchive.openSource(args.source)
+    try:
+        index = KickIndex(table, args.team)
+    except ValueError as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    if args.kick:
+        rows, distances = index.query(args.kick, args.k)
+    else:
+        matches = np.isin(index.rows, np.flatnonzero(table.events["id"] == args.id))
+        if args.game:
+            games = np.flatnonzero((table.games["date"] == args.game).to_numpy())
+            matches &= np.isin(table.events["game"][index.rows], games)
+        if matches.sum() == 0:
+            parser.error(f"No kick has id {args.id}")
+        if matches.sum() > 1:
+            parser.error(f"{matches.sum()} kicks have id {args.id}, narrow with --game")
+        rows, distances = index.queryRow(index.rows[matches][0], args.k)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    pd.set_option("display.width", 200)
+    print(index.describe(rows, distances).to_string(index=False))
+    print(f"{len(index)} kicks, {elapsed:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
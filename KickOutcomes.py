@@ -0,0 +1,118 @@
+import argparse
+import numpy as np
+import pandas as pd
+from EventArchive import EventArchive
+
+
+class KickOutcomes:
+    # What came of every team's kicks: the first possession event in the
+    # same game after the kick, named by its code and by whether it was the
+    # kicking team's or the opposition's. One binary search of every kick
+    # into the sorted timeline of those events, so a season is a single pass
+    outcomes = [
+        "Try",
+        "Regathered",
+        "Penalty Won",
+        "Own Set Piece",
+        "Opposition Set Piece",
+        "Kicked Back",
+        "Counter Attack",
+        "Penalty Conceded",
+        "Try Conceded",
+        "Open Play",
+    ]
+    # Code suffix -> (outcome when it is the kicking team's code, outcome
+    # when it is the opposition's)
+    codeOutcomes = {
+        "Try": ("Try", "Try Conceded"),
+        "Kick": ("Regathered", "Kicked Back"),
+        "Maul": ("Regathered", "Counter Attack"),
+        "22 Entry": ("Regathered", "Counter Attack"),
+        "Tap Pen": ("Regathered", "Counter Attack"),
+        "Turnover": ("Counter Attack", "Regathered"),
+        "Lineout": ("Own Set Piece", "Opposition Set Piece"),
+        "Scrum": ("Own Set Piece", "Opposition Set Piece"),
+        "Penalty Conceded": ("Penalty Conceded", "Penalty Won"),
+    }
+    # Seconds after the kick ends that the next event still counts as its
+    # outcome; after that the kick is just part of open play
+    window = 40
+
+    def __init__(self, table):
+        self.table = table
+        suffixes = list(self.codeOutcomes)
+        codeTeams = table.codeTeams()
+        codeSuffixes = np.array(
+            [
+                suffixes.index(suffix) if suffix in self.codeOutcomes else -1
+                for suffix in table.codeSuffixes()
+            ],
+            dtype=np.int64,
+        )
+        codes = table.events["code"]
+        kicks = codeSuffixes[codes] == suffixes.index("Kick")
+        relevant = codeSuffixes[codes] >= 0
+
+        # First relevant event starting after each kick, in the same game
+        self.rows, nextRows = table.nextEvent(kicks, relevant, side="right")
+        starts = table.events["start"]
+        ends = np.fmax(table.events["end"][self.rows], starts[self.rows])
+        found = nextRows >= 0
+        found[found] = starts[nextRows[found]] <= ends[found] + self.window
+        self.linkedRows = np.where(found, nextRows, -1)
+
+        # (suffix, opposition) -> outcome id
+        outcomeIds = np.array(
+            [
+                [self.outcomes.index(outcome) for outcome in self.codeOutcomes[s]]
+                for s in suffixes
+            ]
+        )
+        linkedCodes = codes[nextRows[found]]
+        opposition = codeTeams[linkedCodes] != codeTeams[codes[self.rows[found]]]
+        self.outcomeIds = np.full(
+            len(self.rows), self.outcomes.index("Open Play"), dtype=np.int64
+        )
+        self.outcomeIds[found] = outcomeIds[
+            codeSuffixes[linkedCodes], opposition.astype(int)
+        ]
+
+        # Outcome name and linked event row of every event, None and -1 for
+        # everything that isn't a kick, kept on the table as event columns
+        outcome = np.full(len(table), None, dtype=object)
+        outcome[self.rows] = np.asarray(self.outcomes, dtype=object)[self.outcomeIds]
+        linkedRow = np.full(len(table), -1, dtype=np.int64)
+        linkedRow[self.rows] = self.linkedRows
+        table.events["kickOutcome"] = outcome
+        table.events["kickOutcomeRow"] = linkedRow
+
+    def getOutcomes(self, mask):
+        # Outcome names of the kicks in mask, in row order
+        return self.table.events["kickOutcome"][mask]
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Count what every team's kicks led to, from the next possession event after each kick"
+    )
+    EventArchive.addSourceArgument(parser)
+    parser.add_argument("--team", help="Only this team's kicks")
+    args = parser.parse_args()
+
+    table = EventArchive.openSource(args.source)
+    kickOutcomes = KickOutcomes(table)
+    codes = table.events["code"][kickOutcomes.rows]
+    kicks = pd.DataFrame(
+        {
+            "team": table.values.decode(table.codeTeams()[codes]),
+            "outcome": np.asarray(kickOutcomes.outcomes)[kickOutcomes.outcomeIds],
+        }
+    )
+    if args.team:
+        kicks = kicks[kicks["team"] == args.team]
+    counts = pd.crosstab(kicks["team"], kicks["outcome"])
+    counts = counts.reindex(columns=[o for o in kickOutcomes.outcomes if o in counts])
+    print(counts.to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import pandas as pd
+import argparse
+from pathlib import Path
+from EventTable import EventTable
+from Team_Report import TeamReport
+
+
+class LeagueTable:
+    # Longest suffixes first so "X Goal Kick" is not read as team "X Goal"
+    codeTypes = [
+        "Penalty Conceded",
+        "Goal Kick",
+        "22 Entry",
+        "Tap Pen",
+        "Turnover",
+        "Scrum",
+        "Maul",
+        "Kick",
+        "Try",
+    ]
+
+    def __init__(self, xmlFiles=None, events=None):
+        self.events = events if events is not None else EventTable(xmlFiles)
+
+    def getStatColumns(self):
+        # Stat name -> (team each event counts for, mask of counted events, weight)
+        table = self.events
+        # Split each distinct code once, then index by the event code ids;
+        # the trailing None leaves events without a code (-1) unmatched
+        coded = pd.Series(table.codes.names + [None], dtype=object).str.extract(
+            rf"^(?P<team>.+?) (?P<type>{'|'.join(self.codeTypes)})$"
+        )
+        eventCodes = table.events["code"]
+        codeTeam = pd.Series(coded["team"].to_numpy()[eventCodes], dtype=object)
+        codeType = pd.Series(coded["type"].to_numpy()[eventCodes], dtype=object)
+        kickDescriptor = table.labelValues("Kick Descriptor")
+        scrumResult = table.labelValues("Scrum Result")
+        maulMetres = pd.to_numeric(table.labelValues("Maul Metres"), errors="coerce")
+        carryTeam = table.labelValues("Carry")
+        tackleTeam = table.labelValues("Tackle")
+        attackTeam = table.labelValues("Attacking Quality")
+
+        kicks = ((codeType == "Kick") & (kickDescriptor != "Touch Kick")).to_numpy()
+        carries = table.labelMask("Event", "Carry")
+        tackles = table.labelMask("Event", "Tackle") & table.labelMask(
+            "Tackle Outcome", "Complete"
+        )
+        return {
+            "Tries": (codeTeam, (codeType == "Try").to_numpy(), None),
+            "Penalty Goals": (
+                codeTeam,
+                (codeType == "Goal Kick").to_numpy()
+                & table.labelMask("Goal Type", "Penalty Goal")
+                & table.labelMask("Goal Outcome", "Goal Kicked"),
+                None,
+            ),
+            "22m Entries": (
+                codeTeam,
+                (codeType == "22 Entry").to_numpy()
+                & table.labelMask("22 Entry", "New Entry"),
+                None,
+            ),
+            "Kicks In Play": (codeTeam, kicks, None),
+            "Box Kicks": (codeTeam, kicks & table.labelMask("Kick Style", "Box"), None),
+            "Mauls": (codeTeam, (codeType == "Maul").to_numpy(), None),
+            "Maul Metres": (codeTeam, (codeType == "Maul").to_numpy(), maulMetres),
+            "Scrums": (codeTeam, (codeType == "Scrum").to_numpy(), None),
+            "Scrum Penalties Won": (
+                codeTeam,
+                (codeType == "Scrum").to_numpy()
+                & scrumResult.isin(
+                    ["Won Free Kick", "Won Penalty", "Won Penalty Try"]
+                ).to_numpy(),
+                None,
+            ),
+            "Scrum Penalties Conceded": (
+                codeTeam,
+                (codeType == "Scrum").to_numpy()
+                & scrumResult.isin(["Lost Pen Con", "Lost Free Kick"]).to_numpy(),
+                None,
+            ),
+            "Penalties Conceded": (
+                codeTeam,
+                (codeType == "Penalty Conceded").to_numpy(),
+                None,
+            ),
+            "Turnovers Conceded": (codeTeam, (codeType == "Turnover").to_numpy(), None),
+            "Tap Pens": (codeTeam, (codeType == "Tap Pen").to_numpy(), None),
+            "Carries": (carryTeam, carries, None),
+            "Completed Tackles": (tackleTeam, tackles, None),
+            "Dominant Tackles": (
+                tackleTeam,
+                tackles
+                & table.labelMask("Tackle Dominance", "Dominant Tackle Contact"),
+                None,
+            ),
+            "Linebreaks": (
+                attackTeam,
+                table.labelMask("Attacking Qualities", "Initial Break"),
+                None,
+            ),
+            "Defenders Beaten": (
+                attackTeam,
+                table.labelMask("Attacking Qualities", "Defender Beaten"),
+                None,
+            ),
+        }
+
+    def getGameStats(self):
+        # One row per (game, team) with every stat, for all teams at once
+        games = self.events.events["game"]
+        statColumns = self.getStatColumns()
+        frames = []
+        for stat, (team, mask, weight) in statColumns.items():
+            mask = mask & team.notna().to_numpy()
+            frames.append(
+                pd.DataFrame(
+                    {
+                        "game": games[mask],
+                        "team": team.to_numpy()[mask],
+                        "stat": stat,
+                        "value": (
+                            1 if weight is None else weight.fillna(0).to_numpy()[mask]
+                        ),
+                    }
+                )
+            )
+        long = pd.concat(frames, ignore_index=True)
+        counts = long.pivot_table(
+            index=["game", "team"],
+            columns="stat",
+            values="value",
+            aggfunc="sum",
+            fill_value=0,
+        ).reindex(columns=list(statColumns.keys()), fill_value=0)
+
+        teams = self.events.gameTeams()
+        pairs = teams.merge(teams, on="game", suffixes=("", "_opp"))
+        pairs = pairs[pairs["team"] != pairs["team_opp"]]
+        forStats = counts.reindex(
+            pd.MultiIndex.from_frame(pairs[["game", "team"]]), fill_value=0
+        )
+        againstStats = counts.reindex(
+            pd.MultiIndex.from_frame(pairs[["game", "team_opp"]]), fill_value=0
+        )
+        againstStats.index = forStats.index
+        return forStats, againstStats
+
+    def getSections(self):
+        # Same shape as a Team Season Report snapshot so TeamReport can rank it
+        forStats, againstStats = self.getGameStats()
+        sections = []
+        forAverages = forStats.groupby(level="team").mean().round(2)
+        againstAverages = againstStats.groupby(level="team").mean().round(2)
+        sections.append(
+            {
+                "sheet": "Match XML",
+                "title": "Per Game Averages",
+                "df": forAverages.reset_index().rename(columns={"team": "Team"}),
+                "opp_title": "Opposition Per Game Averages",
+                "opp_df": againstAverages.reset_index().rename(
+                    columns={"team": "Team"}
+                ),
+            }
+        )
+        return sections
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate a league comparison presentation for an MLR team from match XML files."
+    )
+    parser.add_argument("folder", help="Path to folder containing XML files")
+    parser.add_argument(
+        "team",
+        help="Team name spelt and capitalize the exact way it is referenced in Oval Insights XML",
+    )
+    parser.add_argument(
+        "--native-charts",
+        action="store_true",
+        help="Build the graphs as editable PowerPoint charts instead of images",
+    )
+    args = parser.parse_args()
+    xml_files = list(Path(args.folder).glob("*.xml"))
+    league = LeagueTable(xml_files)
+    tr = TeamReport(
+        args.team, sections=league.getSections(), native_charts=args.native_charts
+    )
+    tr.get_outlier_stats()
+    tr.draw_stats()
+    tr.add_graphs_to_pres()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import argparse
+import numpy as np
+import pandas as pd
+from EventTable import Dimension
+from EventArchive import EventArchive
+from EventCube import EventCube
+
+
+class Matchups:
+    # Carrier x tackler counts: every carry joined to the tackles on it,
+    # i.e. opposition tackle instances starting within window seconds of the
+    # carry in the same game. Kept as sparse COO cells of (game, attacker,
+    # defender, kind) and a count, so a game is a slice of the cells and a
+    # season is the same cells summed over game, and tables built apart
+    # merge by re-keying their player ids like EventTable.concat
+    kinds = [
+        "Tackles",
+        "Completed Tackles",
+        "Missed Tackles",
+        "Dominant Tackles",
+        "Dominant Carries",
+    ]
+    window = 1.0
+
+    def __init__(self, table):
+        self.players = table.values
+        self.games = table.games
+        carries = np.flatnonzero(table.labelMask("Event", "Carry"))
+        tackles = np.flatnonzero(table.labelMask("Event", "Tackle"))
+        # Every tackle within the window of each carry, via its key range
+        starts = np.nan_to_num(table.events["start"])
+        games = table.events["game"]
+        tackleKeys = table.timeKey[tackles]
+        carryKeys = table.timeKey[carries]
+        low = np.searchsorted(tackleKeys, carryKeys - self.window, "left")
+        high = np.searchsorted(tackleKeys, carryKeys + self.window, "right")
+        counts = high - low
+        carryRows = np.repeat(carries, counts)
+        tackleRows = tackles[
+            np.repeat(low, counts)
+            + np.arange(counts.sum())
+            - np.repeat(np.cumsum(counts) - counts, counts)
+        ]
+        carryTeams = table.labelCodes("Carry")[carryRows]
+        tackleTeams = table.labelCodes("Tackle")[tackleRows]
+        players = table.labelCodes("Player")
+        joined = (
+            (games[carryRows] == games[tackleRows])
+            & (np.abs(starts[carryRows] - starts[tackleRows]) <= self.window)
+            & ((carryTeams != tackleTeams) | (carryTeams < 0))
+            & (players[carryRows] >= 0)
+            & (players[tackleRows] >= 0)
+        )
+        carryRows, tackleRows = carryRows[joined], tackleRows[joined]
+
+        # The label values are registered in StatMonkey.statValues, so the
+        # schema diff reports it if a provider renames one
+        kindMasks = [
+            np.ones(len(tackleRows), dtype=bool),
+            table.labelMask("Tackle Outcome", "Complete")[tackleRows],
+            table.labelMask("Tackle Outcome", "Missed")[tackleRows],
+            table.labelMask("Tackle Dominance", "Dominant Tackle Contact")[
+                tackleRows
+            ],
+            table.labelMask("Carry Dominance", "Dominant Contact")[carryRows],
+        ]
+        kinds = np.concatenate(
+            [np.full(mask.sum(), kind) for kind, mask in enumerate(kindMasks)]
+        ).astype(np.int64)
+        pairs = np.concatenate([np.flatnonzero(mask) for mask in kindMasks])
+        self.cells = EventCube.aggregate(
+            {
+                "game": games[tackleRows][pairs],
+                "attacker": players[carryRows][pairs],
+                "defender": players[tackleRows][pairs],
+                "kind": kinds,
+            },
+            tackleRows[pairs].astype(np.int64),
+            np.ones(len(pairs), dtype=np.int64),
+        )
+
+    @classmethod
+    def merge(cls, parts):
+        # One set of matchups over several, in order, e.g. one per file
+        merged = cls.__new__(cls)
+        merged.players = Dimension()
+        games = []
+        cells = {name: [] for name in ["game", "attacker", "defender", "kind"]}
+        counts = []
+        gameOffset = 0
+        for part in parts:
+            idMap = np.array(
+                [merged.players.intern(n) for n in part.players.names] + [-1],
+                dtype=np.int64,
+            )
+            cells["game"].append(part.cells["game"] + gameOffset)
+            cells["attacker"].append(idMap[part.cells["attacker"]])
+            cells["defender"].append(idMap[part.cells["defender"]])
+            cells["kind"].append(part.cells["kind"])
+            counts.append(part.cells["count"])
+            games.append(part.games)
+            gameOffset += len(part.games)
+        merged.games = pd.concat(games, ignore_index=True) if games else None
+        columns = {
+            name: np.concatenate(values) if values else np.zeros(0, dtype=np.int64)
+            for name, values in cells.items()
+        }
+        counts = np.concatenate(counts) if counts else np.zeros(0, dtype=np.int64)
+        merged.cells = EventCube.aggregate(
+            columns, np.zeros(len(counts), dtype=np.int64), counts
+        )
+        return merged
+
+    def getMatrix(self, kind="Tackles", games=None):
+        # (attackers, defenders, counts) COO triplets of one kind summed over
+        # games, a boolean mask over the games, or the whole season
+        cells = self.cells
+        mask = cells["kind"] == self.kinds.index(kind)
+        if games is not None:
+            mask &= np.asarray(games, dtype=bool)[cells["game"]]
+        totals = EventCube.aggregate(
+            {"attacker": cells["attacker"][mask], "defender": cells["defender"][mask]},
+            np.zeros(mask.sum(), dtype=np.int64),
+            cells["count"][mask],
+        )
+        return totals["attacker"], totals["defender"], totals["count"]
+
+    def getPairs(self, games=None):
+        # One row per carrier and tackler pair with a count per kind, and
+        # which of them won the contact more often
+        pairs = None
+        for kind in self.kinds:
+            attackers, defenders, counts = self.getMatrix(kind, games)
+            frame = pd.DataFrame(
+                {kind: counts}, index=pd.MultiIndex.from_arrays([attackers, defenders])
+            )
+            pairs = frame if pairs is None else pairs.join(frame, how="outer")
+        pairs = pairs.fillna(0).astype(np.int64)
+        pairs["dominance"] = pairs["Dominant Tackles"] - pairs["Dominant Carries"]
+        pairs.index = pd.MultiIndex.from_arrays(
+            [
+                self.players.decode(pairs.index.get_level_values(0).to_numpy()),
+                self.players.decode(pairs.index.get_level_values(1).to_numpy()),
+            ],
+            names=["attacker", "defender"],
+        )
+        return pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Who dominates whom: carrier against tackler counts from carries and tackles at the same moment"
+    )
+    EventArchive.addSourceArgument(parser)
+    parser.add_argument("--player", help="Only matchups this player is in")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    table = EventArchive.openSource(args.source)
+    pairs = Matchups(table).getPairs()
+    if args.player:
+        attackers = pairs.index.get_level_values("attacker")
+        defenders = pairs.index.get_level_values("defender")
+        pairs = pairs[(attackers == args.player) | (defenders == args.player)]
+    pairs = pairs.sort_values(["dominance", "Tackles"], ascending=False)
+    print(pairs.head(args.top).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import math
+from pptx.chart.data import CategoryChartData
+from pptx.dml.color import RGBColor
+from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION, XL_LABEL_POSITION
+from pptx.util import Inches, Pt
+
+
+def chartSpec(kind, title, categories, values, valueTitle=None, colors=None):
+    # Bar or pie data drawn as an editable PowerPoint chart instead of a
+    # rendered image. A plain dict so it pickles to render workers and
+    # round-trips through the chart cache json. values may also be a dict of
+    # series name to values, drawn side by side with one colour per series
+    if isinstance(values, dict):
+        values = {
+            str(name): [chartValue(value) for value in series]
+            for name, series in values.items()
+        }
+    else:
+        values = [chartValue(value) for value in values]
+    return {
+        "chart": kind,
+        "title": title,
+        "categories": [str(category) for category in categories],
+        "values": values,
+        "valueTitle": valueTitle,
+        "colors": colors,
+    }
+
+
+def chartValue(value):
+    # A missing value stays None, a blank point labelled n/a and null in json
+    if value is None or math.isnan(float(value)):
+        return None
+    return round(float(value), 2)
+
+
+def chartGrid(title, charts, cols):
+    # Several charts laid out on one slide under a shared title
+    return {"chart": "grid", "title": title, "charts": charts, "cols": cols}
+
+
+def isChartSpec(stat):
+    return isinstance(stat, dict) and "chart" in stat
+
+
+def addChart(slide, spec, left, top, width=Inches(11), height=Inches(6)):
+    # python-pptx can't build a chart with no categories, so a stat with
+    # nothing to count gets its title and a note instead
+    if spec["chart"] == "grid":
+        if not spec["charts"]:
+            return addNoData(slide, spec, left, top, width)
+        return addChartGrid(slide, spec, left, top, width, height)
+    if not spec["categories"]:
+        return addNoData(slide, spec, left, top, width)
+    data = CategoryChartData()
+    data.categories = spec["categories"]
+    series = spec["values"]
+    if not isinstance(series, dict):
+        series = {spec["valueTitle"] or spec["title"]: series}
+    for name, values in series.items():
+        data.add_series(name, values)
+    if spec["chart"] == "pie":
+        chartType = XL_CHART_TYPE.PIE
+    else:
+        chartType = XL_CHART_TYPE.COLUMN_CLUSTERED
+    chart = slide.shapes.add_chart(chartType, left, top, width, height, data).chart
+
+    chart.has_title = True
+    chart.chart_title.text_frame.text = spec["title"]
+    chart.font.size = Pt(14)
+    plot = chart.plots[0]
+    plot.has_data_labels = True
+    labels = plot.data_labels
+    labels.number_format = "General"
+    labels.number_format_is_linked = False
+    labels.font.bold = True
+    if spec["colors"]:
+        # A colour per series when there are several, else per point
+        if len(series) > 1:
+            formats = [plotSeries.format for plotSeries in plot.series]
+        else:
+            formats = [point.format for point in plot.series[0].points]
+        for format, color in zip(formats, spec["colors"]):
+            format.fill.solid()
+            format.fill.fore_color.rgb = RGBColor.from_string(color.lstrip("#"))
+    for plotSeries, values in zip(plot.series, series.values()):
+        for point, value in zip(plotSeries.points, values):
+            if value is None:
+                point.data_label.text_frame.text = "n/a"
+
+    if spec["chart"] == "pie":
+        chart.has_legend = True
+        chart.legend.position = XL_LEGEND_POSITION.RIGHT
+        chart.legend.include_in_layout = False
+        labels.position = XL_LABEL_POSITION.CENTER
+        return chart
+
+    chart.has_legend = len(series) > 1
+    if chart.has_legend:
+        chart.legend.position = XL_LEGEND_POSITION.BOTTOM
+        chart.legend.include_in_layout = False
+    plot.gap_width = 50
+    labels.position = XL_LABEL_POSITION.INSIDE_END
+    if spec["valueTitle"]:
+        axis = chart.value_axis
+        axis.has_title = True
+        axis.axis_title.text_frame.text = spec["valueTitle"]
+    chart.value_axis.has_major_gridlines = False
+    return chart
+
+
+def addChartGrid(slide, spec, left, top, width, height):
+    titleHeight = Inches(0.5)
+    title = slide.shapes.add_textbox(left, top, width, titleHeight).text_frame
+    title.text = spec["title"]
+    title.paragraphs[0].font.size = Pt(20)
+    title.paragraphs[0].font.bold = True
+    cols = spec["cols"]
+    rows = -(-len(spec["charts"]) // cols)
+    cellWidth = width // cols
+    cellHeight = (height - titleHeight) // rows
+    for index, chart in enumerate(spec["charts"]):
+        row, col = divmod(index, cols)
+        addChart(
+            slide,
+            chart,
+            left + col * cellWidth,
+            top + titleHeight + row * cellHeight,
+            cellWidth,
+            cellHeight,
+        )
+
+
+def addNoData(slide, spec, left, top, width):
+    text = slide.shapes.add_textbox(left, top, width, Inches(1)).text_frame
+    text.text = spec["title"]
+    text.paragraphs[0].font.size = Pt(14)
+    text.paragraphs[0].font.bold = True
+    note = text.add_paragraph()
+    note.text = "No data"
+    note.font.size = Pt(12)
@@ -0,0 +1,55 @@
+import numpy as np
+
+
+class PitchGrid:
+    fieldLength = 140
+    fieldWidth = 68
+    # In-goal, 22, halfway, 22, in-goal in the StatMonkey pitch frame
+    lengthEdges = [0, 20, 42, 70, 98, 120, 140]
+    # Touchline, 5 m, 15 m, 15 m, 5 m, touchline
+    channelEdges = [0, 5, 15, 53, 63, 68]
+    grids = {
+        "zones": (lengthEdges, [0, fieldWidth]),
+        "channels": (lengthEdges, channelEdges),
+        "fine": (range(0, fieldLength + 1, 5), range(0, fieldWidth + 1, 4)),
+    }
+
+    def __init__(self, name="channels"):
+        xEdges, yEdges = self.grids[name]
+        self.name = name
+        self.xEdges = np.asarray(xEdges, dtype=float)
+        self.yEdges = np.asarray(yEdges, dtype=float)
+
+    def bin(self, xValues, yValues):
+        # Clip so points on or just past the touchlines land in the edge cells
+        xValues = np.clip(np.asarray(xValues, dtype=float), 0, self.fieldLength)
+        yValues = np.clip(np.asarray(yValues, dtype=float), 0, self.fieldWidth)
+        counts, _, _ = np.histogram2d(
+            xValues, yValues, bins=[self.xEdges, self.yEdges]
+        )
+        return counts
+
+    def cellIndex(self, xValues, yValues):
+        # Flat x * len(yCells) + y cell of each point, binned like bin() does;
+        # -1 where a coordinate is missing
+        xValues = np.asarray(xValues, dtype=float)
+        yValues = np.asarray(yValues, dtype=float)
+        xCells = np.searchsorted(
+            self.xEdges, np.clip(xValues, 0, self.fieldLength), "right"
+        )
+        yCells = np.searchsorted(
+            self.yEdges, np.clip(yValues, 0, self.fieldWidth), "right"
+        )
+        xCells = np.minimum(xCells - 1, len(self.xEdges) - 2)
+        yCells = np.minimum(yCells - 1, len(self.yEdges) - 2)
+        cells = xCells * (len(self.yEdges) - 1) + yCells
+        cells[np.isnan(xValues) | np.isnan(yValues)] = -1
+        return cells
+
+    def cellCount(self):
+        return (len(self.xEdges) - 1) * (len(self.yEdges) - 1)
+
+    def cellCenters(self):
+        xCenters = (self.xEdges[:-1] + self.xEdges[1:]) / 2
+        yCenters = (self.yEdges[:-1] + self.yEdges[1:]) / 2
+        return xCenters, yCenters
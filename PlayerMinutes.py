@@ -0,0 +1,127 @@
+import argparse
+import numpy as np
+import pandas as pd
+from EventArchive import EventArchive
+
+
+class PlayerMinutes:
+    # Each player's time on the field per game, estimated from the first and
+    # last event they are tagged in. A first or last event close enough to
+    # kick-off or full time is taken as playing from the start or to the
+    # end, and where the XML has substitution labels their times win. Game
+    # clocks in the video include stoppages, so time is scaled so the whole
+    # game is 80 minutes
+    gameMinutes = 80
+    # Share of the game from either end that still counts as a full half
+    edgeShare = 0.15
+    # Label groups whose value is the player coming on or going off
+    subOnGroup = "Sub On"
+    subOffGroup = "Sub Off"
+
+    def __init__(self, table):
+        self.table = table
+        self.intervals = self.getIntervals()
+
+    def getGameSpans(self):
+        # (start, end) of every game, NaN for games with no events
+        table = self.table
+        starts = np.nan_to_num(table.events["start"])
+        ends = np.fmax(table.events["end"], starts)
+        offsets = table.gameOffsets
+        played = offsets[1:] > offsets[:-1]
+        gameStarts = np.full(len(table.games), np.nan)
+        gameEnds = np.full(len(table.games), np.nan)
+        if played.any():
+            gameStarts[played] = np.minimum.reduceat(starts, offsets[:-1][played])
+            gameEnds[played] = np.maximum.reduceat(ends, offsets[:-1][played])
+        return gameStarts, gameEnds
+
+    def getLabelTimes(self, group, times):
+        # (game * values + player) key and time of every label in group
+        table = self.table
+        selected = table.labels["group"] == table.groups.lookup(group)
+        events = table.labels["event"][selected]
+        players = table.labels["value"][selected].astype(np.int64)
+        keys = table.events["game"][events].astype(np.int64) * (
+            len(table.values) + 1
+        ) + players
+        return keys, times[events]
+
+    def getIntervals(self):
+        # One row per player per game with the on-field interval and minutes
+        table = self.table
+        starts = np.nan_to_num(table.events["start"])
+        ends = np.fmax(table.events["end"], starts)
+        playerKeys, firstTimes = self.getLabelTimes("Player", starts)
+        _, lastTimes = self.getLabelTimes("Player", ends)
+        onKeys, onTimes = self.getLabelTimes(self.subOnGroup, starts)
+        offKeys, offTimes = self.getLabelTimes(self.subOffGroup, starts)
+
+        keys = np.unique(np.concatenate([playerKeys, onKeys, offKeys]))
+        first = np.full(len(keys), np.inf)
+        last = np.full(len(keys), -np.inf)
+        np.minimum.at(first, np.searchsorted(keys, playerKeys), firstTimes)
+        np.maximum.at(last, np.searchsorted(keys, playerKeys), lastTimes)
+        subOn = np.full(len(keys), np.nan)
+        subOff = np.full(len(keys), np.nan)
+        np.fmin.at(subOn, np.searchsorted(keys, onKeys), onTimes)
+        np.fmax.at(subOff, np.searchsorted(keys, offKeys), offTimes)
+
+        games, players = np.divmod(keys, len(table.values) + 1)
+        gameStarts, gameEnds = self.getGameSpans()
+        gameStarts, gameEnds = gameStarts[games], gameEnds[games]
+        spans = gameEnds - gameStarts
+        edge = spans * self.edgeShare
+        start = np.where(first - gameStarts <= edge, gameStarts, first)
+        end = np.where(gameEnds - last <= edge, gameEnds, last)
+        start = np.where(np.isnan(subOn), start, subOn)
+        end = np.where(np.isnan(subOff), end, subOff)
+        # Only came on or went off: the rest of the game from or to that
+        start = np.where(np.isinf(start), gameStarts, start)
+        end = np.where(np.isinf(end), gameEnds, end)
+        start = np.clip(start, gameStarts, gameEnds)
+        end = np.clip(end, start, gameEnds)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            minutes = np.where(
+                spans > 0, (end - start) / spans * self.gameMinutes, 0
+            )
+        return pd.DataFrame(
+            {
+                "game": games,
+                "player": table.values.decode(players),
+                "start": start,
+                "end": end,
+                "minutes": minutes,
+            }
+        )
+
+    def getMinutes(self):
+        # {player: minutes} over every game in the table
+        return self.intervals.groupby("player")["minutes"].sum().to_dict()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Estimate every player's minutes from the events they are tagged in"
+    )
+    EventArchive.addSourceArgument(parser)
+    parser.add_argument("--player", help="Show this player's games one by one")
+    args = parser.parse_args()
+
+    table = EventArchive.openSource(args.source)
+    intervals = PlayerMinutes(table).intervals
+    if args.player:
+        intervals = intervals[intervals["player"] == args.player].assign(
+            date=lambda games: table.games["date"].to_numpy()[games["game"]]
+        )
+        print(intervals.round(1).to_string(index=False))
+        return
+    summary = intervals.groupby("player").agg(
+        games=("game", "size"), minutes=("minutes", "sum")
+    )
+    summary["perGame"] = summary["minutes"] / summary["games"]
+    print(summary.sort_values("minutes", ascending=False).round(1).to_string())
+
+
+if __name__ == "__main__":
+    main()
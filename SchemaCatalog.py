@@ -0,0 +1,205 @@
+import json
+import os
+import argparse
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from EventArchive import EventArchive
+
+
+class SchemaCatalog:
+    # Every code, label group and label value seen, counted per file and
+    # kept between runs, so a provider adding or renaming a value shows up
+    # when the file is ingested instead of as a slide quietly losing counts.
+    # A table is counted with one np.unique over (game, code) and one over
+    # (game, group, value), and files already in the catalog are skipped
+    version = 2
+
+    def __init__(self, path=".schema.json"):
+        self.path = Path(path)
+        self.files = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                saved = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+        if saved.get("version") != self.version:
+            return False
+        self.files = saved["files"]
+        return True
+
+    def save(self):
+        tmpPath = self.path.with_name(f"{self.path.name}.tmp")
+        with open(tmpPath, "w") as f:
+            json.dump({"version": self.version, "files": self.files}, f, indent=1)
+        os.replace(tmpPath, self.path)
+
+    def record(self, table):
+        # Count every file of the table the catalog doesn't already have as
+        # it is on disk; returns how many files were added or replaced
+        games = [
+            game
+            for game in table.games.itertuples()
+            if self.files.get(Path(game.file).name, {}).get("source")
+            != EventArchive.getGameSource(game)
+        ]
+        if not games:
+            return 0
+        wanted = np.zeros(len(table.games), dtype=bool)
+        wanted[[game.game for game in games]] = True
+
+        eventGames = table.events["game"]
+        codeCounts = self.getCounts(
+            eventGames[wanted[eventGames]], table.events["code"][wanted[eventGames]]
+        )
+        labelGames = eventGames[table.labels["event"]]
+        labelWanted = wanted[labelGames]
+        labelCounts = self.getCounts(
+            labelGames[labelWanted],
+            table.labels["group"][labelWanted],
+            table.labels["value"][labelWanted],
+        )
+        codeSuffixes = table.codeSuffixes()
+        for game in games:
+            codes = codeCounts[codeCounts[:, 0] == game.game]
+            labels = labelCounts[labelCounts[:, 0] == game.game]
+            groups = {}
+            for _, group, value, count in labels.tolist():
+                groups.setdefault(table.groups.names[group], {})[
+                    table.values.names[value]
+                ] = count
+            self.files[Path(game.file).name] = {
+                "source": EventArchive.getGameSource(game),
+                "date": game.date,
+                "codes": {
+                    table.codes.names[code]: count
+                    for _, code, count in codes.tolist()
+                    if table.codes.names[code] is not None
+                },
+                "suffixes": sorted(
+                    {
+                        codeSuffixes[code]
+                        for _, code, _ in codes.tolist()
+                        if codeSuffixes[code] is not None
+                    }
+                ),
+                "labels": groups,
+            }
+        return len(games)
+
+    @staticmethod
+    def getCounts(*columns):
+        # Rows of each distinct combination of the columns and its count
+        keys = np.stack([np.asarray(column, dtype=np.int64) for column in columns])
+        keys = keys[:, np.all(keys >= 0, axis=0)]
+        unique, counts = np.unique(keys, axis=1, return_counts=True)
+        return np.vstack([unique, counts]).T
+
+    def getTotals(self):
+        # {code: count} and {group: {value: count}} over every file
+        codes = {}
+        labels = {}
+        for entry in self.files.values():
+            for code, count in entry["codes"].items():
+                codes[code] = codes.get(code, 0) + count
+            for group, values in entry["labels"].items():
+                totals = labels.setdefault(group, {})
+                for value, count in values.items():
+                    totals[value] = totals.get(value, 0) + count
+        return codes, labels
+
+    def diff(self, codeSuffixes, groups, values, closedGroups, files=None):
+        # Differences between the catalog, or just the named files in it,
+        # and what the stats read:
+        #   codeSuffixes  code suffixes after a team name, e.g. "Scrum"
+        #   groups        label groups the stats read
+        #   values        {group: values the stats match on}
+        #   closedGroups  groups where a value no stat matches is dropped
+        #                 from a count, so a new value there is a difference
+        # One row per difference, with the files it was seen in
+        entries = {
+            file: entry
+            for file, entry in self.files.items()
+            if files is None or file in files
+        }
+        rows = []
+
+        def add(kind, group, name, status, files):
+            rows.append(
+                {
+                    "kind": kind,
+                    "group": group,
+                    "name": name,
+                    "status": status,
+                    "count": sum(count for count in files.values()),
+                    "files": sorted(files),
+                }
+            )
+
+        # Codes the stats don't read (Ruck, Pass, ...) are expected, so only
+        # a code suffix no file has is a difference
+        seenSuffixes = set()
+        for entry in entries.values():
+            seenSuffixes.update(entry["suffixes"])
+        for suffix in codeSuffixes:
+            if suffix not in seenSuffixes:
+                add("code", None, suffix, "missing", {})
+
+        seenValues = {}
+        for file, entry in entries.items():
+            for group, groupValues in entry["labels"].items():
+                for value, count in groupValues.items():
+                    seen = seenValues.setdefault(group, {})
+                    seen.setdefault(value, {})[file] = count
+        for group in groups:
+            if group not in seenValues:
+                add("group", group, None, "missing", {})
+        for group, expected in values.items():
+            for value in expected:
+                if group in seenValues and value not in seenValues[group]:
+                    add("value", group, value, "missing", {})
+        for group in closedGroups:
+            for value, files in seenValues.get(group, {}).items():
+                if value not in values.get(group, []):
+                    add("value", group, value, "unknown", files)
+        return pd.DataFrame(
+            rows, columns=["kind", "group", "name", "status", "count", "files"]
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Catalog every code, label group and value per file and diff it against what the stats expect"
+    )
+    EventArchive.addSourceArgument(parser)
+    parser.add_argument(
+        "--catalog",
+        default=".schema.json",
+        help="Where the per-file counts are kept between runs",
+    )
+    parser.add_argument("--group", help="Print every value of this label group")
+    args = parser.parse_args()
+
+    table = EventArchive.openSource(args.source)
+    catalog = SchemaCatalog(args.catalog)
+    if catalog.record(table):
+        catalog.save()
+    print(f"{len(catalog.files)} files in {catalog.path}")
+    if args.group:
+        _, labels = catalog.getTotals()
+        values = pd.Series(labels.get(args.group, {}), dtype=int)
+        print(values.sort_values(ascending=False).to_string())
+        return
+
+    # What the stats expect lives with the stats
+    from StatMonkey import StatMonkey
+
+    pd.set_option("display.width", 200)
+    print(catalog.diff(*StatMonkey.getSchemaSpec()).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
-from lxml import etree
 import pandas as pd
 import numpy as np
+import matplotlib
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from pathlib import Path
@@ -14,6 +14,21 @@ from pptx import Presentation
 from pptx.util import Inches
 from Database.MongoDB import Mongo
 import logging
+import hashlib
+import ast
+from EventTable import EventTable
+from EventArchive import EventArchive
+from EventCube import EventCube
+from ExpectedPoints import ExpectedPoints
+from GameBootstrap import GameBootstrap
+from KickClusters import KickClusters
+from KickOutcomes import KickOutcomes
+from PlayerMinutes import PlayerMinutes
+from SchemaCatalog import SchemaCatalog
+from PitchGrid import PitchGrid
+from ChartCache import ChartCache
+from CanvasPool import CanvasPool
+from NativeChart import chartSpec, chartGrid, isChartSpec, addChart
 
 
 class StatMonkey:
@@ -24,15 +39,216 @@ class StatMonkey:
     figWidth = 11
     figHeight = 6
     arrowWidth = 1.5
-
-    def __init__(self, xmlFiles, teamName, mode="presentation"):
+    # Slides whose only argument is the player they are drawn for
+    playerStats = [
+        "getPlayerKickPaths",
+        "getLinebreakLocationsByPlayer",
+        "getScrumPensByPlayer",
+        "getCarryBreakdown",
+        "getPlayerTurnoverBD",
+    ]
+    # Stats that pick the players for the per-player slides that follow them
+    playerPickers = {
+        "getKickStats": "mainKickers",
+        "getLinebreakCountByPlayer": "linebreakKeyPlayers",
+        "getScrumConPens": "penalizedProps",
+        "getTopCarriers": "topCarriers",
+        "getPlayerTurnoverCount": "topTurnovers",
+    }
+    # Labels each stat needs on every event it reads
+    statFields = {
+        "getKickStats": ["Player"],
+        "getKickPaths": ["X_Start", "Y_Start", "X_End", "Y_End", "Kick Descriptor"],
+        "getLinebreakCountByPlayer": ["Player"],
+        "getLinebreakPhases": ["Phase Number"],
+        "getLinebreakLocations": ["X_Start", "Y_Start"],
+        "getMaulMap": ["X_Start", "Y_Start", "Maul Metres"],
+        "getScrumStats": ["Scrum Result"],
+        "getScrumConPens": ["Player", "Scrum Offences"],
+        "getScrumWonPens": ["Scrum Offences"],
+        "getTopTryScorers": ["Player"],
+        "getTopDefendersBeaten": ["Player"],
+        "getTopTacklers": ["Player"],
+        "getTopAssisters": ["Player"],
+        "getTopCarriers": ["Player"],
+        "getCarryBreakdown": ["Carry Outcome"],
+        "getPlayerTurnoverCount": ["Player"],
+        "getPlayerTurnoverBD": ["Error Descriptor"],
+    }
+    numericFields = ["X_Start", "Y_Start", "X_End", "Y_End", "Maul Metres"]
+    # What the stats read, checked against the schema catalog: codes after
+    # the team name, the label values stats match on, and the groups where
+    # a value none of them match is left out of every slide
+    statCodes = [
+        "Kick",
+        "Try",
+        "Goal Kick",
+        "Turnover",
+        "22 Entry",
+        "Maul",
+        "Scrum",
+        "Lineout",
+        "Tap Pen",
+        "Penalty Conceded",
+    ]
+    statValues = {
+        "Scrum Result": [
+            "Reset",
+            "Won Outright",
+            "Won Try",
+            "Won Free Kick",
+            "Won Penalty",
+            "Won Penalty Try",
+            "Lost Outright",
+            "Lost Pen Con",
+            "Lost Free Kick",
+        ],
+        "Kick Descriptor": [
+            "Territorial",
+            "Low",
+            "Bomb",
+            "Chip",
+            "Cross Pitch",
+            "Touch Kick",
+        ],
+        "Kick Style": ["Box", "Regular"],
+        "Attacking Qualities": ["Initial Break", "Defender Beaten", "Try Assist"],
+        "Event": ["Tackle", "Carry"],
+        "Tackle Outcome": ["Complete", "Missed"],
+        "Tackle Dominance": ["Dominant Tackle Contact"],
+        "Carry Dominance": ["Dominant Contact"],
+        "Carry Outcome": ["Tackled", "Other"],
+        "Pen Descriptor": ["Scrum Offence"],
+        "22 Entry": ["New Entry"],
+        "Goal Type": ["Penalty Goal"],
+        "Goal Outcome": ["Goal Kicked"],
+        "Poss Endset": ["End Try"],
+        "Maul Breakdown Outcome": ["Try Scored"],
+    }
+    closedGroups = [
+        "Scrum Result",
+        "Kick Descriptor",
+        "Kick Style",
+        "Tackle Outcome",
+    ]
+    # Per-player slides that small-multiples mode draws as one grid per page
+    smallMultipleTitles = {
+        "getPlayerKickPaths": "Kick Paths",
+        "getLinebreakLocationsByPlayer": "Linebreak Locations",
+        "getScrumPensByPlayer": "Scrum Penalties Conceded",
+        "getCarryBreakdown": "Carries Breakdown",
+        "getPlayerTurnoverBD": "Turnover Breakdown",
+    }
+    smallMultiplesPage = 6
+    # Scrum results counted as a success in getScrumStats
+    positiveScrumResults = [
+        "Won Outright",
+        "Won Try",
+        "Won Free Kick",
+        "Won Penalty",
+        "Won Penalty Try",
+    ]
+    # Stats whose title rate gets a bootstrapped confidence interval
+    rateStats = ["get22Stats", "getScrumStats", "getMaulMap"]
+    confidenceLevel = 0.95
+    # Top performer stats that can be ranked per 80 minutes played
+    per80Stats = [
+        "getTopDefendersBeaten",
+        "getTopTryScorers",
+        "getTopTacklers",
+        "getTopDomTacklers",
+        "getTopAssisters",
+        "getTopCarriers",
+        "getPlayerTurnoverCount",
+    ]
+    # Players with fewer minutes than this over the season aren't ranked per
+    # 80, so a single cameo can't top the chart
+    per80MinMinutes = 80
+    boxKickColor = "#FF85B4"
+    kickColors = {
+        # Pocket
+        "Territorial": "#63AAE3",
+        # Ice
+        "Low": "#E15554",
+        # Snow
+        "Bomb": "#E1BC29",
+        # Wedge
+        "Chip": "#2E8A59",
+        # Kick Pass
+        "Cross Pitch": "#7768AE",
+    }
+    kickOutcomeColors = {
+        "Try": "#1E5631",
+        "Regathered": "#3BB273",
+        "Penalty Won": "#63AAE3",
+        "Own Set Piece": "#1F3A93",
+        "Opposition Set Piece": "#E1BC29",
+        "Kicked Back": "#7768AE",
+        "Counter Attack": "#E15554",
+        "Penalty Conceded": "#FF85B4",
+        "Try Conceded": "#8B1E3F",
+        "Open Play": "#9E9E9E",
+    }
+    # Hash of the code behind the charts, read once per process
+    sourceDigest = None
+
+    def __init__(
+        self,
+        xmlFiles,
+        teamName,
+        mode="presentation",
+        heatmapGrid=None,
+        eventTable=None,
+        chartCache=None,
+        nativeCharts=False,
+        smallMultiples=False,
+        bootstrap=0,
+        kickClusters=0,
+        kickOutcomes=False,
+        per80=False,
+        eventCube=None,
+        expectedPoints=None,
+        schemaCatalog=None,
+    ):
         self.linebreakKeyPlayers = []
         self.mainKickers = []
         self.penalizedProps = []
         self.topTurnovers = []
+        self.topCarriers = []
         self.xmlFiles = xmlFiles
         self.teamName = teamName
         self.mode = mode
+        self.heatmapGrid = heatmapGrid
+        self.eventTable = eventTable
+        self.eventCube = eventCube
+        self.expectedPoints = expectedPoints or ExpectedPoints()
+        self.scoredEvents = None
+        self.gridCache = {}
+        self.chartCache = chartCache
+        # Bar and pie stats return chart data for native pptx charts rather
+        # than a rendered image; pitch maps are always rendered
+        self.nativeCharts = nativeCharts
+        self.smallMultiples = smallMultiples
+        # Resamples of the season's games behind the confidence intervals on
+        # rate titles, none when 0
+        self.bootstrap = bootstrap
+        self.rateIntervals = None
+        # Kick path slides draw this many representative arrows instead of
+        # one per kick, none when 0
+        self.kickClusters = kickClusters
+        self.kickClusterer = KickClusters(kickClusters)
+        # Colour kick arrows by what the kick led to instead of its type
+        self.kickOutcomes = kickOutcomes
+        self.kickOutcomeLinks = None
+        # Rank top performers per 80 minutes played instead of by totals
+        self.per80 = per80
+        self.playerMinutes = None
+        # Per-file counts of every code and label, diffed against what the
+        # stats read on every run when set
+        self.schemaCatalog = schemaCatalog
+        self.styleKey = None
+        self.quarantine = []
+        self.canvasPool = CanvasPool(self.figWidth, self.figHeight)
         logging.basicConfig(
             level=logging.INFO,
             format="%(asctime)s %(message)s",
@@ -41,6 +257,119 @@ class StatMonkey:
         if mode == "presentation":
             self.prs = Presentation()
 
+    @staticmethod
+    def addArguments(parser):
+        # The options that change what goes into the deck, shared by every
+        # command that builds one
+        parser.add_argument(
+            "--heatmap",
+            choices=list(PitchGrid.grids.keys()),
+            help="Bin linebreak and maul locations into pitch zones instead of scattering every point",
+        )
+        parser.add_argument(
+            "--native-charts",
+            action="store_true",
+            help="Build bar and pie stats as editable PowerPoint charts instead of images",
+        )
+        parser.add_argument(
+            "--small-multiples",
+            action="store_true",
+            help="Draw the per-player breakdowns as one grid of players per slide",
+        )
+        parser.add_argument(
+            "--schema-catalog",
+            default=".schema.json",
+            help="Where the per-file counts of every code and label value are kept, diffed against what the stats read into the quarantine file",
+        )
+        parser.add_argument(
+            "--xpoints-model",
+            default=".xpoints.json",
+            help="Where the expected-points coefficients are kept, refitted only when the games change",
+        )
+        parser.add_argument(
+            "--bootstrap",
+            type=int,
+            default=0,
+            help="Resample the games this many times to put 95%% confidence intervals on the rates in slide titles",
+        )
+        parser.add_argument(
+            "--kick-clusters",
+            type=int,
+            default=0,
+            help="Draw kick paths as this many k-means clusters of similar kicks instead of every arrow",
+        )
+        parser.add_argument(
+            "--kick-outcomes",
+            action="store_true",
+            help="Colour kick arrows by what the kick led to, e.g. regathered or counter attack, instead of kick type",
+        )
+        parser.add_argument(
+            "--per-80",
+            action="store_true",
+            help="Rank the top performer slides per 80 minutes played, estimated from each player's tagged events",
+        )
+
+    @staticmethod
+    def getOptions(args):
+        # Constructor keywords for the options addArguments parsed
+        return {
+            "heatmapGrid": args.heatmap,
+            "nativeCharts": args.native_charts,
+            "smallMultiples": args.small_multiples,
+            "bootstrap": args.bootstrap,
+            "kickClusters": args.kick_clusters,
+            "kickOutcomes": args.kick_outcomes,
+            "per80": args.per_80,
+            "expectedPoints": ExpectedPoints(args.xpoints_model),
+            "schemaCatalog": SchemaCatalog(args.schema_catalog),
+        }
+
+    @staticmethod
+    def addBuildArguments(parser):
+        # addArguments plus where a one-off build reads its games from and
+        # writes its cache and quarantine to
+        parser.add_argument(
+            "--archive",
+            help="Event archive directory; new XML files in the folder are appended and stats run over the whole archive",
+        )
+        parser.add_argument(
+            "--chart-cache",
+            default=".chart_cache",
+            help="Directory of rendered charts reused when a slide's inputs are unchanged",
+        )
+        parser.add_argument(
+            "--chart-cache-mb",
+            type=int,
+            default=512,
+            help="Size the chart cache is trimmed back to, least recently used first",
+        )
+        parser.add_argument(
+            "--quarantine",
+            default="quarantine.csv",
+            help="Where to write the files, events and stats that were skipped, with reasons",
+        )
+        parser.add_argument(
+            "--no-chart-cache",
+            action="store_true",
+            help="Render every chart from scratch",
+        )
+        StatMonkey.addArguments(parser)
+
+    @staticmethod
+    def getBuildOptions(args, xmlFiles):
+        # getOptions plus the archive's table and cube and the chart cache
+        options = StatMonkey.getOptions(args)
+        if args.archive:
+            archive = EventArchive(args.archive)
+            archive.append(xmlFiles)
+            options["eventTable"] = archive.open()
+            options["eventCube"] = EventCube.openArchive(archive, options["eventTable"])
+        if not args.no_chart_cache:
+            options["chartCache"] = ChartCache(
+                args.chart_cache, args.chart_cache_mb * 1024 * 1024
+            )
+        return options
+
     def show(self, statPath):
         plt.figure(figsize=(self.figWidth, self.figHeight))
         img = mpimg.imread(statPath)
@@ -51,86 +380,396 @@ class StatMonkey:
         plt.close()
 
     def getAllStats(self):
-        results = []
-        if self.mode == "presentation":
-            results.append(self.getKickStats())
-            results.append(self.getKickPaths())
-            results.append(self.getAttackingKickPaths())
-            results.append(self.getGroupKickPaths("pocket"))
-            results.append(self.getGroupKickPaths("windy"))
-            results.append(self.getGroupKickPaths("ice"))
-            results.append(self.getGroupKickPaths("snow"))
-            results.append(self.getGroupKickPaths("wedge"))
-            results.append(self.getGroupKickPaths("kp"))
-            for player in self.mainKickers:
-                results.append(self.getPlayerKickPaths(player))
-            results.append(self.get22Stats())
-            results.append(self.getLinebreakCountByPlayer())
-            results.append(self.getLinebreakPhases())
-            results.append(self.getLinebreakLocations())
+        self.quarantine = (
+            self.getEventTable().quarantine
+            + self.validateSchema()
+            + self.validateStats()
+        )
+        return [self.getStat(name, args) for name, args in self.getStatPlan()]
+
+    def validateStats(self):
+        # Events a stat reads that lack a label it needs. Counts already skip
+        # a missing label and plots skip NaN points, so these are reported
+        # rather than dropped
+        table = self.getEventTable()
+        quarantine = []
+        for name, fields in self.statFields.items():
+            args = (None,) if name in self.playerStats else ()
+            mask = self.getStatInputMask(name, args)
+            missing = {}
+            for field in fields:
+                if field in self.numericFields:
+                    absent = np.isnan(table.labelNumbers(field))
+                else:
+                    absent = table.labelCodes(field) < 0
+                for row in np.flatnonzero(mask & absent).tolist():
+                    missing.setdefault(row, []).append(field)
+            for row, fields in missing.items():
+                quarantine.append(
+                    {
+                        "file": Path(
+                            table.games["file"].iat[table.events["game"][row]]
+                        ).name,
+                        "id": int(table.events["id"][row]),
+                        "start": float(table.events["start"][row]),
+                        "code": table.codes.decode(table.events["code"][row]),
+                        "stat": name,
+                        "reason": f"Missing {', '.join(fields)}",
+                    }
+                )
+        return quarantine
+
+    @classmethod
+    def getSchemaSpec(cls):
+        # SchemaCatalog.diff arguments for what the stats read
+        groups = {field for fields in cls.statFields.values() for field in fields}
+        groups.update(cls.statValues)
+        return cls.statCodes, sorted(groups), cls.statValues, cls.closedGroups
+
+    def validateSchema(self):
+        # Codes, groups and values the stats expect but the files don't have,
+        # or that the files have but no stat counts
+        if self.schemaCatalog is None:
+            return []
+        table = self.getEventTable()
+        if self.schemaCatalog.record(table):
+            self.schemaCatalog.save()
+        files = {Path(f).name for f in table.games["file"]}
+        differences = self.schemaCatalog.diff(*self.getSchemaSpec(), files=files)
+        quarantine = []
+        for difference in differences.itertuples():
+            match difference.kind:
+                case "value":
+                    what = f'{difference.group} value "{difference.name}"'
+                case "group":
+                    what = f'label group "{difference.group}"'
+                case _:
+                    what = f'team code "{difference.name}"'
+            if difference.status == "missing":
+                reason = f"No {what} in any file"
+            else:
+                reason = (
+                    f"Unknown {what} counted by no stat "
+                    f"({difference.count} in {len(difference.files)} files)"
+                )
+            quarantine.append(
+                {
+                    "file": difference.files[0] if difference.files else None,
+                    "stat": "schema",
+                    "reason": reason,
+                }
+            )
+        return quarantine
+
+    def writeQuarantine(self, path):
+        if not self.quarantine:
+            return
+        pd.DataFrame(
+            self.quarantine,
+            columns=["file", "id", "start", "code", "stat", "reason"],
+        ).to_csv(path, index=False)
+        self.logger.warning(f"{len(self.quarantine)} quarantined, see {path}")
+
+    def getStat(self, name, args=()):
+        return self.renderStat(name, args)[0]
+
+    def renderStat(self, name, args=()):
+        # Render a slide, or copy it out of the chart cache when neither its
+        # input events nor the plotting code have changed. Returns the image
+        # path and the player list the stat picked, if it picks one
+        key = None
+        if self.chartCache is not None:
+            key = self.getStatFingerprint(name, args)
+            cached = self.chartCache.get(key)
+            if cached is not None:
+                for attribute, players in cached["state"].items():
+                    setattr(self, attribute, players)
+                self.logger.info(f"Reused {self.getSlideName(cached['path'])}")
+                return cached["path"], cached["state"]
+        try:
+            path = getattr(self, name)(*args)
+        except Exception as e:
+            # Leave the slide out and carry on with the rest of the deck
+            self.logger.exception(f"Failed {name}{args}")
+            self.quarantine.append({"stat": name, "reason": f"Stat failed: {e!r}"})
+            return None, {}
+        state = {}
+        if name in self.playerPickers:
+            attribute = self.playerPickers[name]
+            state[attribute] = getattr(self, attribute)
+        if key is not None:
+            self.chartCache.put(key, path, state)
+        return path, state
+
+    def getStatPlan(self):
+        # (method, args) for every slide in deck order. A generator so the
+        # player slides are read after the stat that picks the players has run
+        if self.mode != "presentation":
+            return
+        yield ("getKickStats", ())
+        yield ("getKickPaths", ())
+        yield ("getAttackingKickPaths", ())
+        for type in ["pocket", "windy", "ice", "snow", "wedge", "kp"]:
+            yield ("getGroupKickPaths", (type,))
+        yield from self.getPlayerPlan("getPlayerKickPaths", self.mainKickers)
+        yield ("get22Stats", ())
+        yield ("getExpectedPoints", ())
+        yield ("getLinebreakCountByPlayer", ())
+        yield ("getLinebreakPhases", ())
+        yield ("getTempoStats", ())
+        if self.heatmapGrid:
+            yield ("getLocationHeatmap", ("linebreaks",))
             for player in self.linebreakKeyPlayers:
-                results.append(self.getLinebreakLocationsByPlayer(player))
-            results.append(self.getMaulMap())
-            results.append(self.getScrumStats())
-            results.append(self.getScrumConPens())
-            results.append(self.getScrumWonPens())
-            for player in self.penalizedProps:
-                results.append(self.getScrumPensByPlayer(player))
-            results.append(self.getTopTryScorers())
-            results.append(self.getTopDefendersBeaten())
-            results.append(self.getTopTacklers())
-            results.append(self.getTopDomTacklers())
-            results.append(self.getTopAssisters())
-            results.append(self.getTopCarriers())
-            for player in self.topCarriers:
-                results.append(self.getCarryBreakdown(player))
-            results.append(self.getPlayerTurnoverCount())
-            for player in self.topTurnovers[:3]:
-                results.append(self.getPlayerTurnoverBD(player))
-        return results
+                yield ("getLocationHeatmap", ("linebreaks", player))
+            yield ("getLocationHeatmap", ("mauls",))
+        else:
+            yield ("getLinebreakLocations", ())
+            yield from self.getPlayerPlan(
+                "getLinebreakLocationsByPlayer", self.linebreakKeyPlayers
+            )
+            yield ("getMaulMap", ())
+        yield ("getScrumStats", ())
+        yield ("getScrumConPens", ())
+        yield ("getScrumWonPens", ())
+        yield from self.getPlayerPlan("getScrumPensByPlayer", self.penalizedProps)
+        yield ("getTopTryScorers", ())
+        yield ("getTopDefendersBeaten", ())
+        yield ("getTopTacklers", ())
+        yield ("getTopDomTacklers", ())
+        yield ("getTopAssisters", ())
+        yield ("getTopCarriers", ())
+        yield from self.getPlayerPlan("getCarryBreakdown", self.topCarriers)
+        yield ("getPlayerTurnoverCount", ())
+        yield from self.getPlayerPlan("getPlayerTurnoverBD", self.topTurnovers[:3])
+
+    def getPlayerPlan(self, name, players):
+        # One slide per player, or a grid of them per page in small-multiples
+        if not self.smallMultiples:
+            for player in players:
+                yield (name, (player,))
+            return
+        for start in range(0, len(players), self.smallMultiplesPage):
+            page = tuple(players[start : start + self.smallMultiplesPage])
+            yield ("getSmallMultiples", (name, page))
+
+    def getStatInputMask(self, name, args=()):
+        # Every event a slide reads, so a new match only re-renders the
+        # slides whose inputs it actually touches
+        table = self.getEventTable()
+        player = None
+        if name in self.playerStats:
+            player = args[0]
+        match name:
+            case "getSmallMultiples":
+                stat, players = args
+                playerRows = self.getPlayerRows(
+                    self.getStatInputMask(stat, (None,)), players
+                )
+                mask = np.zeros(len(table), dtype=bool)
+                for rows in playerRows.values():
+                    mask[rows] = True
+            case (
+                "getKickStats"
+                | "getKickPaths"
+                | "getAttackingKickPaths"
+                | "getGroupKickPaths"
+                | "getPlayerKickPaths"
+            ):
+                mask = table.codeMask(f"{self.teamName} Kick")
+            case "get22Stats":
+                mask = (
+                    table.labelMask("22 Entry", "New Entry")
+                    | table.codeMask(f"{self.teamName} Try")
+                    | table.codeMask(f"{self.teamName} Goal Kick")
+                    | table.codeMask(f"{self.teamName} Turnover")
+                )
+            case (
+                "getLinebreakCountByPlayer"
+                | "getLinebreakPhases"
+                | "getLinebreakLocations"
+                | "getLinebreakLocationsByPlayer"
+            ):
+                mask = self.getQualityMask("Initial Break")
+            case "getLocationHeatmap":
+                eventType, *player = args
+                player = player[0] if player else None
+                mask = self.getEventTypeMask(eventType)
+            case "getMaulMap":
+                mask = table.codeMask(f"{self.teamName} Maul")
+            case "getScrumStats":
+                mask = table.codeMask(f"{self.teamName} Scrum")
+            case "getScrumConPens" | "getScrumPensByPlayer":
+                mask = table.codeMask(
+                    f"{self.teamName} Penalty Conceded"
+                ) & table.labelMask("Pen Descriptor", "Scrum Offence")
+            case "getScrumWonPens":
+                # Every team's, since won pens are the opponents' conceded ones
+                mask = (
+                    table.codeSuffixes()[table.events["code"]] == "Penalty Conceded"
+                ) & table.labelMask("Pen Descriptor", "Scrum Offence")
+            case "getTopTryScorers":
+                mask = table.codeMask(f"{self.teamName} Try")
+            case "getTopDefendersBeaten":
+                mask = self.getQualityMask("Defender Beaten")
+            case "getTopTacklers" | "getTopDomTacklers":
+                mask = self.getTackleMask()
+            case "getTopAssisters":
+                mask = self.getQualityMask("Try Assist")
+            case "getTopCarriers" | "getCarryBreakdown":
+                mask = self.getCarryMask()
+            case "getPlayerTurnoverCount" | "getPlayerTurnoverBD":
+                mask = table.codeMask(f"{self.teamName} Turnover")
+            case _:
+                mask = np.ones(len(table), dtype=bool)
+        if player is not None:
+            mask = mask & table.playerMask(player)
+        return mask
+
+    def getStatFingerprint(self, name, args=()):
+        # Hash of a slide's input events by content rather than by id, since
+        # ids shift whenever the table is rebuilt with another file in it
+        table = self.getEventTable()
+        mask = self.getStatInputMask(name, args)
+        if self.bootstrap and name in self.rateStats:
+            # Which games get resampled depends on every rate's events
+            mask = np.any([self.getStatInputMask(stat) for stat in self.rateStats], 0)
+        if self.kickOutcomes:
+            # A kick's colour also depends on the event it was linked to
+            self.getKickOutcomes()
+            linked = table.events["kickOutcomeRow"][mask]
+            mask = mask.copy()
+            mask[linked[linked >= 0]] = True
+        if name == "getLinebreakPhases":
+            # The title counts the scores and turnovers after each break
+            mask = (
+                mask
+                | table.codeMask(f"{self.teamName} Try")
+                | table.codeMask(f"{self.teamName} Goal Kick")
+                | table.codeMask(f"{self.teamName} Turnover")
+            )
+        if self.per80 and name in self.per80Stats:
+            # Minutes come from every event the players were tagged in
+            mask = np.ones(len(table), dtype=bool)
+        rows = np.flatnonzero(mask)
+        digest = hashlib.sha1(
+            repr(
+                (
+                    name,
+                    args,
+                    self.teamName,
+                    self.mode,
+                    self.heatmapGrid,
+                    self.nativeCharts,
+                    self.smallMultiples,
+                    self.bootstrap,
+                    self.kickClusters,
+                    self.kickOutcomes,
+                    self.per80,
+                )
+            ).encode()
+        )
+        digest.update(self.getStyleKey().encode())
+        files = table.games["file"].to_numpy()[table.events["game"][rows]]
+        digest.update("\x1f".join(Path(f).name for f in files).encode())
+        codes = table.codes.decode(table.events["code"][rows])
+        digest.update("\x1f".join(map(str, codes)).encode())
+        for column in ["start", "end", "xStart", "yStart", "xEnd", "yEnd"]:
+            digest.update(np.ascontiguousarray(table.events[column][rows]).tobytes())
+        labelRows = np.isin(table.labels["event"], rows)
+        digest.update(
+            np.searchsorted(rows, table.labels["event"][labelRows]).tobytes()
+        )
+        for column, dimension in [("group", table.groups), ("value", table.values)]:
+            names = dimension.decode(table.labels[column][labelRows])
+            digest.update("\x1f".join(map(str, names)).encode())
+        return digest.hexdigest()
+
+    @classmethod
+    def getSourceDigest(cls):
+        # Hash of this file and every module beside it that it imports,
+        # directly or through another of them, found from the imports
+        if cls.sourceDigest is not None:
+            return cls.sourceDigest
+        found = {}
+        pending = [Path(__file__)]
+        while pending:
+            path = pending.pop()
+            if path.name in found:
+                continue
+            found[path.name] = path
+            for node in ast.walk(ast.parse(path.read_bytes())):
+                if isinstance(node, ast.Import):
+                    names = [alias.name for alias in node.names]
+                elif isinstance(node, ast.ImportFrom) and node.module:
+                    names = [node.module]
+                else:
+                    continue
+                for name in names:
+                    local = path.with_name(f"{name.split('.')[0]}.py")
+                    if local.is_file():
+                        pending.append(local)
+        digest = hashlib.sha1()
+        for name in sorted(found):
+            digest.update(found[name].read_bytes())
+        cls.sourceDigest = digest.hexdigest()
+        return cls.sourceDigest
+
+    def getStyleKey(self):
+        # Plot settings plus all the local code behind the charts, so
+        # editing a chart, its colours or what it counts never serves a
+        # stale image
+        if self.styleKey is None:
+            digest = hashlib.sha1(self.getSourceDigest().encode())
+            digest.update(
+                repr(
+                    (
+                        self.figWidth,
+                        self.figHeight,
+                        self.arrowWidth,
+                        self.boxKickColor,
+                        self.kickColors,
+                        self.kickOutcomeColors,
+                        matplotlib.__version__,
+                    )
+                ).encode()
+            )
+            self.styleKey = digest.hexdigest()
+        return self.styleKey
 
     def getKickStats(self):
         path = f"Stat PNGs/{self.teamName.replace(" ", "_")}_Kick_Count_By_Player.png"
         self.logger.info(f"Started {path}")
-        plt.figure(figsize=(self.figWidth, self.figHeight))
-
-        playerKicks = {}
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                kicks = root.xpath(f"//instance[code='{self.teamName} Kick']")
-                for kick in kicks:
-                    descriptor = str(
-                        kick.xpath("label[group='Kick Descriptor']/text/text()")[0]
-                    )
-                    if descriptor == "Touch Kick":
-                        continue
-                    player = str(
-                        kick.xpath("label[group='Player'][position()=1]/text/text()")[0]
-                    )
-
-                    if player in playerKicks:
-                        playerKicks[player] = playerKicks[player] + 1
-                    else:
-                        playerKicks[player] = 1
 
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
+        table = self.getEventTable()
+        kicks = table.codeMask(f"{self.teamName} Kick") & ~table.labelMask(
+            "Kick Descriptor", "Touch Kick"
+        )
+        playerKicks = self.countBy(kicks, "Player")
         median = statistics.median(playerKicks.values())
+        self.mainKickers = []
         for player in playerKicks:
             if playerKicks[player] > median:
                 self.mainKickers.append(player)
         sortedPlayerKicks = OrderedDict(
             sorted(playerKicks.items(), key=itemgetter(1), reverse=True)
         )
-        plt.title(f"Number Of Kicks By Player")
-        bars = plt.bar(sortedPlayerKicks.keys(), sortedPlayerKicks.values())
+        title = f"Number Of Kicks By Player"
+        if self.nativeCharts:
+            return chartSpec(
+                "bar",
+                title,
+                sortedPlayerKicks.keys(),
+                sortedPlayerKicks.values(),
+                "Number of Kicks",
+            )
+        fig, ax = self.canvasPool.acquire()
+        ax.set_title(title)
+        bars = ax.bar(sortedPlayerKicks.keys(), sortedPlayerKicks.values())
         for bar in bars:
             height = bar.get_height()
             if height < 2:
                 # Place text above the bar
-                plt.text(
+                ax.text(
                     bar.get_x() + bar.get_width() / 2.0,
                     height + 0.1,  # Add a small offset above the bar
                     f"{int(height)}",
@@ -140,7 +779,7 @@ class StatMonkey:
                 )
             else:
                 # Keep current positioning inside the bar
-                plt.text(
+                ax.text(
                     bar.get_x() + bar.get_width() / 2.0,
                     (height / 2),
                     f"{int(height)}",
@@ -148,12 +787,12 @@ class StatMonkey:
                     va="center",
                     fontweight="bold",
                 )
-        plt.ylabel("Number of Kicks")
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.subplots_adjust(bottom=0.25)
-        plt.savefig(path)
-        plt.close()
+        ax.set_ylabel("Number of Kicks")
+        ax.tick_params(axis="x", labelrotation=45)
+        fig.tight_layout()
+        fig.subplots_adjust(bottom=0.25)
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
 
         if self.mode == "database":
@@ -163,40 +802,367 @@ class StatMonkey:
 
     def addAllStatsToPres(self, statPathArray):
         for stat in statPathArray:
-            self.addStatToPres(stat)
+            if stat is not None:
+                self.addStatToPres(stat)
+
+    def getEventTable(self):
+        if self.eventTable is None:
+            self.eventTable = EventTable(self.xmlFiles)
+        return self.eventTable
+
+    def getEventCube(self):
+        # Rebuilt whenever the event table is swapped for another
+        table = self.getEventTable()
+        if self.eventCube is None or self.eventCube.table is not table:
+            self.eventCube = EventCube(table)
+        return self.eventCube
+
+    def getScoredEvents(self):
+        # Every team's 22 entries, tap pens and mauls with their expected
+        # points, scored once per event table
+        table = self.getEventTable()
+        if self.scoredEvents is None or self.scoredEvents[0] is not table:
+            self.scoredEvents = (table, self.expectedPoints.score(table))
+        return self.scoredEvents[1]
+
+    def getRateIntervals(self):
+        # {stat: (low, high)} for every rate a title reports, all bootstrapped
+        # together over the same resampled games, once per event table
+        table = self.getEventTable()
+        if self.rateIntervals is not None and self.rateIntervals[0] is table:
+            return self.rateIntervals[1]
+        games = table.events["game"]
+        gameCount = len(table.games)
+
+        def perGame(rows, weights=None):
+            return np.bincount(games[rows], weights=weights, minlength=gameCount)
+
+        outcomes = self.get22Outcomes()
+        entryRows = outcomes.index.to_numpy(dtype=int)
+        entryPoints = outcomes.map(self.expectedPoints.points).fillna(0).to_numpy()
+
+        scrums = np.flatnonzero(table.codeMask(f"{self.teamName} Scrum"))
+        positiveIds = [table.values.lookup(v) for v in self.positiveScrumResults]
+        positive = np.isin(
+            table.labelCodes("Scrum Result")[scrums],
+            [id for id in positiveIds if id >= 0],
+        )
+
+        mauls = np.flatnonzero(table.codeMask(f"{self.teamName} Maul"))
+        maulMetres = table.labelNumbers("Maul Metres")[mauls]
+        measured = ~np.isnan(maulMetres)
+
+        numerators = np.stack(
+            [
+                perGame(entryRows, entryPoints),
+                perGame(scrums[positive]),
+                perGame(mauls[measured], maulMetres[measured]),
+            ]
+        )
+        denominators = np.stack(
+            [perGame(entryRows), perGame(scrums), perGame(mauls[measured])]
+        )
+        # Only resample the games the team has any of these events in
+        played = np.any(denominators > 0, axis=0)
+        intervals = {}
+        if played.any():
+            bounds = GameBootstrap(int(played.sum()), self.bootstrap).intervals(
+                numerators[:, played], denominators[:, played], self.confidenceLevel
+            )
+            intervals = dict(zip(self.rateStats, map(tuple, bounds.tolist())))
+        self.rateIntervals = (table, intervals)
+        return intervals
+
+    def getRateInterval(self, name, digits, scale=1, unit=""):
+        # ", 95% CI low-high" to append to a rate in a title, or nothing when
+        # not bootstrapping
+        if not self.bootstrap:
+            return ""
+        low, high = self.getRateIntervals().get(name, (np.nan, np.nan))
+        if np.isnan(low):
+            return ""
+        low = round(low * scale, digits)
+        high = round(high * scale, digits)
+        return f", {self.confidenceLevel:.0%} CI {low:g}-{high:g}{unit}"
+
+    def getEventTypeMask(self, eventType):
+        table = self.getEventTable()
+        match eventType:
+            case "linebreaks":
+                return self.getQualityMask("Initial Break")
+            case "mauls":
+                return table.codeMask(f"{self.teamName} Maul")
+            case "tapPens":
+                return table.codeMask(f"{self.teamName} Tap Pen")
+            case _:
+                raise ValueError(f"Unknown event type {eventType!r}")
+
+    def getEventLocations(self, eventType, player=None):
+        table = self.getEventTable()
+        mask = self.getEventTypeMask(eventType)
+        if player is not None:
+            mask = mask & table.playerMask(player)
+        xValues = table.events["xStart"][mask] + self.tryZone
+        yValues = self.fieldWidth - table.events["yStart"][mask]
+        return xValues, yValues
+
+    def getKickMask(self):
+        table = self.getEventTable()
+        return table.codeMask(f"{self.teamName} Kick") & ~table.labelMask(
+            "Kick Descriptor", "Touch Kick"
+        )
+
+    def getKickVectors(self, mask):
+        table = self.getEventTable()
+        xStart = table.events["xStart"][mask] + self.tryZone
+        yStart = self.fieldWidth - table.events["yStart"][mask]
+        xEnd = table.events["xEnd"][mask] + self.tryZone
+        yEnd = self.fieldWidth - table.events["yEnd"][mask]
+        return xStart, yStart, xEnd, yEnd
+
+    def getKickColors(self, mask):
+        # Box kicks are Windy whatever their descriptor
+        table = self.getEventTable()
+        descriptors = table.values.decode(table.labelCodes("Kick Descriptor")[mask])
+        box = table.labelCodes("Kick Style")[mask] == table.values.lookup("Box")
+        return [
+            self.boxKickColor if isBox else self.kickColors.get(descriptor, "")
+            for descriptor, isBox in zip(descriptors, box)
+        ]
+
+    def getKickArrowColors(self, mask):
+        if not self.kickOutcomes:
+            return self.getKickColors(mask)
+        outcomes = self.getKickOutcomes().getOutcomes(mask)
+        return [self.kickOutcomeColors[outcome] for outcome in outcomes]
+
+    def getKickOutcomes(self):
+        # Rebuilt whenever the event table is swapped for another
+        table = self.getEventTable()
+        if self.kickOutcomeLinks is None or self.kickOutcomeLinks.table is not table:
+            self.kickOutcomeLinks = KickOutcomes(table)
+        return self.kickOutcomeLinks
+
+    def getKickLegendHandles(self):
+        if self.kickOutcomes:
+            return [
+                mpatches.Patch(color=color, label=outcome)
+                for outcome, color in self.kickOutcomeColors.items()
+            ]
+        return [
+            mpatches.Patch(color="#63AAE3", label="Pocket"),
+            mpatches.Patch(color="#FF85B4", label="Windy"),
+            mpatches.Patch(color="#E15554", label="Ice"),
+            mpatches.Patch(color="#E1BC29", label="Snow"),
+            mpatches.Patch(color="#2E8A59", label="Wedge"),
+            mpatches.Patch(color="#7768AE", label="Kick Pass"),
+        ]
+
+    def getQualityMask(self, quality):
+        table = self.getEventTable()
+        return table.labelMask("Attacking Qualities", quality) & table.labelMask(
+            "Attacking Quality", self.teamName
+        )
+
+    def getTackleMask(self):
+        table = self.getEventTable()
+        return (
+            table.labelMask("Tackle Outcome", "Complete")
+            & table.labelMask("Tackle", self.teamName)
+            & table.labelMask("Event", "Tackle")
+        )
+
+    def getCarryMask(self):
+        table = self.getEventTable()
+        return table.labelMask("Carry", self.teamName) & table.labelMask(
+            "Event", "Carry"
+        )
+
+    def getPlayerMinutes(self):
+        # {player: minutes} over the season, rebuilt whenever the event table
+        # is swapped for another
+        table = self.getEventTable()
+        if self.playerMinutes is None or self.playerMinutes.table is not table:
+            self.playerMinutes = PlayerMinutes(table)
+        return self.playerMinutes.getMinutes()
+
+    def getPlayerRates(self, counts):
+        # Counts as they are, or per 80 minutes for players with enough minutes
+        if not self.per80:
+            return counts
+        minutes = self.getPlayerMinutes()
+        return {
+            player: round(count / minutes[player] * PlayerMinutes.gameMinutes, 2)
+            for player, count in counts.items()
+            if minutes.get(player, 0) >= self.per80MinMinutes
+        }
+
+    def getPer80Label(self, label):
+        return f"{label} Per 80" if self.per80 else label
+
+    def getBarLabel(self, height):
+        return f"{height:.1f}" if self.per80 else f"{int(height)}"
+
+    def countBy(self, mask, group):
+        return self.countCodes(self.getEventTable().labelCodes(group)[mask])
+
+    def countCodes(self, codes):
+        # {value: count} in order of first appearance, like the old counting
+        # dicts, from one bincount over the interned value ids
+        table = self.getEventTable()
+        codes = codes[codes >= 0]
+        if len(codes) == 0:
+            return {}
+        counts = np.bincount(codes)
+        unique, first = np.unique(codes, return_index=True)
+        unique = unique[np.argsort(first)]
+        return dict(zip(table.values.decode(unique), counts[unique].tolist()))
+
+    def countErrors(self, mask):
+        return self.foldErrors(self.countBy(mask, "Error Descriptor"))
+
+    def foldErrors(self, errors):
+        # Turnover error descriptors with every kicking error folded together
+        breakdown = {}
+        for descriptor, count in errors.items():
+            if "Kick" in descriptor:
+                descriptor = "Kick Error"
+            breakdown[descriptor] = breakdown.get(descriptor, 0) + count
+        return breakdown
+
+    def countPerGame(self, mask):
+        table = self.getEventTable()
+        counts = np.bincount(
+            table.events["game"][mask], minlength=len(table.games)
+        )
+        return self.getGameCounts(counts)
+
+    def getGameCounts(self, counts):
+        table = self.getEventTable()
+        games = {}
+        for date, count in zip(table.games["date"], counts.tolist()):
+            games[date] = count
+        return games
+
+    def getPlayerRows(self, mask, players):
+        # {player: rows of mask with that Player label} from one pass over
+        # the labels; a row with two of the players is in both, like
+        # labelMask("Player", player) for each of them
+        table = self.getEventTable()
+        ids = np.array([table.values.lookup(player) for player in players])
+        selected = (
+            table.labels["group"] == table.groups.lookup("Player")
+        ) & np.isin(table.labels["value"], ids)
+        events = table.labels["event"][selected]
+        values = table.labels["value"][selected]
+        keep = mask[events]
+        values, events = np.unique(np.stack([values[keep], events[keep]]), axis=1)
+        return {player: events[values == id] for player, id in zip(players, ids)}
+
+    def getPlayerBreakdowns(self, name, players):
+        # {player: (title, breakdown)} for a per-player pie stat, every player
+        # counted from the same masks and label codes
+        table = self.getEventTable()
+        match name:
+            case "getCarryBreakdown":
+                mask = self.getCarryMask()
+                outcomes = table.labelCodes("Carry Outcome")
+                keys = np.where(
+                    outcomes == table.values.lookup("Tackled"),
+                    table.labelCodes("Carry Dominance"),
+                    outcomes,
+                )
+                keys[outcomes == table.values.lookup("Other")] = -1
+            case "getPlayerTurnoverBD":
+                mask = table.codeMask(f"{self.teamName} Turnover")
+                keys = table.labelCodes("Error Descriptor")
+            case "getScrumPensByPlayer":
+                mask = table.codeMask(
+                    f"{self.teamName} Penalty Conceded"
+                ) & table.labelMask("Pen Descriptor", "Scrum Offence")
+                keys = table.labelCodes("Scrum Offences")
+        breakdowns = {}
+        for player, rows in self.getPlayerRows(mask, players).items():
+            breakdown = self.countCodes(keys[rows])
+            match name:
+                case "getCarryBreakdown":
+                    title = player
+                case "getPlayerTurnoverBD":
+                    breakdown = self.foldErrors(breakdown)
+                    title = f"{player} ({len(rows)} Total)"
+                case "getScrumPensByPlayer":
+                    breakdown = OrderedDict(
+                        sorted(breakdown.items(), key=itemgetter(1), reverse=True)
+                    )
+                    title = f"{player} ({len(rows)} Total)"
+            breakdowns[player] = (title, breakdown)
+        return breakdowns
+
+    def getLocationGrid(self, eventType, player=None, grid=None):
+        grid = PitchGrid(grid or self.heatmapGrid or "channels")
+        key = (self.teamName, eventType, player, grid.name)
+        if key not in self.gridCache:
+            cube = self.getEventCube()
+            codes = {"mauls": "Maul", "tapPens": "Tap Pen"}
+            if eventType in codes and grid.name == cube.grid.name:
+                # Already binned in the cube, no location is read again
+                counts = cube.zoneCounts(
+                    code=f"{self.teamName} {codes[eventType]}", player=player
+                ).astype(float)
+            else:
+                xValues, yValues = self.getEventLocations(eventType, player)
+                counts = grid.bin(xValues, yValues)
+            self.gridCache[key] = counts
+        return grid, self.gridCache[key]
+
+    def getLocationHeatmap(self, eventType, player=None, grid=None):
+        titles = {
+            "linebreaks": "Linebreak",
+            "mauls": "Maul",
+            "tapPens": "Tap Pen",
+        }
+        name = player if player is not None else self.teamName
+        grid, counts = self.getLocationGrid(eventType, player, grid)
+        path = f"Stat PNGs/{name.replace(' ', '_')}_{titles[eventType].replace(' ', '_')}_{grid.name.capitalize()}_Heatmap.png"
+        self.logger.info(f"Started {path}")
+        fig, ax = self.canvasPool.acquire()
+        self.drawRugbyPitch(ax)
+        mesh = ax.pcolormesh(
+            grid.xEdges, grid.yEdges, counts.T, cmap="Reds", alpha=0.7, zorder=0
+        )
+        if grid.name == "fine":
+            fig.colorbar(mesh, ax=ax, shrink=0.7)
+        else:
+            xCenters, yCenters = grid.cellCenters()
+            for i, j in zip(*np.nonzero(counts)):
+                ax.text(
+                    xCenters[i],
+                    yCenters[j],
+                    f"{int(counts[i, j])}",
+                    ha="center",
+                    va="center",
+                    fontweight="bold",
+                )
+        if player is not None:
+            ax.set_title(f"{player} {titles[eventType]} Locations ({int(counts.sum())} Total)")
+        else:
+            ax.set_title(f"{titles[eventType]} Locations ({int(counts.sum())} Total)")
+        fig.savefig(path)
+        self.canvasPool.release(fig)
+        self.logger.info(f"Finished {path}")
+        return path
 
     def getLinebreakLocations(self):
         path = f"Stat PNGs/{self.teamName.replace(" ", "_")}_Linebreak_Locations.png"
         self.logger.info(f"Started {path}")
-        fig, ax = plt.subplots(figsize=(self.figWidth, self.figHeight))
+        fig, ax = self.canvasPool.acquire()
         self.drawRugbyPitch(ax)
-        xValues = []
-        yValues = []
-        total = 0
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                linebreaks = root.xpath(
-                    f"//instance[label[text='Initial Break' and group='Attacking Qualities'] and label[text='{self.teamName}' and group='Attacking Quality']]"
-                )
-                total += len(linebreaks)
-                for linebreak in linebreaks:
-                    xStart = (
-                        float(linebreak.xpath("label[group='X_Start']/text/text()")[0])
-                        + self.tryZone
-                    )
-                    yStart = self.fieldWidth - float(
-                        linebreak.xpath("label[group='Y_Start']/text/text()")[0]
-                    )
-                    xValues.append(xStart)
-                    yValues.append(yStart)
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
+        xValues, yValues = self.getEventLocations("linebreaks")
+        total = len(xValues)
         ax.scatter(xValues, yValues)
-        plt.title(f"Linebreak Locations ({total} Total)")
-        plt.savefig(path)
-        plt.close()
+        ax.set_title(f"Linebreak Locations ({total} Total)")
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
         return path
 
@@ -204,81 +1170,111 @@ class StatMonkey:
         path = f"Stat PNGs/{player.replace(" ", "_")}_Linebreak_Locations.png"
         self.logger.info(f"Started {path}")
 
-        fig, ax = plt.subplots(figsize=(self.figWidth, self.figHeight))
+        fig, ax = self.canvasPool.acquire()
         self.drawRugbyPitch(ax)
-        xValues = []
-        yValues = []
-        total = 0
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                linebreaks = root.xpath(
-                    f"//instance[label[text='Initial Break' and group='Attacking Qualities'] and label[text='{self.teamName}' and group='Attacking Quality']]"
-                )
-                for linebreak in linebreaks:
-                    playerName = str(
-                        linebreak.xpath(
-                            "label[group='Player'][position()=1]/text/text()"
-                        )[0]
-                    )
-                    if player == playerName:
-                        total += 1
-                        xStart = (
-                            float(
-                                linebreak.xpath("label[group='X_Start']/text/text()")[0]
-                            )
-                            + self.tryZone
-                        )
-                        yStart = self.fieldWidth - float(
-                            linebreak.xpath("label[group='Y_Start']/text/text()")[0]
-                        )
-                        xValues.append(xStart)
-                        yValues.append(yStart)
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
+        xValues, yValues = self.getEventLocations("linebreaks", player)
+        total = len(xValues)
         ax.scatter(xValues, yValues)
-        plt.title(f"{player} Linebreak Locations")
-        plt.savefig(path)
-        plt.close()
+        ax.set_title(f"{player} Linebreak Locations")
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
         return path
 
     def get22Stats(self):
         path = f"Stat PNGs/{self.teamName.replace(' ', '_')}_22_Stats.png"
         self.logger.info(f"Started {path}")
-        plt.figure(figsize=(self.figWidth, self.figHeight))
-        scoredEntries = 0
-        totalEntries = 0
-        totalTrys = 0
-        totalPens = 0
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                entries = root.xpath(
-                    f"//instance[code='{self.teamName} 22 Entry' and label[text='New Entry' and group='22 Entry']]"
-                )
-                totalEntries += len(entries)
-                trys = root.xpath(f"//instance[code='{self.teamName} Try']")
-                scoredEntries += len(trys)
-                totalTrys += len(trys)
-                penKicks = root.xpath(
-                    f"//instance[code='{self.teamName} Goal Kick' and label[text='Penalty Goal' and group='Goal Type'] and label[text='Goal Kicked' and group='Goal Outcome']]"
-                )
-                scoredEntries += len(penKicks)
-                totalPens += len(penKicks)
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
+        outcomes = self.get22Outcomes()
+        totalEntries = len(outcomes)
+        totalTrys = int((outcomes == "Try").sum())
+        totalPens = int((outcomes == "Penalty").sum())
         pointsPerEntry = round((((totalTrys * 5) + (3 * totalPens)) / totalEntries), 2)
-        plt.pie(
+        interval = self.getRateInterval("get22Stats", 2)
+        title = f"Gold Zone Efficiency ({pointsPerEntry} Points Per Entry{interval})"
+        if self.nativeCharts:
+            return chartSpec(
+                "pie",
+                title,
+                ["Try Scored", "Converted Penalty Kick", "No Points Scored"],
+                [totalTrys, totalPens, totalEntries - (totalPens + totalTrys)],
+            )
+        fig, ax = self.canvasPool.acquire()
+        ax.set_title(title)
+        ax.pie(
             [totalTrys, totalPens, totalEntries - (totalPens + totalTrys)],
             labels=["Try Scored", "Converted Penalty Kick", "No Points Scored"],
             autopct=lambda p: f"{int(p*sum([totalTrys, totalPens, totalEntries - (totalPens + totalTrys)])/100)}",
         )
-        plt.title(f"Gold Zone Efficiency ({pointsPerEntry} Points Per Entry)")
-        plt.savefig(path)
-        plt.close()
+        fig.savefig(path)
+        self.canvasPool.release(fig)
+        self.logger.info(f"Finished {path}")
+        return path
+
+    def get22Outcomes(self):
+        # "Try", "Penalty", "Turnover" or None for each of the team's new 22
+        # entries, indexed by event row
+        table = self.getEventTable()
+        entries = table.codeMask(f"{self.teamName} 22 Entry") & table.labelMask(
+            "22 Entry", "New Entry"
+        )
+        # Only points scored before the ball is lost or the next entry count
+        return self.getPossessionOutcomes(
+            entries, table.labelMask("22 Entry", "New Entry")
+        )
+
+    def getTapPenOutcomes(self):
+        # The same for each of the team's tap pens, up to its next one
+        tapPens = self.getEventTable().codeMask(f"{self.teamName} Tap Pen")
+        return self.getPossessionOutcomes(tapPens, tapPens)
+
+    def getLinebreakOutcomes(self):
+        # The same for each of the team's linebreaks, up to its next one
+        linebreaks = self.getQualityMask("Initial Break")
+        return self.getPossessionOutcomes(linebreaks, linebreaks)
+
+    def getPossessionOutcomes(self, fromMask, untilMask):
+        # Scored the way the expected-points model scores its events
+        return self.expectedPoints.getOutcomes(
+            self.getEventTable(), self.teamName, fromMask, untilMask
+        )
+
+    def getExpectedPoints(self):
+        path = f"Stat PNGs/{self.teamName.replace(' ', '_')}_Expected_Points.png"
+        self.logger.info(f"Started {path}")
+        events = self.getScoredEvents()
+        events = events[events["team"] == self.teamName]
+        kinds = ExpectedPoints.kinds
+        perEvent = events.groupby("kind")[["points", "xPoints"]].mean()
+        perEvent = perEvent.reindex(kinds).fillna(0)
+        title = (
+            f"Expected Points ({events['points'].sum():.0f} Scored, "
+            f"{events['xPoints'].sum():.0f} Expected)"
+        )
+        if self.nativeCharts:
+            return chartSpec(
+                "bar",
+                title,
+                kinds,
+                {
+                    "Points Per Event": perEvent["points"],
+                    "Expected Points Per Event": perEvent["xPoints"],
+                },
+                "Points Per Event",
+            )
+        fig, ax = self.canvasPool.acquire()
+        ax.set_title(title)
+        positions = np.arange(len(kinds))
+        for offset, column, label in [
+            (-0.2, "points", "Points Per Event"),
+            (0.2, "xPoints", "Expected Points Per Event"),
+        ]:
+            bars = ax.bar(positions + offset, perEvent[column], 0.4, label=label)
+            ax.bar_label(bars, fmt="%.2f", label_type="center", fontweight="bold")
+        ax.set_xticks(positions, kinds)
+        ax.set_ylabel("Points Per Event")
+        ax.legend(loc="upper right")
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
         return path
 
@@ -566,7 +1562,7 @@ class StatMonkey:
         # Remove axes ticks and labels
         ax.set_xticks([])
         ax.set_yticks([])
-        plt.tight_layout(pad=2.5)
+        ax.figure.tight_layout(pad=2.5)
         self.logger.info(f"Finished Drawing Full Pitch")
 
     def drawHalfPitch(self, ax):
@@ -680,11 +1676,23 @@ class StatMonkey:
         # Remove axes ticks and labels
         ax.set_xticks([])
         ax.set_yticks([])
-        plt.tight_layout(pad=2.5)
+        ax.figure.tight_layout(pad=2.5)
         self.logger.info(f"Finished Drawing Half Pitch")
 
-    def addStatToPres(self, statImgPath):
-        self.logger.info(f"Started Adding {statImgPath} To Pres")
+    def buildPres(self, statPathArray):
+        # Fresh deck from already rendered images, saved once at the end
+        self.prs = Presentation()
+        for stat in statPathArray:
+            if stat is not None:
+                self.addStatToPres(stat, save=False)
+        self.prs.save(f"{self.teamName}.pptx")
+
+    def getSlideName(self, stat):
+        return stat["title"] if isChartSpec(stat) else stat
+
+    def addStatToPres(self, statImgPath, save=True):
+        # statImgPath is a rendered image or the chart data of a native chart
+        self.logger.info(f"Started Adding {self.getSlideName(statImgPath)} To Pres")
 
         slide = self.prs.slides.add_slide(self.prs.slide_layouts[6])
         self.prs.slide_width = Inches(16)
@@ -697,7 +1705,17 @@ class StatMonkey:
 
         top = Inches(1.5)
         left = Inches(2.5)
-        slide.shapes.add_picture(statImgPath, left, top)
+        if isChartSpec(statImgPath):
+            addChart(
+                slide,
+                statImgPath,
+                left,
+                top,
+                Inches(self.figWidth),
+                Inches(self.figHeight),
+            )
+        else:
+            slide.shapes.add_picture(statImgPath, left, top)
 
         top = Inches(0)
         left = Inches(0)
@@ -725,53 +1743,32 @@ class StatMonkey:
             "assets/HoundsShield_LightOnDarkBG.png", left, top, width, height
         )
 
-        self.prs.save(f"{self.teamName}.pptx")
-        self.logger.info(f"Finished Adding {statImgPath} To Pres")
+        if save:
+            self.prs.save(f"{self.teamName}.pptx")
+        self.logger.info(f"Finished Adding {self.getSlideName(statImgPath)} To Pres")
 
     def getMaulMap(self):
         path = f"Stat PNGs/{self.teamName.replace(" ", "_")}_Mauls.png"
         self.logger.info(f"Started {path}")
-        fig, ax = plt.subplots(figsize=(self.figWidth, self.figHeight))
+        fig, ax = self.canvasPool.acquire()
         self.drawRugbyPitch(ax)
-        xValues = []
-        yValues = []
-        maulMetersArr = []
-        trueMaulMetersArr = []
         colors = []
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                mauls = root.xpath(f"//instance[code='{self.teamName} Maul']")
-                for maul in mauls:
-                    xStart = (
-                        float(maul.xpath("label[group='X_Start']/text/text()")[0])
-                        + self.tryZone
-                    )
-                    yStart = self.fieldWidth - float(
-                        maul.xpath("label[group='Y_Start']/text/text()")[0]
-                    )
-                    maulOutcome = str(
-                        maul.xpath("label[group='Maul Breakdown Outcome']/text/text()")[
-                            0
-                        ]
-                    )
-                    if maulOutcome == "Try Scored":
-                        maulMetersArr.append(int(999))
-                    else:
-                        maulMetersArr.append(
-                            int(maul.xpath("label[group='Maul Metres']/text/text()")[0])
-                        )
-                    trueMaulMetersArr.append(
-                        int(maul.xpath("label[group='Maul Metres']/text/text()")[0])
-                    )
-                    xValues.append(xStart)
-                    yValues.append(yStart)
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
-        avg = (sum(trueMaulMetersArr)) / (len(trueMaulMetersArr))
+        table = self.getEventTable()
+        mauls = table.codeMask(f"{self.teamName} Maul")
+        xValues, yValues = self.getEventLocations("mauls")
+        trueMaulMetersArr = table.labelNumbers("Maul Metres")[mauls]
+        tryScored = table.labelCodes("Maul Breakdown Outcome")[
+            mauls
+        ] == table.values.lookup("Try Scored")
+        maulMetersArr = np.where(tryScored, 999, trueMaulMetersArr)
+        # Mauls without Maul Metres are left out of the average, like the
+        # bootstrapped rate, and drawn in a neutral colour
+        measured = ~np.isnan(trueMaulMetersArr)
+        avg = sum(trueMaulMetersArr[measured]) / max(measured.sum(), 1)
         for dist in maulMetersArr:
-            if dist < avg:
+            if np.isnan(dist):
+                colors.append("#9E9E9E")
+            elif dist < avg:
                 colors.append("#E15554")
             else:
                 colors.append("#3BB273")
@@ -780,10 +1777,14 @@ class StatMonkey:
             color="#3BB273", label=f"> {round(avg,1)} Meters Made/Try Scored"
         )
         neg = mpatches.Patch(color="#E15554", label=f"< {round(avg,1)} Meters Made")
-        plt.legend(handles=[pos, neg], loc="lower left")
-        plt.title(f"Maul Locations ({round(avg, 1)} Meters Per Maul)")
-        plt.savefig(path)
-        plt.close()
+        handles = [pos, neg]
+        if np.isnan(maulMetersArr).any():
+            handles.append(mpatches.Patch(color="#9E9E9E", label="Meters Not Recorded"))
+        ax.legend(handles=handles, loc="lower left")
+        interval = self.getRateInterval("getMaulMap", 1)
+        ax.set_title(f"Maul Locations ({round(avg, 1)} Meters Per Maul{interval})")
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
 
         return path
@@ -795,45 +1796,30 @@ class StatMonkey:
         )
         self.logger.info(f"Started {path}")
 
-        plt.figure(figsize=(self.figWidth, self.figHeight))
-        playerBreaks = {}
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                linebreaks = root.xpath(
-                    f"""//instance[label[text="Initial Break" and group="Attacking Qualities"] and label[text="{self.teamName}" and group="Attacking Quality"]]"""
-                )
-
-                for linebreak in linebreaks:
-                    player = str(
-                        linebreak.xpath(
-                            "label[group='Player'][position()=1]/text/text()"
-                        )[0]
-                    )
-                    playerBreaks[player] = (
-                        playerBreaks[player] + 1 if player in playerBreaks else 1
-                    )
-
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
+        linebreaks = self.getQualityMask("Initial Break")
+        playerBreaks = self.countBy(linebreaks, "Player")
+        self.linebreakKeyPlayers = []
         for player in playerBreaks:
             if playerBreaks[player] > statistics.median(playerBreaks.values()):
                 self.linebreakKeyPlayers.append(player)
-        plt.title(f"Number Of Linebreaks By Player")
         sortedPlayerBreaks = OrderedDict(
             sorted(playerBreaks.items(), key=itemgetter(1), reverse=True)
         )
-        bars = plt.bar(
-            [
-                key[:15] + "..." if len(key) >= 15 else key
-                for key in sortedPlayerBreaks.keys()
-            ],
-            sortedPlayerBreaks.values(),
-        )
+        names = [
+            key[:15] + "..." if len(key) >= 15 else key
+            for key in sortedPlayerBreaks.keys()
+        ]
+        title = f"Number Of Linebreaks By Player"
+        if self.nativeCharts:
+            return chartSpec(
+                "bar", title, names, sortedPlayerBreaks.values(), "Number of Breaks"
+            )
+        fig, ax = self.canvasPool.acquire()
+        ax.set_title(title)
+        bars = ax.bar(names, sortedPlayerBreaks.values())
         for bar in bars:
             height = bar.get_height()
-            plt.text(
+            ax.text(
                 bar.get_x() + bar.get_width() / 2.0,
                 (height / 2),
                 f"{int(height)}",
@@ -841,12 +1827,12 @@ class StatMonkey:
                 va="center",
                 fontweight="bold",
             )
-        plt.ylabel("Number of Breaks")
-        plt.xticks(rotation=60)
-        plt.tight_layout()
-        plt.subplots_adjust(bottom=0.25)
-        plt.savefig(path)
-        plt.close()
+        ax.set_ylabel("Number of Breaks")
+        ax.tick_params(axis="x", labelrotation=60)
+        fig.tight_layout()
+        fig.subplots_adjust(bottom=0.25)
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
         return path
 
@@ -854,35 +1840,25 @@ class StatMonkey:
         path = f"Stat PNGs/{self.teamName.replace(' ', '_')}_Linebreak_Phases.png"
         self.logger.info(f"Started {path}")
 
-        fig, ax = plt.subplots(figsize=(self.figWidth, self.figHeight))
-        breakPhases = {}
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                linebreaks = root.xpath(
-                    f"//instance[label[text='Initial Break' and group='Attacking Qualities'] and label[text='{self.teamName}' and group='Attacking Quality']]"
-                )
-
-                for linebreak in linebreaks:
-                    phase = str(
-                        linebreak.xpath(
-                            "label[group='Phase Number'][position()=1]/text/text()"
-                        )[0]
-                    )
-                    breakPhases[phase] = (
-                        breakPhases[phase] + 1 if phase in breakPhases else 1
-                    )
-
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
-
-        plt.title(f"Phase Of Linebreaks")
+        linebreaks = self.getQualityMask("Initial Break")
+        breakPhases = self.countBy(linebreaks, "Phase Number")
+        scored = self.getLinebreakOutcomes().isin(["Try", "Penalty"]).sum()
 
         # Sort by key (phase number) instead of value
         sortedBreakPhases = OrderedDict(
             sorted(breakPhases.items(), key=itemgetter(1), reverse=True)
         )
+        title = f"Phase Of Linebreaks ({scored} Led To Points)"
+        if self.nativeCharts:
+            return chartSpec(
+                "bar",
+                title,
+                sortedBreakPhases.keys(),
+                sortedBreakPhases.values(),
+                "Number of Breaks",
+            )
+        fig, ax = self.canvasPool.acquire()
+        ax.set_title(title)
         # Create the bar chart
         bars = ax.bar(sortedBreakPhases.keys(), sortedBreakPhases.values())
 
@@ -891,7 +1867,7 @@ class StatMonkey:
             height = bar.get_height()
             if height < 2:
                 # Place text above the bar
-                plt.text(
+                ax.text(
                     bar.get_x() + bar.get_width() / 2.0,
                     height + 0.1,  # Add a small offset above the bar
                     f"{int(height)}",
@@ -901,7 +1877,7 @@ class StatMonkey:
                 )
             else:
                 # Keep current positioning inside the bar
-                plt.text(
+                ax.text(
                     bar.get_x() + bar.get_width() / 2.0,
                     (height / 2),
                     f"{int(height)}",
@@ -920,8 +1896,104 @@ class StatMonkey:
         # ax.set_xticks(list(sortedBreakPhases.keys()))
 
         # ax.set_aspect('equal', adjustable='box')
-        plt.savefig(path)
-        plt.close()
+        fig.savefig(path)
+        self.canvasPool.release(fig)
+        self.logger.info(f"Finished {path}")
+        return path
+
+    def getTempo(self):
+        # Ball-in-play seconds of each game the team played, and the seconds
+        # of live play in each phase and from each breakdown to the next
+        # carry, for the team's carries and its opponents'. Every game is one
+        # pass over its live intervals and its carries in start order
+        table = self.getEventTable()
+        games = np.flatnonzero(pd.notna(table.getOpponents(self.teamName)))
+        starts = np.nan_to_num(table.events["start"])
+        ends = np.fmax(table.events["end"], starts)
+        carries = table.labelMask("Event", "Carry")
+        ownCarries = carries & table.labelMask("Carry", self.teamName)
+        tackles = table.labelMask("Event", "Tackle") & table.labelMask(
+            "Tackle Outcome", "Complete"
+        )
+        ownTackles = tackles & table.labelMask("Tackle", self.teamName)
+        # Side -> (its carries, the tackles that end them)
+        sides = {
+            self.teamName: (ownCarries, tackles & ~ownTackles),
+            "Opposition": (carries & ~ownCarries, ownTackles),
+        }
+        ballInPlay = []
+        phases = {side: [] for side in sides}
+        breakdowns = {side: [] for side in sides}
+        for game in games:
+            live = table.getLiveIntervals(game)
+            ballInPlay.append(live.duration())
+            rows = table.gameRows(game)
+            for side, (carryMask, tackleMask) in sides.items():
+                carryStarts = starts[rows][carryMask[rows]]
+                passages = live.locate(carryStarts)
+                # A phase runs between carries in the same passage of play
+                same = (passages[1:] == passages[:-1]) & (passages[1:] >= 0)
+                phases[side].append(
+                    live.measure(carryStarts[:-1], carryStarts[1:])[same]
+                )
+                tackleEnds = ends[rows][tackleMask[rows]]
+                nextCarries = np.searchsorted(carryStarts, tackleEnds)
+                found = nextCarries < len(carryStarts)
+                tackleEnds, nextCarries = tackleEnds[found], nextCarries[found]
+                same = (live.locate(tackleEnds) == passages[nextCarries]) & (
+                    passages[nextCarries] >= 0
+                )
+                breakdowns[side].append(
+                    live.measure(tackleEnds, carryStarts[nextCarries])[same]
+                )
+
+        def mean(values):
+            # NaN when there is nothing to time, rather than a 0 second tempo
+            values = np.concatenate(values) if values else np.zeros(0)
+            return float(values.mean()) if len(values) else np.nan
+
+        tempo = pd.DataFrame(
+            {
+                "Phase Duration": {side: mean(phases[side]) for side in sides},
+                "Breakdown To Next Carry": {
+                    side: mean(breakdowns[side]) for side in sides
+                },
+            }
+        )
+        return np.array(ballInPlay), tempo
+
+    def getTempoStats(self):
+        path = f"Stat PNGs/{self.teamName.replace(' ', '_')}_Tempo.png"
+        self.logger.info(f"Started {path}")
+        ballInPlay, tempo = self.getTempo()
+        minutes = ballInPlay.mean() / 60 if len(ballInPlay) else 0
+        title = f"Tempo ({minutes:.1f} Minutes Ball In Play Per Game)"
+        metrics = list(tempo.columns)
+        if self.nativeCharts:
+            return chartSpec(
+                "bar",
+                title,
+                metrics,
+                {side: tempo.loc[side] for side in tempo.index},
+                "Seconds",
+            )
+        fig, ax = self.canvasPool.acquire()
+        ax.set_title(title)
+        positions = np.arange(len(metrics))
+        for offset, side in zip([-0.2, 0.2], tempo.index):
+            seconds = tempo.loc[side]
+            bars = ax.bar(positions + offset, seconds.fillna(0), 0.4, label=side)
+            ax.bar_label(
+                bars,
+                [f"{value:.1f}" if pd.notna(value) else "n/a" for value in seconds],
+                label_type="center",
+                fontweight="bold",
+            )
+        ax.set_xticks(positions, metrics)
+        ax.set_ylabel("Seconds")
+        ax.legend(loc="upper right")
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
         return path
 
@@ -929,176 +2001,99 @@ class StatMonkey:
         path = f"Stat PNGs/{self.teamName.replace(" ", "_")}_Kick_Paths.png"
         self.logger.info(f"Started {path}")
 
-        fig, ax = plt.subplots(figsize=(self.figWidth, self.figHeight))
+        fig, ax = self.canvasPool.acquire()
         self.drawRugbyPitch(ax)
-        total = 0
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                kicks = root.xpath(f"//instance[code='{self.teamName} Kick']")
-                for kick in kicks:
-                    xStart = (
-                        float(kick.xpath("label[group='X_Start']/text/text()")[0])
-                        + self.tryZone
-                    )
-                    yStart = self.fieldWidth - float(
-                        kick.xpath("label[group='Y_Start']/text/text()")[0]
-                    )
-                    xEnd = (
-                        float(kick.xpath("label[group='X_End']/text/text()")[0])
-                        + self.tryZone
-                    )
-                    yEnd = self.fieldWidth - float(
-                        kick.xpath("label[group='Y_End']/text/text()")[0]
-                    )
-                    descriptor = str(
-                        kick.xpath("label[group='Kick Descriptor']/text/text()")[0]
-                    )
-                    if descriptor == "Touch Kick":
-                        continue
-                    total += 1
-                    kickStyle = str(
-                        kick.xpath("label[group='Kick Style']/text/text()")[0]
-                    )
-                    dx = xEnd - xStart
-                    dy = yEnd - yStart
-                    color = ""
-                    # Windy
-                    if kickStyle == "Box":
-                        color = "#FF85B4"
-                    else:
-                        match descriptor:
-                            # Pocket
-                            case "Territorial":
-                                color = "#63AAE3"
-                            # Ice
-                            case "Low":
-                                color = "#E15554"
-                            # Snow
-                            case "Bomb":
-                                color = "#E1BC29"
-                            # Wedge
-                            case "Chip":
-                                color = "#2E8A59"
-                            # Kick Pass
-                            case "Cross Pitch":
-                                color = "#7768AE"
-                    plt.arrow(
-                        xStart,
-                        yStart,
-                        dx,
-                        dy,
-                        head_width=2,
-                        head_length=1,
-                        fc=color,
-                        ec=color,
-                        lw=self.arrowWidth,
-                        length_includes_head=True,
-                    )
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
-        pocket = mpatches.Patch(color="#63AAE3", label="Pocket")
-        windy = mpatches.Patch(color="#FF85B4", label="Windy")
-        ice = mpatches.Patch(color="#E15554", label="Ice")
-        snow = mpatches.Patch(color="#E1BC29", label="Snow")
-        wedge = mpatches.Patch(color="#2E8A59", label="Wedge")
-        kp = mpatches.Patch(color="#7768AE", label="Kick Pass")
-        plt.legend(handles=[pocket, windy, ice, snow, wedge, kp], loc="lower left")
-        plt.title(f"Kick Paths ({total} Total)")
-        plt.savefig(path)
-        plt.close()
+        kicks = self.getKickMask()
+        total = int(kicks.sum())
+        clusters = self.drawKickArrows(
+            ax, *self.getKickVectors(kicks), self.getKickArrowColors(kicks)
+        )
+        ax.legend(
+            handles=self.getKickLegendHandles(),
+            loc="lower left",
+            ncol=2 if self.kickOutcomes else 1,
+        )
+        ax.set_title(f"Kick Paths ({total} Total{clusters})")
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
         return path
 
+    def drawKickArrows(self, ax, xStart, yStart, xEnd, yEnd, colors):
+        # One arrow per kick, or one per k-means cluster of kicks with its
+        # width and label giving the kick count. Returns the title suffix
+        if not self.kickClusters:
+            for x0, y0, x1, y1, color in zip(xStart, yStart, xEnd, yEnd, colors):
+                ax.arrow(
+                    x0,
+                    y0,
+                    x1 - x0,
+                    y1 - y0,
+                    head_width=2,
+                    head_length=1,
+                    fc=color,
+                    ec=color,
+                    lw=self.arrowWidth,
+                    length_includes_head=True,
+                )
+            return ""
+        vectors = np.stack([xStart, yStart, xEnd, yEnd], axis=1).astype(float)
+        located = ~np.isnan(vectors).any(axis=1)
+        colors = np.asarray(colors, dtype=object)[located]
+        labels, centers, counts = self.kickClusterer.fit(vectors[located])
+        for cluster, ((x0, y0, x1, y1), count) in enumerate(zip(centers, counts)):
+            # Most of the cluster's kicks are this colour
+            color = pd.Series(colors[labels == cluster]).mode().iat[0]
+            share = count / counts.max()
+            ax.arrow(
+                x0,
+                y0,
+                x1 - x0,
+                y1 - y0,
+                head_width=2 + 3 * share,
+                head_length=1 + 2 * share,
+                fc=color,
+                ec=color,
+                lw=self.arrowWidth * (1 + 4 * share),
+                alpha=0.8,
+                length_includes_head=True,
+            )
+            ax.text(
+                (x0 + x1) / 2,
+                (y0 + y1) / 2,
+                f"{count}",
+                ha="center",
+                va="center",
+                fontweight="bold",
+                bbox={"boxstyle": "round", "fc": "white", "ec": color},
+            )
+        return f", {len(counts)} Cluster{'s' if len(counts) != 1 else ''}"
+
     def getAttackingKickPaths(self):
         path = f"Stat PNGs/{self.teamName.replace(" ", "_")}_Attacking_Kick_Paths.png"
         self.logger.info(f"Started {path}")
-        fig, ax = plt.subplots(figsize=(self.figWidth, self.figHeight))
+        fig, ax = self.canvasPool.acquire()
         self.drawHalfPitch(ax)
-        total = 0
-
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                kicks = root.xpath(f"//instance[code='{self.teamName} Kick']")
-                for kick in kicks:
-                    xStart = (
-                        float(kick.xpath("label[group='X_Start']/text/text()")[0])
-                        + self.tryZone
-                    )
-                    yStart = self.fieldWidth - float(
-                        kick.xpath("label[group='Y_Start']/text/text()")[0]
-                    )
-                    xEnd = (
-                        float(kick.xpath("label[group='X_End']/text/text()")[0])
-                        + self.tryZone
-                    )
-                    yEnd = self.fieldWidth - float(
-                        kick.xpath("label[group='Y_End']/text/text()")[0]
-                    )
-                    descriptor = str(
-                        kick.xpath("label[group='Kick Descriptor']/text/text()")[0]
-                    )
-                    if descriptor == "Touch Kick":
-                        continue
-                    if xStart < 70:
-                        continue
-                    total += 1
-                    xStart = (xStart - 70) * 2
-                    xEnd = (xEnd - 70) * 2
-                    kickStyle = str(
-                        kick.xpath("label[group='Kick Style']/text/text()")[0]
-                    )
-                    dx = xEnd - xStart
-                    dy = yEnd - yStart
-                    color = ""
-                    # Windy
-                    if kickStyle == "Box":
-                        color = "#FF85B4"
-
-                    else:
-                        match descriptor:
-                            # Pocket
-                            case "Territorial":
-                                color = "#63AAE3"
-                            # Ice
-                            case "Low":
-                                color = "#E15554"
-                            # Snow
-                            case "Bomb":
-                                color = "#E1BC29"
-                            # Wedge
-                            case "Chip":
-                                color = "#2E8A59"
-                            # Kick Pass
-                            case "Cross Pitch":
-                                color = "#7768AE"
-                    plt.arrow(
-                        xStart,
-                        yStart,
-                        dx,
-                        dy,
-                        head_width=2,
-                        head_length=1,
-                        fc=color,
-                        ec=color,
-                        lw=self.arrowWidth,
-                        length_includes_head=True,
-                    )
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
-        pocket = mpatches.Patch(color="#63AAE3", label="Pocket")
-        windy = mpatches.Patch(color="#FF85B4", label="Windy")
-        ice = mpatches.Patch(color="#E15554", label="Ice")
-        snow = mpatches.Patch(color="#E1BC29", label="Snow")
-        wedge = mpatches.Patch(color="#2E8A59", label="Wedge")
-        kp = mpatches.Patch(color="#7768AE", label="Kick Pass")
-        plt.legend(handles=[pocket, windy, ice, snow, wedge, kp], loc="lower left")
-        plt.title(f"Attacking Kick Paths ({total} Total)")
-        plt.savefig(path)
-        plt.close()
+        kicks = self.getKickMask()
+        kicks[kicks] = self.getKickVectors(kicks)[0] >= 70
+        total = int(kicks.sum())
+        xStart, yStart, xEnd, yEnd = self.getKickVectors(kicks)
+        clusters = self.drawKickArrows(
+            ax,
+            (xStart - 70) * 2,
+            yStart,
+            (xEnd - 70) * 2,
+            yEnd,
+            self.getKickArrowColors(kicks),
+        )
+        ax.legend(
+            handles=self.getKickLegendHandles(),
+            loc="lower left",
+            ncol=2 if self.kickOutcomes else 1,
+        )
+        ax.set_title(f"Attacking Kick Paths ({total} Total{clusters})")
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
         return path
 
@@ -1106,86 +2101,21 @@ class StatMonkey:
         path = f"Stat PNGs/{player.replace(" ", "_")}_Kick_Paths.png"
         self.logger.info(f"Started {path}")
 
-        fig, ax = plt.subplots(figsize=(self.figWidth, self.figHeight))
+        fig, ax = self.canvasPool.acquire()
         self.drawRugbyPitch(ax)
-        total = 0
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                kicks = root.xpath(
-                    f"""//instance[code="{self.teamName} Kick" and label[text="{player}" and group="Player"]]"""
-                )
-                for kick in kicks:
-                    xStart = (
-                        float(kick.xpath("label[group='X_Start']/text/text()")[0])
-                        + self.tryZone
-                    )
-                    yStart = self.fieldWidth - float(
-                        kick.xpath("label[group='Y_Start']/text/text()")[0]
-                    )
-                    xEnd = (
-                        float(kick.xpath("label[group='X_End']/text/text()")[0])
-                        + self.tryZone
-                    )
-                    yEnd = self.fieldWidth - float(
-                        kick.xpath("label[group='Y_End']/text/text()")[0]
-                    )
-                    descriptor = str(
-                        kick.xpath("label[group='Kick Descriptor']/text/text()")[0]
-                    )
-                    if descriptor == "Touch Kick":
-                        continue
-                    total += 1
-                    kickStyle = str(
-                        kick.xpath("label[group='Kick Style']/text/text()")[0]
-                    )
-                    dx = xEnd - xStart
-                    dy = yEnd - yStart
-                    # Windy
-                    if kickStyle == "Box":
-                        color = "#FF85B4"
-                    else:
-                        match descriptor:
-                            # Pocket
-                            case "Territorial":
-                                color = "#63AAE3"
-                            # Ice
-                            case "Low":
-                                color = "#E15554"
-                            # Snow
-                            case "Bomb":
-                                color = "#E1BC29"
-                            # Wedge
-                            case "Chip":
-                                color = "#2E8A59"
-                            # Kick Pass
-                            case "Cross Pitch":
-                                color = "#7768AE"
-                    plt.arrow(
-                        xStart,
-                        yStart,
-                        dx,
-                        dy,
-                        head_width=2,
-                        head_length=1,
-                        fc=color,
-                        ec=color,
-                        lw=self.arrowWidth,
-                        length_includes_head=True,
-                    )
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
-        pocket = mpatches.Patch(color="#63AAE3", label="Pocket")
-        windy = mpatches.Patch(color="#FF85B4", label="Windy")
-        ice = mpatches.Patch(color="#E15554", label="Ice")
-        snow = mpatches.Patch(color="#E1BC29", label="Snow")
-        wedge = mpatches.Patch(color="#2E8A59", label="Wedge")
-        kp = mpatches.Patch(color="#7768AE", label="Kick Pass")
-        plt.legend(handles=[pocket, windy, ice, snow, wedge, kp], loc="lower left")
-        plt.title(f"{player} Kick Paths ({total} Total)")
-        plt.savefig(path)
-        plt.close()
+        kicks = self.getKickMask() & self.getEventTable().labelMask("Player", player)
+        total = int(kicks.sum())
+        clusters = self.drawKickArrows(
+            ax, *self.getKickVectors(kicks), self.getKickArrowColors(kicks)
+        )
+        ax.legend(
+            handles=self.getKickLegendHandles(),
+            loc="lower left",
+            ncol=2 if self.kickOutcomes else 1,
+        )
+        ax.set_title(f"{player} Kick Paths ({total} Total{clusters})")
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
 
         return path
@@ -1194,91 +2124,58 @@ class StatMonkey:
         path = f"Stat PNGs/{self.teamName.replace(" ", "_")}_{type.capitalize()}_Kick_Paths.png"
         self.logger.info(f"Started {path}")
 
-        fig, ax = plt.subplots(figsize=(self.figWidth, self.figHeight))
+        fig, ax = self.canvasPool.acquire()
         self.drawRugbyPitch(ax)
-        total = 0
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                if type == "windy":
-                    kicks = root.xpath(
-                        f"//instance[code='{self.teamName} Kick' and label[text='Box' and group='Kick Style'] and label[text!='Touch Kick' and group='Kick Descriptor']]"
-                    )
-                    color = "#FF85B4"
-                    title = "Windy/Box"
-                else:
-                    match type:
-                        # Pocket
-                        case "pocket":
-                            kicks = root.xpath(
-                                f"//instance[code='{self.teamName} Kick' and label[text='Territorial' and group='Kick Descriptor'] and label[text='Regular' and group='Kick Style']]"
-                            )
-                            color = "#4D9DE0"
-                            title = "Pocket/Long"
-                        # Ice
-                        case "ice":
-                            kicks = root.xpath(
-                                f"//instance[code='{self.teamName} Kick' and label[text='Low' and group='Kick Descriptor']]"
-                            )
-                            color = "#E15554"
-                            title = "Ice/Grubber"
-                        # Snow
-                        case "snow":
-                            kicks = root.xpath(
-                                f"//instance[code='{self.teamName} Kick' and label[text='Bomb' and group='Kick Descriptor']]"
-                            )
-                            color = "#E1BC29"
-                            title = "Snow/Up And Under"
-                        # Wedge
-                        case "wedge":
-                            kicks = root.xpath(
-                                f"//instance[code='{self.teamName} Kick' and label[text='Chip' and group='Kick Descriptor']]"
-                            )
-                            color = "#3BB273"
-                            title = "Wedge/Chip"
-                        # Kick Pass
-                        case "kp":
-                            kicks = root.xpath(
-                                f"//instance[code='{self.teamName} Kick' and label[text='Cross Pitch' and group='Kick Descriptor']]"
-                            )
-                            color = "#7768AE"
-                            title = "Kick Pass/Cross"
-                for kick in kicks:
-                    total += 1
-                    xStart = (
-                        float(kick.xpath("label[group='X_Start']/text/text()")[0])
-                        + self.tryZone
-                    )
-                    yStart = self.fieldWidth - float(
-                        kick.xpath("label[group='Y_Start']/text/text()")[0]
-                    )
-                    xEnd = (
-                        float(kick.xpath("label[group='X_End']/text/text()")[0])
-                        + self.tryZone
-                    )
-                    yEnd = self.fieldWidth - float(
-                        kick.xpath("label[group='Y_End']/text/text()")[0]
-                    )
-                    dx = xEnd - xStart
-                    dy = yEnd - yStart
-                    plt.arrow(
-                        xStart,
-                        yStart,
-                        dx,
-                        dy,
-                        head_width=2,
-                        head_length=1,
-                        fc=color,
-                        ec=color,
-                        lw=self.arrowWidth,
-                        length_includes_head=True,
+        table = self.getEventTable()
+        kicks = table.codeMask(f"{self.teamName} Kick")
+        if type == "windy":
+            descriptors = table.labelCodes("Kick Descriptor")
+            kicks = (
+                kicks
+                & table.labelMask("Kick Style", "Box")
+                & (descriptors >= 0)
+                & (descriptors != table.values.lookup("Touch Kick"))
+            )
+            color = "#FF85B4"
+            title = "Windy/Box"
+        else:
+            match type:
+                # Pocket
+                case "pocket":
+                    kicks = (
+                        kicks
+                        & table.labelMask("Kick Descriptor", "Territorial")
+                        & table.labelMask("Kick Style", "Regular")
                     )
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
-        plt.title(f"{title} Kick Paths ({total} Total)")
-        plt.savefig(path)
-        plt.close()
+                    color = "#4D9DE0"
+                    title = "Pocket/Long"
+                # Ice
+                case "ice":
+                    kicks = kicks & table.labelMask("Kick Descriptor", "Low")
+                    color = "#E15554"
+                    title = "Ice/Grubber"
+                # Snow
+                case "snow":
+                    kicks = kicks & table.labelMask("Kick Descriptor", "Bomb")
+                    color = "#E1BC29"
+                    title = "Snow/Up And Under"
+                # Wedge
+                case "wedge":
+                    kicks = kicks & table.labelMask("Kick Descriptor", "Chip")
+                    color = "#3BB273"
+                    title = "Wedge/Chip"
+                # Kick Pass
+                case "kp":
+                    kicks = kicks & table.labelMask("Kick Descriptor", "Cross Pitch")
+                    color = "#7768AE"
+                    title = "Kick Pass/Cross"
+        total = int(kicks.sum())
+        clusters = self.drawKickArrows(
+            ax, *self.getKickVectors(kicks), [color] * total
+        )
+        ax.set_title(f"{title} Kick Paths ({total} Total{clusters})")
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
 
         return path
@@ -1286,7 +2183,6 @@ class StatMonkey:
     def getScrumStats(self):
         path = f"Stat PNGs/{self.teamName.replace(" ", "_")}_Scrum_Stats.png"
         self.logger.info(f"Started {path}")
-        plt.figure(figsize=(self.figWidth, self.figHeight))
 
         scrumStats = {
             "Won Outright": 0,
@@ -1295,54 +2191,53 @@ class StatMonkey:
             "Conceded Penalty": 0,
             "Reset": 0,
         }
-        totalScrums = 0
         positiveScrums = 0
         negativeScrums = 0
 
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                scrums = root.xpath(f"//instance[code='{self.teamName} Scrum']")
-                for scrum in scrums:
-                    result = str(
-                        scrum.xpath("label[group='Scrum Result']/text/text()")[0]
+        table = self.getEventTable()
+        scrums = table.codeMask(f"{self.teamName} Scrum")
+        totalScrums = int(scrums.sum())
+        for result, count in self.countBy(scrums, "Scrum Result").items():
+            match result:
+                case "Reset":
+                    scrumStats["Reset"] = scrumStats["Reset"] + count
+                case "Won Outright" | "Won Try":
+                    scrumStats["Won Outright"] = scrumStats["Won Outright"] + count
+                    positiveScrums += count
+                case "Won Free Kick" | "Won Penalty" | "Won Penalty Try":
+                    scrumStats["Won Penalty"] = scrumStats["Won Penalty"] + count
+                    positiveScrums += count
+                case "Lost Outright":
+                    scrumStats["Lost Outright"] = scrumStats["Lost Outright"] + count
+                    negativeScrums += count
+                case "Lost Pen Con" | "Lost Free Kick":
+                    scrumStats["Conceded Penalty"] = (
+                        scrumStats["Conceded Penalty"] + count
                     )
-                    totalScrums += 1
-                    match result:
-                        case "Reset":
-                            scrumStats["Reset"] = scrumStats["Reset"] + 1
-                        case "Won Outright" | "Won Try":
-                            scrumStats["Won Outright"] = scrumStats["Won Outright"] + 1
-                            positiveScrums += 1
-                        case "Won Free Kick" | "Won Penalty" | "Won Penalty Try":
-                            scrumStats["Won Penalty"] = scrumStats["Won Penalty"] + 1
-                            positiveScrums += 1
-                        case "Lost Outright":
-                            scrumStats["Lost Outright"] = (
-                                scrumStats["Lost Outright"] + 1
-                            )
-                            negativeScrums += 1
-                        case "Lost Pen Con" | "Lost Free Kick":
-                            scrumStats["Conceded Penalty"] = (
-                                scrumStats["Conceded Penalty"] + 1
-                            )
-                            negativeScrums += 1
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
+                    negativeScrums += count
         successRate = int(round(positiveScrums / totalScrums, 2) * 100)
         sortedScrumStats = OrderedDict(
             sorted(scrumStats.items(), key=itemgetter(1), reverse=True)
         )
-        plt.title(
-            f"{self.teamName} Attacking Scrum Results ({successRate}% Success {positiveScrums}/{totalScrums})"
+        interval = self.getRateInterval("getScrumStats", 0, 100, "%")
+        title = (
+            f"{self.teamName} Attacking Scrum Results ({successRate}% Success {positiveScrums}/{totalScrums}{interval})"
         )
-        bars = plt.bar(sortedScrumStats.keys(), sortedScrumStats.values())
+        if self.nativeCharts:
+            return chartSpec(
+                "bar",
+                title,
+                sortedScrumStats.keys(),
+                sortedScrumStats.values(),
+            )
+        fig, ax = self.canvasPool.acquire()
+        ax.set_title(title)
+        bars = ax.bar(sortedScrumStats.keys(), sortedScrumStats.values())
         for bar in bars:
             height = bar.get_height()
             if height < 2:
                 # Place text above the bar
-                plt.text(
+                ax.text(
                     bar.get_x() + bar.get_width() / 2.0,
                     height + 0.1,  # Add a small offset above the bar
                     f"{int(height)}",
@@ -1352,7 +2247,7 @@ class StatMonkey:
                 )
             else:
                 # Keep current positioning inside the bar
-                plt.text(
+                ax.text(
                     bar.get_x() + bar.get_width() / 2.0,
                     (height / 2),
                     f"{int(height)}",
@@ -1360,52 +2255,44 @@ class StatMonkey:
                     va="center",
                     fontweight="bold",
                 )
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.subplots_adjust(bottom=0.25)
-        plt.savefig(path)
-        plt.close()
+        ax.tick_params(axis="x", labelrotation=45)
+        fig.tight_layout()
+        fig.subplots_adjust(bottom=0.25)
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
         return path
 
     def getScrumConPens(self):
         path = f"Stat PNGs/{self.teamName.replace(" ", "_")}_Conceded_Scrum_Pens.png"
         self.logger.info(f"Started {path}")
-        plt.figure(figsize=(self.figWidth, self.figHeight))
-        penaltyCount = {}
-        totalPens = 0
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                pens = root.xpath(
-                    f"//instance[code='{self.teamName} Penalty Conceded' and label[text='Scrum Offence' and group='Pen Descriptor']]"
-                )
-                for pen in pens:
-                    offence = str(
-                        pen.xpath("label[group='Scrum Offences']/text/text()")[0]
-                    )
-                    if pen.xpath("label[group='Player']/text/text()"):
-                        player = str(pen.xpath("label[group='Player']/text/text()")[0])
-                        if player not in self.penalizedProps:
-                            self.penalizedProps.append(player)
-
-                    totalPens += 1
-                    if offence not in penaltyCount:
-                        penaltyCount[offence] = 1
-                    else:
-                        penaltyCount[offence] = penaltyCount[offence] + 1
-
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
+        table = self.getEventTable()
+        pens = table.codeMask(
+            f"{self.teamName} Penalty Conceded"
+        ) & table.labelMask("Pen Descriptor", "Scrum Offence")
+        self.penalizedProps = []
+        for player in self.countBy(pens, "Player"):
+            if player not in self.penalizedProps:
+                self.penalizedProps.append(player)
+        totalPens = int(pens.sum())
+        penaltyCount = self.countBy(pens, "Scrum Offences")
         sortedPenCount = OrderedDict(
             sorted(penaltyCount.items(), key=itemgetter(1), reverse=True)
         )
-        plt.title(f"{self.teamName} Scrum Penalties Conceded ({totalPens} Total)")
-        bars = plt.bar(sortedPenCount.keys(), sortedPenCount.values())
+        title = f"{self.teamName} Scrum Penalties Conceded ({totalPens} Total)"
+        if self.nativeCharts:
+            return chartSpec(
+                "bar",
+                title,
+                sortedPenCount.keys(),
+                sortedPenCount.values(),
+            )
+        fig, ax = self.canvasPool.acquire()
+        ax.set_title(title)
+        bars = ax.bar(sortedPenCount.keys(), sortedPenCount.values())
         for bar in bars:
             height = bar.get_height()
-            plt.text(
+            ax.text(
                 bar.get_x() + bar.get_width() / 2.0,
                 (height / 2),
                 f"{int(height)}",
@@ -1413,12 +2300,12 @@ class StatMonkey:
                 va="center",
                 fontweight="bold",
             )
-        plt.xticks(rotation=45)
-        plt.gca().yaxis.set_major_locator(plt.MultipleLocator(1))
-        plt.tight_layout()
-        plt.subplots_adjust(bottom=0.25)
-        plt.savefig(path)
-        plt.close()
+        ax.tick_params(axis="x", labelrotation=45)
+        ax.yaxis.set_major_locator(tck.MultipleLocator(1))
+        fig.tight_layout()
+        fig.subplots_adjust(bottom=0.25)
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
         return path
 
@@ -1426,38 +2313,37 @@ class StatMonkey:
         path = f"Stat PNGs/{self.teamName.replace(" ", "_")}_Scrum_Pens_Won.png"
         self.logger.info(f"Started {path}")
 
-        plt.figure(figsize=(self.figWidth, self.figHeight))
-        penaltyCount = {}
-        totalPens = 0
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                opp = root.xpath(
-                    f"string(//label/text[following-sibling::group[text()='Penalty Conceded' or text()='Turnover Won' or text()='Kick' or text()='Pass' or text()='Restart']][not(text()='{self.teamName}')][1])"
-                )
-                pens = root.xpath(
-                    f"//instance[code='{opp} Penalty Conceded' and label[text='Scrum Offence' and group='Pen Descriptor']]"
-                )
-                for pen in pens:
-                    offence = str(
-                        pen.xpath("label[group='Scrum Offences']/text/text()")[0]
-                    )
-                    totalPens += 1
-                    if offence not in penaltyCount:
-                        penaltyCount[offence] = 1
-                    else:
-                        penaltyCount[offence] = penaltyCount[offence] + 1
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
+        table = self.getEventTable()
+        # Penalty Conceded code of whoever we played in each game
+        oppPenCodes = np.array(
+            [
+                table.codes.lookup(f"{opp} Penalty Conceded")
+                for opp in table.getOpponents(self.teamName)
+            ],
+            dtype=np.int32,
+        )
+        pens = (
+            table.events["code"] == oppPenCodes[table.events["game"]]
+        ) & table.labelMask("Pen Descriptor", "Scrum Offence")
+        totalPens = int(pens.sum())
+        penaltyCount = self.countBy(pens, "Scrum Offences")
         sortedPenCount = OrderedDict(
             sorted(penaltyCount.items(), key=itemgetter(1), reverse=True)
         )
-        plt.title(f"{self.teamName} Scrum Penalties Won ({totalPens} Total)")
-        bars = plt.bar(sortedPenCount.keys(), sortedPenCount.values())
+        title = f"{self.teamName} Scrum Penalties Won ({totalPens} Total)"
+        if self.nativeCharts:
+            return chartSpec(
+                "bar",
+                title,
+                sortedPenCount.keys(),
+                sortedPenCount.values(),
+            )
+        fig, ax = self.canvasPool.acquire()
+        ax.set_title(title)
+        bars = ax.bar(sortedPenCount.keys(), sortedPenCount.values())
         for bar in bars:
             height = bar.get_height()
-            plt.text(
+            ax.text(
                 bar.get_x() + bar.get_width() / 2.0,
                 (height / 2),
                 f"{int(height)}",
@@ -1465,12 +2351,12 @@ class StatMonkey:
                 va="center",
                 fontweight="bold",
             )
-        plt.xticks(rotation=45)
-        plt.gca().yaxis.set_major_locator(plt.MultipleLocator(1))
-        plt.tight_layout()
-        plt.subplots_adjust(bottom=0.25)
-        plt.savefig(path)
-        plt.close()
+        ax.tick_params(axis="x", labelrotation=45)
+        ax.yaxis.set_major_locator(tck.MultipleLocator(1))
+        fig.tight_layout()
+        fig.subplots_adjust(bottom=0.25)
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
 
         return path
@@ -1478,39 +2364,34 @@ class StatMonkey:
     def getScrumPensByPlayer(self, player):
         path = f"Stat PNGs/{player.replace(" ", "_")}_Scrum_Pens.png"
         self.logger.info(f"Started {path}")
-        plt.figure(figsize=(self.figWidth, self.figHeight))
-        playerPens = {}
-        totalPens = 0
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                pens = root.xpath(
-                    f"""//instance[code="{self.teamName} Penalty Conceded" and label[text="Scrum Offence" and group="Pen Descriptor"] and label[text="{player}" and group="Player"]]"""
-                )
-                for pen in pens:
-                    offence = str(
-                        pen.xpath("label[group='Scrum Offences']/text/text()")[0]
-                    )
-                    totalPens += 1
-                    if offence not in playerPens:
-                        playerPens[offence] = 1
-                    else:
-                        playerPens[offence] = playerPens[offence] + 1
-
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
+        table = self.getEventTable()
+        pens = (
+            table.codeMask(f"{self.teamName} Penalty Conceded")
+            & table.labelMask("Pen Descriptor", "Scrum Offence")
+            & table.labelMask("Player", player)
+        )
+        totalPens = int(pens.sum())
+        playerPens = self.countBy(pens, "Scrum Offences")
         sortedPlayerPens = OrderedDict(
             sorted(playerPens.items(), key=itemgetter(1), reverse=True)
         )
-        plt.title(f"{player} Scrum Penalties Conceded ({totalPens} Total)")
-        plt.pie(
+        title = f"{player} Scrum Penalties Conceded ({totalPens} Total)"
+        if self.nativeCharts:
+            return chartSpec(
+                "pie",
+                title,
+                sortedPlayerPens.keys(),
+                sortedPlayerPens.values(),
+            )
+        fig, ax = self.canvasPool.acquire()
+        ax.set_title(title)
+        ax.pie(
             sortedPlayerPens.values(),
             labels=sortedPlayerPens.keys(),
             autopct=lambda p: f"{int(p*sum(sortedPlayerPens.values())/100)}",
         )
-        plt.savefig(path)
-        plt.close()
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
 
         return path
@@ -1518,147 +2399,131 @@ class StatMonkey:
     def getTopDefendersBeaten(self):
         path = f"Stat PNGs/{self.teamName.replace(" ", "_")}_Top_Defenders_Beaten.png"
         self.logger.info(f"Started {path}")
-        plt.figure(figsize=(self.figWidth, self.figHeight))
-        defenderBeaters = {}
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                defenceBeaten = root.xpath(
-                    f"//instance[label[text='Defender Beaten' and group='Attacking Qualities'] and label[text='{self.teamName}' and group='Attacking Quality']]"
-                )
-                for instance in defenceBeaten:
-                    player = str(
-                        instance.xpath(
-                            "label[group='Player'][position()=1]/text/text()"
-                        )[0]
-                    )
-                    defenderBeaters[player] = (
-                        defenderBeaters[player] + 1 if player in defenderBeaters else 1
-                    )
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
-        plt.title(f"Top Performers: Defenders Beaten")
+        defenceBeaten = self.getQualityMask("Defender Beaten")
+        defenderBeaters = self.getPlayerRates(self.countBy(defenceBeaten, "Player"))
         sortedDefenderBeaters = OrderedDict(
             sorted(defenderBeaters.items(), key=itemgetter(1), reverse=True)
         )
-        bars = plt.bar(
+        title = self.getPer80Label(f"Top Performers: Defenders Beaten")
+        if self.nativeCharts:
+            return chartSpec(
+                "bar",
+                title,
+                list(sortedDefenderBeaters.keys())[:5],
+                list(sortedDefenderBeaters.values())[:5],
+                self.getPer80Label("Defenders Beaten"),
+            )
+        fig, ax = self.canvasPool.acquire()
+        ax.set_title(title)
+        bars = ax.bar(
             list(sortedDefenderBeaters.keys())[:5],
             list(sortedDefenderBeaters.values())[:5],
         )
         for bar in bars:
             height = bar.get_height()
-            plt.text(
+            ax.text(
                 bar.get_x() + bar.get_width() / 2.0,
                 (height / 2),
-                f"{int(height)}",
+                self.getBarLabel(height),
                 ha="center",
                 va="center",
                 fontweight="bold",
             )
-        plt.ylabel("Defenders Beaten")
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.subplots_adjust(bottom=0.25)
+        ax.set_ylabel(self.getPer80Label("Defenders Beaten"))
+        ax.tick_params(axis="x", labelrotation=45)
+        fig.tight_layout()
+        fig.subplots_adjust(bottom=0.25)
         path = f"Stat PNGs/{self.teamName.replace(" ", "_")}_Top_Defenders_Beaten.png"
-        plt.savefig(path)
-        plt.close()
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
         return path
 
     def getTopTryScorers(self):
         path = f"Stat PNGs/{self.teamName.replace(" ", "_")}_Top_Try_Scorers.png"
         self.logger.info(f"Started {path}")
-        plt.figure(figsize=(self.figWidth, self.figHeight))
-        tryScorers = {}
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                trys = root.xpath(f"//instance[code='{self.teamName} Try']")
-
-                for instance in trys:
-                    player = instance.xpath(
-                        "label[group='Player'][position()=1]/text/text()"
-                    )
-                    if player:
-                        player = player[0]
-                    else:
-                        continue
-                    tryScorers[player] = (
-                        tryScorers[player] + 1 if player in tryScorers else 1
-                    )
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
-        plt.title(f"Top Performers: Try Scorers")
+        tryScorers = self.getPlayerRates(
+            self.getEventCube().countBy("player", code=f"{self.teamName} Try")
+        )
         sortedTryScorers = OrderedDict(
             sorted(tryScorers.items(), key=itemgetter(1), reverse=True)
         )
-        bars = plt.bar(
+        title = self.getPer80Label(f"Top Performers: Try Scorers")
+        if self.nativeCharts:
+            return chartSpec(
+                "bar",
+                title,
+                list(sortedTryScorers.keys())[:5],
+                list(sortedTryScorers.values())[:5],
+                self.getPer80Label("Tries Scored"),
+            )
+        fig, ax = self.canvasPool.acquire()
+        ax.set_title(title)
+        bars = ax.bar(
             list(sortedTryScorers.keys())[:5],
             list(sortedTryScorers.values())[:5],
         )
         for bar in bars:
             height = bar.get_height()
-            plt.text(
+            ax.text(
                 bar.get_x() + bar.get_width() / 2.0,
                 (height / 2),
-                f"{int(height)}",
+                self.getBarLabel(height),
                 ha="center",
                 va="center",
                 fontweight="bold",
             )
-        plt.ylabel("Tries Scored")
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.subplots_adjust(bottom=0.25)
-        plt.gca().yaxis.set_major_locator(tck.MultipleLocator(base=1))
-        plt.savefig(path)
-        plt.close()
+        ax.set_ylabel(self.getPer80Label("Tries Scored"))
+        ax.tick_params(axis="x", labelrotation=45)
+        fig.tight_layout()
+        fig.subplots_adjust(bottom=0.25)
+        if not self.per80:
+            # Whole counts get whole ticks, rates keep the default ones
+            ax.yaxis.set_major_locator(tck.MultipleLocator(base=1))
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
         return path
 
     def getTopTacklers(self):
         path = f"Stat PNGs/{self.teamName.replace(" ", "_")}_Top_Tacklers.png"
         self.logger.info(f"Started {path}")
-        plt.figure(figsize=(self.figWidth, self.figHeight))
-        tacklers = {}
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                tackles = root.xpath(
-                    f"//instance[label[text='Complete' and group='Tackle Outcome'] and label[text='{self.teamName}' and group='Tackle'] and label[text='Tackle' and group='Event']]"
-                )
-                for tackle in tackles:
-                    player = str(tackle.xpath("label[group='Player']/text/text()")[0])
-                    tacklers[player] = tacklers[player] + 1 if player in tacklers else 1
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
-        plt.title(f"Top Performers: Completed Tackles")
+        tackles = self.getTackleMask()
+        tacklers = self.getPlayerRates(self.countBy(tackles, "Player"))
         sortedTacklers = OrderedDict(
             sorted(tacklers.items(), key=itemgetter(1), reverse=True)
         )
-        bars = plt.bar(
+        title = self.getPer80Label(f"Top Performers: Completed Tackles")
+        if self.nativeCharts:
+            return chartSpec(
+                "bar",
+                title,
+                list(sortedTacklers.keys())[:5],
+                list(sortedTacklers.values())[:5],
+                self.getPer80Label("Completed Tackles"),
+            )
+        fig, ax = self.canvasPool.acquire()
+        ax.set_title(title)
+        bars = ax.bar(
             list(sortedTacklers.keys())[:5],
             list(sortedTacklers.values())[:5],
         )
         for bar in bars:
             height = bar.get_height()
-            plt.text(
+            ax.text(
                 bar.get_x() + bar.get_width() / 2.0,
                 (height / 2),
-                f"{int(height)}",
+                self.getBarLabel(height),
                 ha="center",
                 va="center",
                 fontweight="bold",
             )
-        plt.ylabel("Completed Tackles")
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.subplots_adjust(bottom=0.25)
-        plt.savefig(path)
-        plt.close()
+        ax.set_ylabel(self.getPer80Label("Completed Tackles"))
+        ax.tick_params(axis="x", labelrotation=45)
+        fig.tight_layout()
+        fig.subplots_adjust(bottom=0.25)
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
 
         return path
@@ -1666,44 +2531,44 @@ class StatMonkey:
     def getTopDomTacklers(self):
         path = f"Stat PNGs/{self.teamName.replace(" ", "_")}_Top_Dom_Tacklers.png"
         self.logger.info(f"Started {path}")
-        plt.figure(figsize=(self.figWidth, self.figHeight))
-        tacklers = {}
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                tackles = root.xpath(
-                    f"//instance[label[text='Complete' and group='Tackle Outcome'] and label[text='{self.teamName}' and group='Tackle'] and label[text='Tackle' and group='Event'] and label[text='Dominant Tackle Contact' and group='Tackle Dominance']]"
-                )
-                for tackle in tackles:
-                    player = str(tackle.xpath("label[group='Player']/text/text()")[0])
-                    tacklers[player] = tacklers[player] + 1 if player in tacklers else 1
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
-        plt.title(f"Top Performers: Dominant Tackles")
+        tackles = self.getTackleMask() & self.getEventTable().labelMask(
+            "Tackle Dominance", "Dominant Tackle Contact"
+        )
+        tacklers = self.getPlayerRates(self.countBy(tackles, "Player"))
         sortedTacklers = OrderedDict(
             sorted(tacklers.items(), key=itemgetter(1), reverse=True)
         )
-        bars = plt.bar(
+        title = self.getPer80Label(f"Top Performers: Dominant Tackles")
+        if self.nativeCharts:
+            return chartSpec(
+                "bar",
+                title,
+                list(sortedTacklers.keys())[:5],
+                list(sortedTacklers.values())[:5],
+                self.getPer80Label("Dominant Tackles"),
+            )
+        fig, ax = self.canvasPool.acquire()
+        ax.set_title(title)
+        bars = ax.bar(
             list(sortedTacklers.keys())[:5],
             list(sortedTacklers.values())[:5],
         )
         for bar in bars:
             height = bar.get_height()
-            plt.text(
+            ax.text(
                 bar.get_x() + bar.get_width() / 2.0,
                 (height / 2),
-                f"{int(height)}",
+                self.getBarLabel(height),
                 ha="center",
                 va="center",
                 fontweight="bold",
             )
-        plt.ylabel("Dominant Tackles")
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.subplots_adjust(bottom=0.25)
-        plt.savefig(path)
-        plt.close()
+        ax.set_ylabel(self.getPer80Label("Dominant Tackles"))
+        ax.tick_params(axis="x", labelrotation=45)
+        fig.tight_layout()
+        fig.subplots_adjust(bottom=0.25)
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
         return path
 
@@ -1711,54 +2576,48 @@ class StatMonkey:
         path = f"Stat PNGs/{self.teamName.replace(" ", "_")}_Top_Assisters.png"
         self.logger.info(f"Started {path}")
 
-        plt.figure(figsize=(self.figWidth, self.figHeight))
-        assisters = {}
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                assists = root.xpath(
-                    f"//instance[label[text='Try Assist' and group='Attacking Qualities'] and label[text='{self.teamName}' and group='Attacking Quality']]"
-                )
-                for assist in assists:
-                    player = str(
-                        assist.xpath("label[group='Player'][position()=1]/text/text()")[
-                            0
-                        ]
-                    )
-                    assisters[player] = (
-                        assisters[player] + 1 if player in assisters else 1
-                    )
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
+        assists = self.getQualityMask("Try Assist")
+        assisters = self.getPlayerRates(self.countBy(assists, "Player"))
         if len(assisters.keys()) == 0:
             return None
-        plt.title(f"Top Performers: Assists")
         sortedAssisters = OrderedDict(
             sorted(assisters.items(), key=itemgetter(1), reverse=True)
         )
-        bars = plt.bar(
+        self.topAssisters = list(sortedAssisters.keys())[:5]
+        title = self.getPer80Label(f"Top Performers: Assists")
+        if self.nativeCharts:
+            return chartSpec(
+                "bar",
+                title,
+                self.topAssisters,
+                list(sortedAssisters.values())[:5],
+                self.getPer80Label("Assists"),
+            )
+        fig, ax = self.canvasPool.acquire()
+        ax.set_title(title)
+        bars = ax.bar(
             list(sortedAssisters.keys())[:5],
             list(sortedAssisters.values())[:5],
         )
-        self.topAssisters = list(sortedAssisters.keys())[:5]
         for bar in bars:
             height = bar.get_height()
-            plt.text(
+            ax.text(
                 bar.get_x() + bar.get_width() / 2.0,
                 (height / 2),
-                f"{int(height)}",
+                self.getBarLabel(height),
                 ha="center",
                 va="center",
                 fontweight="bold",
             )
-        plt.ylabel("Assists")
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.subplots_adjust(bottom=0.25)
-        plt.gca().yaxis.set_major_locator(tck.MultipleLocator(base=1))
-        plt.savefig(path)
-        plt.close()
+        ax.set_ylabel(self.getPer80Label("Assists"))
+        ax.tick_params(axis="x", labelrotation=45)
+        fig.tight_layout()
+        fig.subplots_adjust(bottom=0.25)
+        if not self.per80:
+            # Whole counts get whole ticks, rates keep the default ones
+            ax.yaxis.set_major_locator(tck.MultipleLocator(base=1))
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
         return path
 
@@ -1766,35 +2625,23 @@ class StatMonkey:
     def getAssistBreakdown(self, player):
         path = f"Stat PNGs/{player.replace(' ', '_')}_Assist_Breakdown.png"
         self.logger.info(f"Started {path}")
-        plt.figure(figsize=(self.figWidth, self.figHeight))
-        assistStyles = {}
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                assists = root.xpath(
-                    f"//instance[label[text='Try Assist' and group='Attacking Qualities'] and label[text='{self.teamName}' and group='Attacking Quality'] and label[text='{player}' and group='Player']]"
-                )
-                for assist in assists:
-                    style = str(
-                        assist.xpath(
-                            "label[group='Assist Style'][position()=1]/text/text()"
-                        )[0]
-                    )
-                    assistStyles[style] = (
-                        assistStyles[style] + 1 if style in assistStyles else 1
-                    )
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
-        plt.pie(
+        assists = self.getQualityMask(
+            "Try Assist"
+        ) & self.getEventTable().labelMask("Player", player)
+        assistStyles = self.countBy(assists, "Assist Style")
+        title = f"{player} Assist Breakdown ({len(assistStyles.keys())} Total)"
+        if self.nativeCharts:
+            return chartSpec("pie", title, assistStyles.keys(), assistStyles.values())
+        fig, ax = self.canvasPool.acquire()
+        ax.set_title(title)
+        ax.pie(
             assistStyles.values(),
             labels=assistStyles.keys(),
             autopct=lambda p: f"{int(p*sum(assistStyles.values())) / 100}",
         )
 
-        plt.title(f"{player} Assist Breakdown ({len(assistStyles.keys())} Total)")
-        plt.savefig(path)
-        plt.close()
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
 
         return path
@@ -1803,45 +2650,43 @@ class StatMonkey:
         path = f"Stat PNGs/{self.teamName.replace(" ", "_")}_Top_Carriers.png"
         self.logger.info(f"Started {path}")
 
-        plt.figure(figsize=(self.figWidth, self.figHeight))
-        carriers = {}
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                carries = root.xpath(
-                    f"//instance[label[text='{self.teamName}' and group='Carry'] and label[text='Carry' and group='Event']]"
-                )
-                for carry in carries:
-                    player = str(carry.xpath("label[group='Player']/text/text()")[0])
-                    carriers[player] = carriers[player] + 1 if player in carriers else 1
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
-        plt.title(f"Top Performers: Carries")
+        carries = self.getCarryMask()
+        carriers = self.getPlayerRates(self.countBy(carries, "Player"))
         sortedCarriers = OrderedDict(
             sorted(carriers.items(), key=itemgetter(1), reverse=True)
         )
         self.topCarriers = list(sortedCarriers.keys())[:5]
-        bars = plt.bar(
+        title = self.getPer80Label(f"Top Performers: Carries")
+        if self.nativeCharts:
+            return chartSpec(
+                "bar",
+                title,
+                self.topCarriers,
+                list(sortedCarriers.values())[:5],
+                self.getPer80Label("Carries"),
+            )
+        fig, ax = self.canvasPool.acquire()
+        ax.set_title(title)
+        bars = ax.bar(
             list(sortedCarriers.keys())[:5],
             list(sortedCarriers.values())[:5],
         )
         for bar in bars:
             height = bar.get_height()
-            plt.text(
+            ax.text(
                 bar.get_x() + bar.get_width() / 2.0,
                 (height / 2),
-                f"{int(height)}",
+                self.getBarLabel(height),
                 ha="center",
                 va="center",
                 fontweight="bold",
             )
-        plt.ylabel("Carries")
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.subplots_adjust(bottom=0.25)
-        plt.savefig(path)
-        plt.close()
+        ax.set_ylabel(self.getPer80Label("Carries"))
+        ax.tick_params(axis="x", labelrotation=45)
+        fig.tight_layout()
+        fig.subplots_adjust(bottom=0.25)
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
 
         return path
@@ -1849,46 +2694,28 @@ class StatMonkey:
     def getCarryBreakdown(self, player):
         path = f"Stat PNGs/{player.replace(' ', '_')}_Carry_Breakdown.png"
         self.logger.info(f"Started {path}")
-        plt.figure(figsize=(self.figWidth, self.figHeight))
-        breakdown = {}
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                carries = root.xpath(
-                    f"""//instance[label[text="{self.teamName}" and group="Carry"] and label[text="Carry" and group="Event"] and label[text="{player}" and group="Player"]]"""
-                )
-                for carry in carries:
-                    outcome = str(
-                        carry.xpath("label[group='Carry Outcome']/text/text()")[0]
-                    )
-                    if outcome == "Other":
-                        continue
-                    elif outcome == "Tackled":
-                        contact = str(
-                            carry.xpath("label[group='Carry Dominance']/text/text()")[0]
-                        )
-                        breakdown[contact] = (
-                            breakdown[contact] + 1 if contact in breakdown else 1
-                        )
-                    else:
-                        breakdown[outcome] = (
-                            breakdown[outcome] + 1 if outcome in breakdown else 1
-                        )
-
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
-            print(player, breakdown)
+        table = self.getEventTable()
+        carries = self.getCarryMask() & table.labelMask("Player", player)
+        outcomes = table.labelCodes("Carry Outcome")[carries]
+        contacts = table.labelCodes("Carry Dominance")[carries]
+        # Tackled carries are broken down by contact, "Other" is dropped
+        keys = np.where(outcomes == table.values.lookup("Tackled"), contacts, outcomes)
+        keys = keys[outcomes != table.values.lookup("Other")]
+        breakdown = self.countCodes(keys)
         total = sum(list(breakdown.values()))
-        plt.pie(
+        title = f"{player} Carries Breakdown"
+        if self.nativeCharts:
+            return chartSpec("pie", title, breakdown.keys(), breakdown.values())
+        fig, ax = self.canvasPool.acquire()
+        ax.set_title(title)
+        ax.pie(
             breakdown.values(),
             labels=breakdown.keys(),
             autopct=lambda pct: f"{int(round(np.divide(np.multiply(pct, total), 100)))}",
         )
 
-        plt.title(f"{player} Carries Breakdown")
-        plt.savefig(path)
-        plt.close()
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
         return path
 
@@ -1896,38 +2723,28 @@ class StatMonkey:
     def getTurnoverStats(self):
         path = f"Stat PNGs/{self.teamName.replace(' ', '_')}_Turnover_Breakdown.png"
         self.logger.info(f"Started {path}")
-        plt.figure(figsize=(self.figWidth, self.figHeight))
-        breakdown = {}
-        total = 0
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                turnovers = root.xpath(f"//instance[code='{self.teamName} Turnover']")
-
-                for turnover in turnovers:
-                    total += 1
-                    descriptor = str(
-                        turnover.xpath("label[group='Error Descriptor']/text/text()")[0]
-                    )
-                    if "Kick" in descriptor:
-                        descriptor = "Kick Error"
-
-                    breakdown[descriptor] = (
-                        breakdown[descriptor] + 1 if descriptor in breakdown else 1
-                    )
-
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
+        turnovers = self.getEventTable().codeMask(f"{self.teamName} Turnover")
+        total = int(turnovers.sum())
+        breakdown = self.countErrors(turnovers)
         sortedBreakdown = OrderedDict(
             sorted(breakdown.items(), key=itemgetter(1), reverse=True)
         )
-        bars = plt.bar(sortedBreakdown.keys(), sortedBreakdown.values())
+        title = f"{self.teamName} Turnover Breakdown ({total} Total)"
+        if self.nativeCharts:
+            return chartSpec(
+                "bar",
+                title,
+                sortedBreakdown.keys(),
+                sortedBreakdown.values(),
+            )
+        fig, ax = self.canvasPool.acquire()
+        ax.set_title(title)
+        bars = ax.bar(sortedBreakdown.keys(), sortedBreakdown.values())
         for bar in bars:
             height = bar.get_height()
             if height < 2:
                 # Place text above the bar
-                plt.text(
+                ax.text(
                     bar.get_x() + bar.get_width() / 2.0,
                     height + 0.1,  # Add a small offset above the bar
                     f"{int(height)}",
@@ -1937,7 +2754,7 @@ class StatMonkey:
                 )
             else:
                 # Keep current positioning inside the bar
-                plt.text(
+                ax.text(
                     bar.get_x() + bar.get_width() / 2.0,
                     (height / 2),
                     f"{int(height)}",
@@ -1945,140 +2762,222 @@ class StatMonkey:
                     va="center",
                     fontweight="bold",
                 )
-        plt.xticks(rotation=45)
-        plt.subplots_adjust(bottom=0.25)
-        plt.title(f"{self.teamName} Turnover Breakdown ({total} Total)")
-        plt.savefig(path)
-        plt.close()
+        ax.tick_params(axis="x", labelrotation=45)
+        fig.subplots_adjust(bottom=0.25)
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
         return path
 
     def getPlayerTurnoverCount(self):
         path = f"Stat PNGs/{self.teamName.replace(' ', '_')}_Turnover_Count.png"
         self.logger.info(f"Started {path}")
-        plt.figure(figsize=(self.figWidth, self.figHeight))
-        breakdown = {}
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                turnovers = root.xpath(f"//instance[code='{self.teamName} Turnover']")
-
-                for turnover in turnovers:
-                    player = str(turnover.xpath("label[group='Player']/text/text()")[0])
-
-                    breakdown[player] = (
-                        breakdown[player] + 1 if player in breakdown else 1
-                    )
-
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
-        median = statistics.median(breakdown.values())
-        sortedBreakdown = OrderedDict(
-            sorted(breakdown.items(), key=itemgetter(1), reverse=True)
+        counts = self.getEventCube().countBy("player", code=f"{self.teamName} Turnover")
+        # Who gets a breakdown slide comes from the counts either way, per 80
+        # only changes the bars, which leave out players short of minutes
+        median = statistics.median(counts.values()) if counts else 0
+        sortedCounts = OrderedDict(
+            sorted(counts.items(), key=itemgetter(1), reverse=True)
         )
-        for player in sortedBreakdown:
-            if breakdown[player] > median:
+        self.topTurnovers = []
+        for player in sortedCounts:
+            if counts[player] > median:
                 self.topTurnovers.append(player)
-        x = []
-        y = []
-        for player in self.topTurnovers:
-            x.append(player)
-            y.append(breakdown[player])
-        bars = plt.bar(x, y)
+        breakdown = self.getPlayerRates(counts)
+        x = sorted(
+            [player for player in self.topTurnovers if player in breakdown],
+            key=breakdown.get,
+            reverse=True,
+        )
+        y = [breakdown[player] for player in x]
+        title = self.getPer80Label(f"{self.teamName} Player Turnover Count")
+        if self.nativeCharts:
+            return chartSpec("bar", title, x, y)
+        fig, ax = self.canvasPool.acquire()
+        ax.set_title(title)
+        bars = ax.bar(x, y)
         for bar in bars:
             height = bar.get_height()
             if height < 2:
                 # Place text above the bar
-                plt.text(
+                ax.text(
                     bar.get_x() + bar.get_width() / 2.0,
                     height + 0.1,  # Add a small offset above the bar
-                    f"{int(height)}",
+                    self.getBarLabel(height),
                     ha="center",
                     va="bottom",  # Align to bottom of text
                     fontweight="bold",
                 )
             else:
                 # Keep current positioning inside the bar
-                plt.text(
+                ax.text(
                     bar.get_x() + bar.get_width() / 2.0,
                     (height / 2),
-                    f"{int(height)}",
+                    self.getBarLabel(height),
                     ha="center",
                     va="center",
                     fontweight="bold",
                 )
-        plt.xticks(rotation=60)
-        plt.subplots_adjust(bottom=0.25)
-        plt.title(f"{self.teamName} Player Turnover Count")
-        plt.tight_layout()
+        ax.tick_params(axis="x", labelrotation=60)
+        fig.subplots_adjust(bottom=0.25)
+        fig.tight_layout()
 
-        plt.savefig(path)
+        fig.savefig(path)
 
-        plt.close()
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
         return path
 
     def getPlayerTurnoverBD(self, player):
         path = f"Stat PNGs/{player}_Turnover_Breakdown.png"
         self.logger.info(f"Started {path}")
-        plt.figure(figsize=(self.figWidth, self.figHeight))
-        breakdown = {}
-        total = 0
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                turnovers = root.xpath(
-                    f"""//instance[code="{self.teamName} Turnover" and label[text="{player}" and group="Player"]]"""
-                )
-                for turnover in turnovers:
-                    total += 1
-                    descriptor = str(
-                        turnover.xpath("label[group='Error Descriptor']/text/text()")[0]
-                    )
-                    if "Kick" in descriptor:
-                        descriptor = "Kick Error"
-
-                    breakdown[descriptor] = (
-                        breakdown[descriptor] + 1 if descriptor in breakdown else 1
-                    )
-
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
-        plt.pie(
+        table = self.getEventTable()
+        turnovers = table.codeMask(f"{self.teamName} Turnover") & table.labelMask(
+            "Player", player
+        )
+        total = int(turnovers.sum())
+        breakdown = self.countErrors(turnovers)
+        title = f"{player} Turnover Breakdown ({total} Total)"
+        if self.nativeCharts:
+            return chartSpec("pie", title, breakdown.keys(), breakdown.values())
+        fig, ax = self.canvasPool.acquire()
+        ax.set_title(title)
+        ax.pie(
             breakdown.values(),
             labels=breakdown.keys(),
             autopct=lambda p: f"{int(p*sum(breakdown.values())/100)}",
         )
-        plt.title(f"{player} Turnover Breakdown ({total} Total)")
-        plt.savefig(path)
-        plt.close()
+        fig.savefig(path)
+        self.canvasPool.release(fig)
+        self.logger.info(f"Finished {path}")
+        return path
+
+    def getSmallMultiples(self, name, players):
+        # Every player's panel of a per-player stat on one figure, with the
+        # events for all of them picked out in one grouped pass
+        label = self.smallMultipleTitles[name]
+        path = f"Stat PNGs/{self.teamName.replace(' ', '_')}_{label.replace(' ', '_')}_By_Player_{players[0].replace(' ', '_')}.png"
+        self.logger.info(f"Started {path}")
+        cols = min(len(players), 3)
+        rows = -(-len(players) // cols)
+        title = f"{label} By Player"
+        if name in ["getPlayerKickPaths", "getLinebreakLocationsByPlayer"]:
+            fig, axes = self.canvasPool.acquireGrid(rows, cols)
+            if name == "getPlayerKickPaths":
+                self.drawKickPathGrid(axes, players)
+            else:
+                self.drawLinebreakGrid(axes, players)
+        else:
+            breakdowns = self.getPlayerBreakdowns(name, players)
+            # One colour per category across every panel
+            cycle = [
+                matplotlib.colors.to_hex(color)
+                for color in matplotlib.rcParams["axes.prop_cycle"].by_key()["color"]
+            ]
+            categoryColors = {}
+            for _, breakdown in breakdowns.values():
+                for category in breakdown:
+                    if category not in categoryColors:
+                        categoryColors[category] = cycle[
+                            len(categoryColors) % len(cycle)
+                        ]
+            if self.nativeCharts:
+                return chartGrid(
+                    title,
+                    [
+                        chartSpec(
+                            "pie",
+                            playerTitle,
+                            breakdown.keys(),
+                            breakdown.values(),
+                            colors=[categoryColors[c] for c in breakdown],
+                        )
+                        for playerTitle, breakdown in breakdowns.values()
+                    ],
+                    cols,
+                )
+            fig, axes = self.canvasPool.acquireGrid(rows, cols)
+            for ax, (playerTitle, breakdown) in zip(axes.flat, breakdowns.values()):
+                ax.set_title(playerTitle, fontsize=10)
+                values = list(breakdown.values())
+                ax.pie(
+                    values,
+                    colors=[categoryColors[c] for c in breakdown],
+                    autopct=lambda p, total=sum(values): f"{int(round(p * total / 100))}",
+                )
+            fig.legend(
+                handles=[
+                    mpatches.Patch(color=color, label=category)
+                    for category, color in categoryColors.items()
+                ],
+                loc="lower center",
+                ncol=min(len(categoryColors), 5),
+                fontsize=9,
+            )
+        for ax in axes.flat[len(players) :]:
+            ax.set_axis_off()
+        fig.suptitle(title)
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
         return path
 
+    def drawKickPathGrid(self, axes, players):
+        kicks = self.getKickMask()
+        rows = np.flatnonzero(kicks)
+        vectors = np.stack(self.getKickVectors(kicks), axis=1)
+        colors = np.array(self.getKickArrowColors(kicks), dtype=object)
+        for ax, (player, playerRows) in zip(
+            axes.flat, self.getPlayerRows(kicks, players).items()
+        ):
+            self.drawRugbyPitch(ax)
+            index = np.searchsorted(rows, playerRows)
+            clusters = self.drawKickArrows(ax, *vectors[index].T, colors[index])
+            ax.set_title(f"{player} ({len(playerRows)} Total{clusters})", fontsize=10)
+        ax.figure.legend(
+            handles=self.getKickLegendHandles(),
+            loc="lower center",
+            ncol=5 if self.kickOutcomes else 6,
+            fontsize=9,
+        )
+
+    def drawLinebreakGrid(self, axes, players):
+        # By first Player label, like getEventLocations
+        table = self.getEventTable()
+        rows = np.flatnonzero(self.getQualityMask("Initial Break"))
+        codes = table.labelCodes("Player")[rows]
+        xValues = table.events["xStart"][rows] + self.tryZone
+        yValues = self.fieldWidth - table.events["yStart"][rows]
+        for ax, player in zip(axes.flat, players):
+            playerRows = codes == table.values.lookup(player)
+            self.drawRugbyPitch(ax)
+            ax.scatter(xValues[playerRows], yValues[playerRows], s=12)
+            ax.set_title(f"{player} ({int(playerRows.sum())} Total)", fontsize=10)
+
     def getTapPensPerGame(self):
         path = f"Stat PNGs/{self.teamName.replace(" ", "_")}_Tap_Pens_Per_Game.png"
         self.logger.info(f"Started {path}")
-        plt.figure(figsize=(self.figWidth, self.figHeight))
-        games = {}
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                tapPens = root.xpath(f"//instance[code='{self.teamName} Tap Pen']")
-                date = root.xpath("//SESSION_INFO")[0].text.split()[0]
-                games[date] = len(tapPens)
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
-        plt.title(f"Tap Pens Per Game")
-        bars = plt.bar(
+        games = self.getGameCounts(
+            self.getEventCube().gameCounts(code=f"{self.teamName} Tap Pen")
+        )
+        title = f"Tap Pens Per Game"
+        if self.nativeCharts:
+            return chartSpec(
+                "bar",
+                title,
+                list(games.keys()),
+                list(games.values()),
+                "Tap Penalties",
+            )
+        fig, ax = self.canvasPool.acquire()
+        ax.set_title(title)
+        bars = ax.bar(
             list(games.keys()),
             list(games.values()),
         )
         for bar in bars:
             height = bar.get_height()
-            plt.text(
+            ax.text(
                 bar.get_x() + bar.get_width() / 2.0,
                 (height / 2) if height != 0 else 1,
                 f"{int(height)}",
@@ -2086,40 +2985,42 @@ class StatMonkey:
                 va="center",
                 fontweight="bold",
             )
-        plt.ylabel("Tap Penalties")
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.subplots_adjust(bottom=0.25)
-        plt.savefig(path)
-        plt.close()
+        ax.set_ylabel("Tap Penalties")
+        ax.tick_params(axis="x", labelrotation=45)
+        fig.tight_layout()
+        fig.subplots_adjust(bottom=0.25)
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
         return path
 
     def getTapPenTrysPerGame(self):
         path = f"Stat PNGs/{self.teamName.replace(" ", "_")}_Tap_Pen_Trys_Per_Game.png"
         self.logger.info(f"Started {path}")
-        plt.figure(figsize=(self.figWidth, self.figHeight))
-        games = {}
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                tapPens = root.xpath(
-                    f"//instance[code='{self.teamName} Tap Pen' and label[text='End Try' and group='Poss Endset']]"
-                )
-                date = root.xpath("//SESSION_INFO")[0].text.split()[0]
-                games[date] = len(tapPens)
-
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
-        plt.title(f"Tap Pen Trys Per Game")
-        bars = plt.bar(
+        table = self.getEventTable()
+        outcomes = self.getTapPenOutcomes()
+        trys = outcomes.index[outcomes == "Try"].to_numpy(dtype=int)
+        games = self.getGameCounts(
+            np.bincount(table.events["game"][trys], minlength=len(table.games))
+        )
+        title = f"Tap Pen Trys Per Game"
+        if self.nativeCharts:
+            return chartSpec(
+                "bar",
+                title,
+                list(games.keys()),
+                list(games.values()),
+                "Trys",
+            )
+        fig, ax = self.canvasPool.acquire()
+        ax.set_title(title)
+        bars = ax.bar(
             list(games.keys()),
             list(games.values()),
         )
         for bar in bars:
             height = bar.get_height()
-            plt.text(
+            ax.text(
                 bar.get_x() + bar.get_width() / 2.0,
                 (height / 2) if height != 0 else 1,
                 f"{int(height)}",
@@ -2127,57 +3028,33 @@ class StatMonkey:
                 va="center",
                 fontweight="bold",
             )
-        plt.ylabel("Trys")
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.subplots_adjust(bottom=0.25)
-        plt.savefig(path)
-        plt.close()
+        ax.set_ylabel("Trys")
+        ax.tick_params(axis="x", labelrotation=45)
+        fig.tight_layout()
+        fig.subplots_adjust(bottom=0.25)
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
         return path
 
     def getTapPenLocations(self):
         path = f"Stat PNGs/{self.teamName.replace(" ", "_")}_Tap_Pen_Locations.png"
         self.logger.info(f"Started {path}")
-        fig, ax = plt.subplots(figsize=(self.figWidth, self.figHeight))
+        fig, ax = self.canvasPool.acquire()
         self.drawRugbyPitch(ax)
-        xValues = []
-        yValues = []
-        colors = []
-        games = {}
-        for xmlFile in self.xmlFiles:
-            try:
-                tree = etree.parse(str(xmlFile))
-                root = tree.getroot()
-                tapPens = root.xpath(f"//instance[code='{self.teamName} Tap Pen']")
-                date = root.xpath("//SESSION_INFO")[0].text.split()[0]
-                games[date] = len(tapPens)
-                for instance in tapPens:
-                    xStart = (
-                        float(instance.xpath("label[group='X_Start']/text/text()")[0])
-                        + self.tryZone
-                    )
-                    yStart = self.fieldWidth - float(
-                        instance.xpath("label[group='Y_Start']/text/text()")[0]
-                    )
-
-                    xValues.append(xStart)
-                    yValues.append(yStart)
-                    if (
-                        str(instance.xpath("label[group='Poss Endset']/text/text()")[0])
-                        == "End Try"
-                    ):
-                        colors.append("#3BB273")
-                    else:
-                        colors.append("#1f77b4")
-            except etree.XMLSyntaxError as e:
-                print(f"Error parsing {xmlFile.name}: {e}")
+        table = self.getEventTable()
+        tapPens = table.codeMask(f"{self.teamName} Tap Pen")
+        xValues, yValues = self.getEventLocations("tapPens")
+        tryScored = table.labelCodes("Poss Endset")[tapPens] == table.values.lookup(
+            "End Try"
+        )
+        colors = np.where(tryScored, "#3BB273", "#1f77b4").tolist()
         pos = mpatches.Patch(color="#3BB273", label=f"Try Scored")
         ax.scatter(xValues, yValues, c=colors)
-        plt.title(f"Tap Pen Locations")
-        plt.legend(handles=[pos], loc="lower left")
-        plt.savefig(path)
-        plt.close()
+        ax.set_title(f"Tap Pen Locations")
+        ax.legend(handles=[pos], loc="lower left")
+        fig.savefig(path)
+        self.canvasPool.release(fig)
         self.logger.info(f"Finished {path}")
         return path
 
@@ -2189,15 +3066,18 @@ def main():
         "team",
         help="Team name spelt and capitalize the exact way it is referenced in Oval Insights XML",
     )
+    StatMonkey.addBuildArguments(parser)
 
     args = parser.parse_args()
 
     xml_dir = Path(args.folder)
     xml_files = list(xml_dir.glob("*.xml"))
     trackedTeam = str(args.team)
-    sm = StatMonkey(xml_files, trackedTeam)
+    options = StatMonkey.getBuildOptions(args, xml_files)
+    sm = StatMonkey(xml_files, trackedTeam, **options)
 
     stats1 = sm.getAllStats()
+    sm.writeQuarantine(args.quarantine)
 
     sm.addAllStatsToPres(stats1)
 
@@ -0,0 +1,202 @@
+import os
+import time
+import asyncio
+import argparse
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from EventTable import EventTable
+from StatMonkey import StatMonkey
+
+# The StatMonkey each render worker draws with, built once per process
+renderer = None
+
+
+def parseFile(xmlFile, data):
+    return EventTable([xmlFile], {xmlFile: data})
+
+
+def startRenderer(xmlFiles, teamName, options):
+    global renderer
+    renderer = StatMonkey(xmlFiles, teamName, **options)
+
+
+def renderStat(name, args):
+    # A failed slide is quarantined in this process's StatMonkey, so its
+    # entries go back with the path rather than dying with the worker
+    renderer.quarantine = []
+    path, state = renderer.renderStat(name, args)
+    return path, state, renderer.quarantine
+
+
+class StatPipeline:
+    # read -> parse -> aggregate, then render -> assemble, with a bounded
+    # queue between each stage. Rendering needs the whole season's table, so
+    # it starts once aggregation finishes; within each half the stages overlap
+
+    def __init__(
+        self,
+        xmlFiles,
+        teamName,
+        workers=None,
+        threads=False,
+        quarantinePath=None,
+        **options,
+    ):
+        self.xmlFiles = list(xmlFiles)
+        self.teamName = teamName
+        self.workers = workers or os.cpu_count() or 2
+        # Render on threads sharing this process's StatMonkey instead of
+        # worker processes; no spawn or table copy, but charts share the GIL
+        self.threads = threads
+        self.quarantinePath = quarantinePath
+        # StatMonkey constructor keywords, see StatMonkey.getOptions; every
+        # render process builds its StatMonkey from the same ones
+        self.options = options
+        self.queueSize = self.workers * 2
+        # Spawn rather than fork, the event loop already has threads running
+        self.context = multiprocessing.get_context("spawn")
+        self.statMonkey = StatMonkey(xmlFiles, teamName, **options)
+        self.logger = self.statMonkey.logger
+
+    async def read(self, readQueue):
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=4) as readPool:
+            for xmlFile in self.xmlFiles:
+                data = await loop.run_in_executor(readPool, xmlFile.read_bytes)
+                await readQueue.put((xmlFile, data))
+        await readQueue.put(None)
+
+    async def parse(self, readQueue, parseQueue, parsePool):
+        loop = asyncio.get_running_loop()
+        while (item := await readQueue.get()) is not None:
+            xmlFile, data = item
+            await parseQueue.put(
+                loop.run_in_executor(parsePool, parseFile, xmlFile, data)
+            )
+        await parseQueue.put(None)
+
+    async def aggregate(self, parseQueue):
+        tables = []
+        while (future := await parseQueue.get()) is not None:
+            tables.append(await future)
+        return EventTable.concat(tables)
+
+    def renderLocal(self, name, args):
+        # renderStat for threads, which quarantine into the shared StatMonkey
+        path, state = self.statMonkey.renderStat(name, args)
+        return path, state, []
+
+    async def plan(self, renderQueue, renderPool):
+        # Stats that pick players are waited on before the plan moves past
+        # them, everything else is left rendering while the plan carries on
+        loop = asyncio.get_running_loop()
+        sm = self.statMonkey
+        for name, args in sm.getStatPlan():
+            if self.threads:
+                future = loop.run_in_executor(renderPool, self.renderLocal, name, args)
+            else:
+                future = loop.run_in_executor(renderPool, renderStat, name, args)
+            await renderQueue.put(future)
+            if name in sm.playerPickers:
+                _, state, _ = await future
+                for attribute, players in state.items():
+                    setattr(sm, attribute, players)
+        await renderQueue.put(None)
+
+    async def assemble(self, renderQueue):
+        sm = self.statMonkey
+        statPaths = []
+        while (future := await renderQueue.get()) is not None:
+            path, _, quarantine = await future
+            sm.quarantine.extend(quarantine)
+            statPaths.append(path)
+            if path is not None:
+                sm.addStatToPres(path, save=False)
+        sm.prs.save(f"{self.teamName}.pptx")
+        if self.quarantinePath:
+            sm.writeQuarantine(self.quarantinePath)
+        return statPaths
+
+    async def run(self):
+        start = time.perf_counter()
+        # An archive's table is already parsed, only loose files go through
+        # read -> parse -> aggregate
+        table = self.options.get("eventTable")
+        if table is None:
+            readQueue = asyncio.Queue(self.queueSize)
+            parseQueue = asyncio.Queue(self.queueSize)
+            with ProcessPoolExecutor(self.workers, mp_context=self.context) as pool:
+                _, _, table = await asyncio.gather(
+                    self.read(readQueue),
+                    self.parse(readQueue, parseQueue, pool),
+                    self.aggregate(parseQueue),
+                )
+        sm = self.statMonkey
+        sm.eventTable = table
+        self.logger.info(
+            f"Ingested {len(table.games)} games in {time.perf_counter() - start:.2f}s"
+        )
+        sm.quarantine = table.quarantine + sm.validateSchema() + sm.validateStats()
+
+        renderQueue = asyncio.Queue(self.queueSize)
+        if self.threads:
+            renderPool = ThreadPoolExecutor(self.workers)
+        else:
+            renderPool = ProcessPoolExecutor(
+                self.workers,
+                mp_context=self.context,
+                initializer=startRenderer,
+                initargs=(
+                    self.xmlFiles,
+                    self.teamName,
+                    dict(self.options, eventTable=table),
+                ),
+            )
+        with renderPool:
+            _, statPaths = await asyncio.gather(
+                self.plan(renderQueue, renderPool),
+                self.assemble(renderQueue),
+            )
+        self.logger.info(
+            f"Built {len(statPaths)} slides in {time.perf_counter() - start:.2f}s"
+        )
+        return statPaths
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build a team's presentation with reading, parsing, rendering and slide assembly overlapped"
+    )
+    parser.add_argument("folder", help="Path to folder containing XML files")
+    parser.add_argument(
+        "team",
+        help="Team name spelt and capitalize the exact way it is referenced in Oval Insights XML",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Processes used for parsing and for rendering, defaults to one per CPU",
+    )
+    parser.add_argument(
+        "--threads",
+        action="store_true",
+        help="Render charts on threads instead of worker processes",
+    )
+    StatMonkey.addBuildArguments(parser)
+    args = parser.parse_args()
+    xml_files = list(Path(args.folder).glob("*.xml"))
+    options = StatMonkey.getBuildOptions(args, xml_files)
+    pipeline = StatPipeline(
+        xml_files,
+        str(args.team),
+        args.workers,
+        args.threads,
+        args.quarantine,
+        **options,
+    )
+    asyncio.run(pipeline.run())
+
+
+if __name__ == "__main__":
+    main()
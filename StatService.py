@@ -0,0 +1,210 @@
+import json
+import hashlib
+import logging
+import argparse
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import numpy as np
+from EventTable import EventTable
+from StatMonkey import StatMonkey
+from StatWatcher import StatWatcher
+
+
+class StatService:
+    # Season events stay in memory and each answer is kept in an LRU keyed
+    # by (team, stat, filters, file set), so a repeat query never re-parses
+    # or recounts. New or modified files in the folder are picked up on the
+    # next request
+    statGroups = {
+        "kicks": ["Player", "Kick Descriptor", "Kick Style"],
+        "linebreaks": ["Player"],
+        "scrums": ["Scrum Result"],
+        "turnovers": ["Player", "Error Descriptor"],
+        "carries": ["Player", "Carry Outcome", "Carry Dominance"],
+        "tackles": ["Player", "Tackle Dominance"],
+    }
+
+    def __init__(self, folder, cacheSize=256):
+        self.watcher = StatWatcher(folder, None)
+        self.cacheSize = cacheSize
+        self.cache = OrderedDict()
+        self.statMonkeys = {}
+        self.table = None
+        self.teams = set()
+        self.fileSetKey = None
+        self.lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self):
+        if self.watcher.scan() or self.table is None:
+            xmlFiles = sorted(self.watcher.tables)
+            self.table = EventTable.concat([self.watcher.tables[f] for f in xmlFiles])
+            self.statMonkeys = {}
+            self.teams = set(self.table.gameTeams()["team"].dropna())
+            sources = "\n".join(sorted(self.watcher.sources.values()))
+            self.fileSetKey = hashlib.sha1(sources.encode()).hexdigest()
+
+    def getStatMonkey(self, team):
+        # Unknown teams are a 400 rather than a count of nothing, which also
+        # keeps this to one StatMonkey per team in the events
+        if team not in self.teams:
+            raise ValueError(f"No team {team!r} in the events")
+        if team not in self.statMonkeys:
+            self.statMonkeys[team] = StatMonkey(
+                sorted(self.watcher.tables),
+                team,
+                mode="database",
+                eventTable=self.table,
+            )
+        return self.statMonkeys[team]
+
+    def getStatMask(self, sm, stat):
+        table = self.table
+        match stat:
+            case "kicks":
+                return sm.getKickMask()
+            case "linebreaks":
+                return sm.getQualityMask("Initial Break")
+            case "scrums":
+                return table.codeMask(f"{sm.teamName} Scrum")
+            case "turnovers":
+                return table.codeMask(f"{sm.teamName} Turnover")
+            case "carries":
+                return sm.getCarryMask()
+            case "tackles":
+                return sm.getTackleMask()
+
+    def getFilterMask(self, filters):
+        table = self.table
+        mask = np.ones(len(table), dtype=bool)
+        # Unknown names are a 400 rather than a count of nothing
+        if "player" in filters:
+            if table.values.lookup(filters["player"]) < 0:
+                raise ValueError(f"No player {filters['player']!r} in the events")
+            mask &= table.playerMask(filters["player"])
+        dates = table.games["date"]
+        games = np.ones(len(table.games), dtype=bool)
+        if "from" in filters:
+            games &= (dates >= filters["from"]).to_numpy()
+        if "to" in filters:
+            games &= (dates <= filters["to"]).to_numpy()
+        mask &= games[table.events["game"]]
+        for label in filters.get("label", []):
+            group, _, value = label.partition("=")
+            if table.groups.lookup(group) < 0 or table.values.lookup(value) < 0:
+                raise ValueError(f"No label {label!r} in the events")
+            mask &= table.labelMask(group, value)
+        return mask
+
+    def query(self, team, stat, filters):
+        if stat not in self.statGroups:
+            raise KeyError(stat)
+        with self.lock:
+            self.refresh()
+            key = (
+                team,
+                stat,
+                json.dumps(filters, sort_keys=True),
+                self.fileSetKey,
+            )
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                return self.cache[key]
+
+            sm = self.getStatMonkey(team)
+            mask = self.getStatMask(sm, stat) & self.getFilterMask(filters)
+            counts = {}
+            for group in self.statGroups[stat]:
+                if group == "Error Descriptor":
+                    counts[group] = sm.countErrors(mask)
+                else:
+                    counts[group] = sm.countBy(mask, group)
+            result = {
+                "team": team,
+                "stat": stat,
+                "filters": filters,
+                "games": len(np.unique(self.table.events["game"][mask])),
+                "total": int(mask.sum()),
+                "counts": counts,
+            }
+            self.cache[key] = result
+            if len(self.cache) > self.cacheSize:
+                self.cache.popitem(last=False)
+            return result
+
+
+class StatRequestHandler(BaseHTTPRequestHandler):
+    # GET /stats lists the stats, GET /stats/<stat>?team=...&player=...
+    # &from=YYYY-MM-DD&to=YYYY-MM-DD&label=Group=Value (repeatable) runs one
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        if parts == ["stats"]:
+            self.sendJson(200, list(StatService.statGroups))
+            return
+        if len(parts) != 2 or parts[0] != "stats":
+            self.sendJson(404, {"error": f"Unknown path {url.path}"})
+            return
+        if parts[1] not in StatService.statGroups:
+            self.sendJson(404, {"error": f"Unknown stat {parts[1]}"})
+            return
+        params = parse_qs(url.query)
+        if "team" not in params:
+            self.sendJson(400, {"error": "team is required"})
+            return
+        filters = {
+            name: params[name][0] for name in ["player", "from", "to"] if name in params
+        }
+        if "label" in params:
+            if not all("=" in label for label in params["label"]):
+                self.sendJson(400, {"error": "label filters look like Group=Value"})
+                return
+            filters["label"] = sorted(params["label"])
+        try:
+            result = self.server.service.query(params["team"][0], parts[1], filters)
+        except ValueError as e:
+            self.sendJson(400, {"error": str(e)})
+            return
+        except Exception as e:
+            logging.exception(f"Query {self.path} failed")
+            self.sendJson(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        self.sendJson(200, result)
+
+    def sendJson(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve season stats from a folder of XML files as JSON"
+    )
+    parser.add_argument("folder", help="Path to folder containing XML files")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8035, help="Port to listen on")
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=256,
+        help="Number of query results kept in memory",
+    )
+    args = parser.parse_args()
+    server = ThreadingHTTPServer((args.host, args.port), StatRequestHandler)
+    server.service = StatService(args.folder, args.cache_size)
+    print(f"Serving stats on http://{args.host}:{args.port}/stats")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
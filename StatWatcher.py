@@ -0,0 +1,141 @@
+import time
+import argparse
+import logging
+from pathlib import Path
+from EventTable import EventTable
+from EventArchive import EventArchive
+from StatMonkey import StatMonkey
+
+
+class StatWatcher:
+    # Polls a folder for match XML and keeps the deck current, re-rendering
+    # only the slides whose input events changed since the last pass
+
+    def __init__(
+        self,
+        folder,
+        teamName,
+        interval=5.0,
+        **options,
+    ):
+        self.folder = Path(folder)
+        self.teamName = teamName
+        self.interval = interval
+        # StatMonkey constructor keywords, see StatMonkey.getOptions
+        self.options = options
+        # Every ingested file is counted into the catalog as it is parsed
+        self.schemaCatalog = options.get("schemaCatalog")
+        # Path -> source key and parsed table for every file ingested so far
+        self.sources = {}
+        self.tables = {}
+        # (method, args) -> input fingerprint and image path or chart data of
+        # its last render
+        self.fingerprints = {}
+        self.statPaths = {}
+        self.statMonkey = None
+        logging.basicConfig(
+            level=logging.INFO,
+            format="%(asctime)s %(message)s",
+        )
+        self.logger = logging.getLogger()
+
+    def scan(self):
+        # Parse only new or modified files; returns whether anything changed
+        changed = False
+        current = {}
+        for xmlFile in sorted(self.folder.glob("*.xml")):
+            try:
+                key = EventArchive.getSourceKey(xmlFile)
+            except FileNotFoundError:
+                continue
+            if self.sources.get(xmlFile) == key:
+                current[xmlFile] = key
+                continue
+            table = EventTable([xmlFile])
+            if len(table.games) == 0:
+                # Most likely still being copied in, try again next poll
+                continue
+            self.logger.info(f"Ingested {xmlFile.name}")
+            self.tables[xmlFile] = table
+            if self.schemaCatalog is not None and self.schemaCatalog.record(table):
+                self.schemaCatalog.save()
+            current[xmlFile] = key
+            changed = True
+        for xmlFile in set(self.sources) - set(current):
+            if not xmlFile.exists():
+                self.logger.info(f"Dropped {xmlFile.name}")
+                del self.tables[xmlFile]
+                changed = True
+            elif xmlFile in self.tables:
+                # Unreadable rewrite of a known file, keep the last good parse
+                current[xmlFile] = self.sources[xmlFile]
+        self.sources = current
+        return changed
+
+    def render(self):
+        xmlFiles = sorted(self.tables)
+        table = EventTable.concat([self.tables[f] for f in xmlFiles])
+        if self.statMonkey is None:
+            self.statMonkey = StatMonkey(xmlFiles, self.teamName, **self.options)
+        sm = self.statMonkey
+        sm.xmlFiles = xmlFiles
+        sm.eventTable = table
+        sm.gridCache = {}
+        for difference in sm.validateSchema():
+            self.logger.warning(f"Schema: {difference['reason']}")
+
+        statPaths = []
+        rendered = 0
+        for name, args in sm.getStatPlan():
+            stat = (name, args)
+            fingerprint = sm.getStatFingerprint(name, args)
+            if self.fingerprints.get(stat) != fingerprint:
+                self.statPaths[stat] = sm.getStat(name, args)
+                self.fingerprints[stat] = fingerprint
+                rendered += 1
+            statPaths.append(self.statPaths[stat])
+        sm.buildPres(statPaths)
+        self.logger.info(
+            f"Re-rendered {rendered} of {len(statPaths)} slides from {len(xmlFiles)} games"
+        )
+        return rendered
+
+    def run(self):
+        self.logger.info(f"Watching {self.folder} every {self.interval}s")
+        while True:
+            if self.scan():
+                self.render()
+            time.sleep(self.interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Watch a folder of XML files and keep a team's presentation up to date"
+    )
+    parser.add_argument("folder", help="Path to folder containing XML files")
+    parser.add_argument(
+        "team",
+        help="Team name spelt and capitalize the exact way it is referenced in Oval Insights XML",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=5.0,
+        help="Seconds between polls of the folder",
+    )
+    StatMonkey.addArguments(parser)
+    args = parser.parse_args()
+    watcher = StatWatcher(
+        args.folder,
+        str(args.team),
+        args.interval,
+        **StatMonkey.getOptions(args),
+    )
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
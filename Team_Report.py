@@ -8,12 +8,123 @@ from pptx.util import Inches
 import logging
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 import argparse
 import statistics
 from pathlib import Path
 import shutil
 from collections import Counter
+import hashlib
+import pickle
+import re
+from CanvasPool import CanvasPool
+from NativeChart import chartSpec, isChartSpec, addChart
+
+snapshot_sheets = [
+    "Teams Average",
+    "Kicks",
+    "Mauls",
+    "Turnover Won",
+    "Turnover Con",
+    "Penalties",
+    "Tackles",
+    "Carries",
+    "Ruck Entries",
+    "Rucks",
+    "Lineouts",
+    "Scrums",
+    "Restarts",
+    "22m Entries",
+    "Tries Overview",
+    "Try Times",
+]
+snapshot_cache_dir = Path(".snapshot_cache")
+
+
+def read_snapshot(file_path):
+    # Each section is one ranked table: title, team df and, for sheets that
+    # also report opposition numbers, the opp title and opp df
+    all_sheets_data = pd.read_excel(file_path, sheet_name=snapshot_sheets, header=3)
+    sections = []
+    for sheet in all_sheets_data.keys():
+        match sheet:
+            case (
+                "Teams Average"
+                | "Lineouts"
+                | "Restarts"
+                | "22m Entries"
+                | "Tries Overview"
+            ):
+                title_df = pd.read_excel(
+                    file_path,
+                    sheet_name=sheet,
+                    header=None,
+                    skiprows=range(1, 15),
+                    nrows=2,
+                )
+                sections.append(
+                    {
+                        "sheet": sheet,
+                        "title": title_df.iloc[0, 0],
+                        "df": all_sheets_data[sheet].iloc[:11],
+                        "opp_title": title_df.iloc[1, 0],
+                        "opp_df": all_sheets_data[sheet].iloc[15:27],
+                    }
+                )
+            case (
+                "Kicks"
+                | "Turnover Won"
+                | "Turnover Con"
+                | "Penalties"
+                | "Tackles"
+                | "Carries"
+                | "Ruck Entries"
+                | "Rucks"
+            ):
+                title_df = pd.read_excel(
+                    file_path,
+                    sheet_name=sheet,
+                    header=None,
+                    skiprows=15,
+                    nrows=2,
+                )
+                sections.append(
+                    {
+                        "sheet": sheet,
+                        "title": title_df.iloc[0, 0],
+                        "df": all_sheets_data[sheet].iloc[15:27],
+                        "opp_title": None,
+                        "opp_df": None,
+                    }
+                )
+    return sections
+
+
+def load_snapshot(file_path):
+    # Parsed workbooks are pickled under a key of path, size and mtime so a
+    # season of weekly files is only run through read_excel once
+    file_path = Path(file_path)
+    file_stat = file_path.stat()
+    key = hashlib.sha1(
+        f"{file_path.resolve()}:{file_stat.st_size}:{file_stat.st_mtime_ns}".encode()
+    ).hexdigest()
+    cache_path = snapshot_cache_dir / f"{key}.pkl"
+    if cache_path.is_file():
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+    sections = read_snapshot(file_path)
+    snapshot_cache_dir.mkdir(parents=True, exist_ok=True)
+    with open(cache_path, "wb") as f:
+        pickle.dump(sections, f)
+    return sections
+
+
+def snapshot_date(file_path):
+    # Prefer a YYYY-MM-DD stamp in the file name, fall back to the mtime
+    file_path = Path(file_path)
+    found = re.search(r"\d{4}-\d{2}-\d{2}", file_path.stem)
+    if found:
+        return pd.Timestamp(found.group())
+    return pd.Timestamp(file_path.stat().st_mtime, unit="s").normalize()
 
 
 class TeamReport:
@@ -28,185 +139,173 @@ class TeamReport:
         "Mauls Lost",
     ]
 
-    def __init__(self, team, file_path):
+    def __init__(self, team, file_path=None, sections=None, native_charts=False):
         self.prs = Presentation()
         self.outlier_stats = []
         self.stats_covered = []
         self.team = team
         self.excel_file = file_path
-        self.all_sheets_data = pd.read_excel(
-            self.excel_file,
-            sheet_name=[
-                "Teams Average",
-                "Kicks",
-                "Mauls",
-                "Turnover Won",
-                "Turnover Con",
-                "Penalties",
-                "Tackles",
-                "Carries",
-                "Ruck Entries",
-                "Rucks",
-                "Lineouts",
-                "Scrums",
-                "Restarts",
-                "22m Entries",
-                "Tries Overview",
-                "Try Times",
-            ],
-            header=3,
-        )
+        self.canvas_pool = CanvasPool(11, 6)
+        # Graphs as native pptx chart data instead of images in graphs/
+        self.native_charts = native_charts
+        self.charts = []
+        # Sections can also come straight from match XML via LeagueTable
+        self.sections = sections if sections is not None else load_snapshot(file_path)
 
     def get_full_report(self, team):
         pass
 
     def get_outlier_stats(self):
-        for sheet in self.all_sheets_data.keys():
-            match sheet:
-                case (
-                    "Teams Average"
-                    | "Lineouts"
-                    | "Restarts"
-                    | "22m Entries"
-                    | "Tries Overview"
-                ):
-                    title_df = pd.read_excel(
-                        self.excel_file,
-                        sheet_name=sheet,
-                        header=None,
-                        skiprows=range(1, 15),
-                        nrows=2,
-                    )
-                    sheet_title = title_df.iloc[0, 0]
-                    sheet_title_opps = title_df.iloc[1, 0]
-                    team_df = self.all_sheets_data[sheet].iloc[:11]
-                    opp_df = self.all_sheets_data[sheet].iloc[15:27]
-                    for col in team_df.columns[1:]:
-                        if col in self.ignore_list or col in self.stats_covered:
-                            continue
-                        self.stats_covered.append(col)
-                        sorted_team_df = team_df.sort_values(by=col, ascending=False)
-                        sorted_opp_df = opp_df.sort_values(by=col, ascending=False)
-                        sorted_teams = sorted_team_df.iloc[:, 0].tolist()
-                        sorted_opps = sorted_opp_df.iloc[:, 0].tolist()
-                        team_value = sorted_team_df[col].iloc[
-                            sorted_teams.index(self.team)
-                        ]
-                        team_values = sorted_team_df[col].values
-                        team_values_set = set(team_values)
-                        opp_value = sorted_opp_df[col].iloc[
-                            sorted_opps.index(self.team)
-                        ]
-                        opp_values = sorted_opp_df[col].values
-                        opp_values_set = set(opp_values)
-                        # If all values are the same
-                        if len(team_values_set) <= 1 or len(opp_values_set) <= 1:
-                            continue
-                        # If there are 2 unique values and our team is not the outlier
-                        elif (
-                            len(team_values_set) <= 2
-                            and team_value
-                            == max(team_values, key=Counter(team_values).get)
-                        ) or (
-                            len(opp_values_set) <= 2
-                            and opp_value
-                            == max(opp_values, key=Counter(opp_values).get)
-                        ):
-                            continue
-                        if (
-                            self.team in sorted_teams[:3]
-                            or self.team in sorted_teams[-3:]
-                        ):
-                            stat = {
-                                "title": sheet_title + ": " + col,
-                                "value": team_value,
-                                "rank": sorted_teams.index(self.team) + 1,
-                                "values": team_values,
-                                "sorted_teams": sorted_teams,
-                            }
-                            self.outlier_stats.append(stat)
-
-                        if (
-                            self.team in sorted_opps[:3]
-                            or self.team in sorted_opps[-3:]
-                        ):
-                            stat = {
-                                "title": sheet_title_opps + " " + col,
-                                "value": opp_value,
-                                "rank": sorted_opps.index(self.team) + 1,
-                                "values": opp_values,
-                                "sorted_teams": sorted_opps,
-                            }
-                            self.outlier_stats.append(stat)
-                case (
-                    "Kicks"
-                    | "Turnover Won"
-                    | "Turnover Con"
-                    | "Penalties"
-                    | "Tackles"
-                    | "Carries"
-                    | "Ruck Entries"
-                    | "Rucks"
-                ):
-                    title_df = pd.read_excel(
-                        self.excel_file,
-                        sheet_name=sheet,
-                        header=None,
-                        skiprows=15,
-                        nrows=2,
-                    )
-                    sheet_title = title_df.iloc[0, 0]
-                    df = self.all_sheets_data[sheet].iloc[15:27]
-                    for col in df.columns[1:]:
-                        if col in self.ignore_list or col in self.stats_covered:
-                            continue
-                        sorted_df = df.sort_values(by=col, ascending=False)
-                        sorted_teams = sorted_df.iloc[:, 0].tolist()
-                        values = sorted_df[col].values
-                        values_set = set(values)
-                        team_value = sorted_df[col].iloc[sorted_teams.index(self.team)]
-                        # If all values are the same
-                        if len(values_set) <= 1:
-                            continue
-                        # If there are 2 unique values and our team is not the outlier
-                        elif len(values_set) <= 2 and team_value == max(
-                            values, key=Counter(values).get
-                        ):
-                            continue
-
-                        if (
-                            self.team in sorted_teams[:3]
-                            or self.team in sorted_teams[-3:]
-                        ):
-                            stat = {
-                                "title": sheet_title + ": " + col,
-                                "value": team_value,
-                                "rank": sorted_teams.index(self.team) + 1,
-                                "values": values,
-                                "sorted_teams": sorted_teams,
-                            }
-                            self.outlier_stats.append(stat)
+        for section in self.sections:
+            if section["opp_df"] is not None:
+                sheet_title = section["title"]
+                sheet_title_opps = section["opp_title"]
+                team_df = section["df"]
+                opp_df = section["opp_df"]
+                for col in team_df.columns[1:]:
+                    if col in self.ignore_list or col in self.stats_covered:
+                        continue
+                    self.stats_covered.append(col)
+                    sorted_team_df = team_df.sort_values(by=col, ascending=False)
+                    sorted_opp_df = opp_df.sort_values(by=col, ascending=False)
+                    sorted_teams = sorted_team_df.iloc[:, 0].tolist()
+                    sorted_opps = sorted_opp_df.iloc[:, 0].tolist()
+                    team_value = sorted_team_df[col].iloc[sorted_teams.index(self.team)]
+                    team_values = sorted_team_df[col].values
+                    team_values_set = set(team_values)
+                    opp_value = sorted_opp_df[col].iloc[sorted_opps.index(self.team)]
+                    opp_values = sorted_opp_df[col].values
+                    opp_values_set = set(opp_values)
+                    # If all values are the same
+                    if len(team_values_set) <= 1 or len(opp_values_set) <= 1:
+                        continue
+                    # If there are 2 unique values and our team is not the outlier
+                    elif (
+                        len(team_values_set) <= 2
+                        and team_value
+                        == max(team_values, key=Counter(team_values).get)
+                    ) or (
+                        len(opp_values_set) <= 2
+                        and opp_value == max(opp_values, key=Counter(opp_values).get)
+                    ):
+                        continue
+                    if self.team in sorted_teams[:3] or self.team in sorted_teams[-3:]:
+                        stat = {
+                            "title": sheet_title + ": " + col,
+                            "value": team_value,
+                            "rank": sorted_teams.index(self.team) + 1,
+                            "values": team_values,
+                            "sorted_teams": sorted_teams,
+                        }
+                        self.outlier_stats.append(stat)
+
+                    if self.team in sorted_opps[:3] or self.team in sorted_opps[-3:]:
+                        stat = {
+                            "title": sheet_title_opps + " " + col,
+                            "value": opp_value,
+                            "rank": sorted_opps.index(self.team) + 1,
+                            "values": opp_values,
+                            "sorted_teams": sorted_opps,
+                        }
+                        self.outlier_stats.append(stat)
+            else:
+                sheet_title = section["title"]
+                df = section["df"]
+                for col in df.columns[1:]:
+                    if col in self.ignore_list or col in self.stats_covered:
+                        continue
+                    sorted_df = df.sort_values(by=col, ascending=False)
+                    sorted_teams = sorted_df.iloc[:, 0].tolist()
+                    values = sorted_df[col].values
+                    values_set = set(values)
+                    team_value = sorted_df[col].iloc[sorted_teams.index(self.team)]
+                    # If all values are the same
+                    if len(values_set) <= 1:
+                        continue
+                    # If there are 2 unique values and our team is not the outlier
+                    elif len(values_set) <= 2 and team_value == max(
+                        values, key=Counter(values).get
+                    ):
+                        continue
+
+                    if self.team in sorted_teams[:3] or self.team in sorted_teams[-3:]:
+                        stat = {
+                            "title": sheet_title + ": " + col,
+                            "value": team_value,
+                            "rank": sorted_teams.index(self.team) + 1,
+                            "values": values,
+                            "sorted_teams": sorted_teams,
+                        }
+                        self.outlier_stats.append(stat)
 
         return self.outlier_stats
 
+    def flag_trends(self, trend):
+        # Tag each outlier as new or persistent and add the stats that just
+        # dropped out of the top/bottom 3
+        movers = trend.get_movers(self.team)
+        for stat in self.outlier_stats:
+            if stat["title"] not in movers.index:
+                continue
+            mover = movers.loc[stat["title"]]
+            if mover["entered"]:
+                stat["trend"] = "New"
+            else:
+                stat["trend"] = f"{int(mover['streak'])} Weeks"
+        for title, mover in movers[movers["exited"]].iterrows():
+            latest = trend.get_latest(title)
+            sorted_teams = latest.index.tolist()
+            stat = {
+                "title": title,
+                "value": mover["value"],
+                "rank": int(mover["rank"]),
+                "values": latest.values,
+                "sorted_teams": sorted_teams,
+                "trend": f"Left Top/Bottom 3, Was Rank {int(mover['rank'] - mover['rank_change'])}",
+            }
+            self.outlier_stats.append(stat)
+        return self.outlier_stats
+
     def draw_stats(self):
+        if self.native_charts:
+            self.charts = []
+            for stat in self.outlier_stats:
+                title = stat["title"]
+                if "trend" in stat:
+                    title = f"{stat['title']} ({stat['trend']})"
+                colors = ["#1f77b4"] * len(stat["sorted_teams"])
+                if self.team in stat["sorted_teams"]:
+                    colors[stat["sorted_teams"].index(self.team)] = "#ff7f0e"
+                self.charts.append(
+                    chartSpec(
+                        "bar",
+                        title,
+                        stat["sorted_teams"],
+                        stat["values"],
+                        colors=colors,
+                    )
+                )
+            return
         if Path("graphs").is_dir():
             shutil.rmtree(Path("graphs"))
         Path("graphs").mkdir(parents=True, exist_ok=True)
         for stat in self.outlier_stats:
             path = "graphs/" + stat["title"]
-            plt.figure(figsize=(11, 6))
-            plt.title(stat["title"])
+            fig, ax = self.canvas_pool.acquire()
+            if "trend" in stat:
+                ax.set_title(f"{stat['title']} ({stat['trend']})")
+            else:
+                ax.set_title(stat["title"])
             colors = ["#1f77b4"] * len(stat["sorted_teams"])
             if self.team in stat["sorted_teams"]:
                 team_index = stat["sorted_teams"].index(self.team)
                 colors[team_index] = "#ff7f0e"
-            bars = plt.bar(
+            bars = ax.bar(
                 list(stat["sorted_teams"]), list(stat["values"]), color=colors
             )
             for bar in bars:
                 height = bar.get_height()
-                plt.text(
+                ax.text(
                     bar.get_x() + bar.get_width() / 2.0,
                     (height / 2) if height != 0 else 1,
                     f"{round(height, 2)}",
@@ -214,13 +313,17 @@ class TeamReport:
                     va="center",
                     fontweight="bold",
                 )
-            plt.xticks(rotation=45)
-            plt.tight_layout()
-            plt.subplots_adjust(bottom=0.25)
-            plt.savefig(path)
-            plt.close()
+            ax.tick_params(axis="x", labelrotation=45)
+            fig.tight_layout()
+            fig.subplots_adjust(bottom=0.25)
+            fig.savefig(path)
+            self.canvas_pool.release(fig)
 
     def add_graphs_to_pres(self):
+        if self.native_charts:
+            for chart in self.charts:
+                self.add_stat_to_pres(chart)
+            return
         graphs_dir = Path("graphs")
         for file_path in graphs_dir.iterdir():
             if file_path.is_file():
@@ -238,7 +341,10 @@ class TeamReport:
 
         top = Inches(1.5)
         left = Inches(2.5)
-        slide.shapes.add_picture(statImgPath, left, top)
+        if isChartSpec(statImgPath):
+            addChart(slide, statImgPath, left, top)
+        else:
+            slide.shapes.add_picture(statImgPath, left, top)
 
         top = Inches(0)
         left = Inches(0)
@@ -274,6 +380,83 @@ class TeamReport:
         pass
 
 
+class SeasonTrend:
+    def __init__(self, file_paths):
+        frames = []
+        for file_path in file_paths:
+            frame = self.snapshot_values(load_snapshot(file_path))
+            frame["date"] = snapshot_date(file_path)
+            frames.append(frame)
+        store = pd.concat(frames, ignore_index=True)
+        # One value per stat, team and week; a re-delivered week replaces the old one
+        store = store.drop_duplicates(subset=["date", "title", "team"], keep="last")
+        self.store = store.set_index(["date", "title", "team"]).sort_index()
+
+        # Rows are (title, team), columns are snapshot dates
+        self.values = self.store["value"].unstack("date")
+        by_title = self.values.groupby(level="title")
+        self.ranks = by_title.rank(ascending=False, method="first")
+        team_counts = by_title.transform("count")
+        self.in_extreme = (self.ranks <= 3) | (self.ranks > team_counts - 3)
+        self.rank_changes = self.ranks.diff(axis=1)
+        self.value_changes = self.values.diff(axis=1)
+        previous = self.in_extreme.shift(1, axis=1, fill_value=False).astype(bool)
+        self.entered = self.in_extreme & ~previous
+        # A stat missing from a week has no rank, which isn't leaving the top 3
+        self.exited = ~self.in_extreme & previous & self.values.notna()
+        # Trailing run of weeks each stat has been an outlier
+        self.streaks = (
+            self.in_extreme.iloc[:, ::-1].astype(int).cummin(axis=1).sum(axis=1)
+        )
+
+    @staticmethod
+    def snapshot_values(sections):
+        # Long (title, team, value) rows using the same titles as get_outlier_stats
+        frames = []
+        for section in sections:
+            tables = [(section["title"] + ": ", section["df"])]
+            if section["opp_df"] is not None:
+                tables.append((section["opp_title"] + " ", section["opp_df"]))
+            for prefix, df in tables:
+                cols = [col for col in df.columns[1:] if col not in TeamReport.ignore_list]
+                long_df = df.melt(
+                    id_vars=df.columns[0], value_vars=cols, var_name="stat"
+                ).dropna(subset=[df.columns[0]])
+                frames.append(
+                    pd.DataFrame(
+                        {
+                            "title": prefix + long_df["stat"].astype(str),
+                            "team": long_df[df.columns[0]].astype(str),
+                            "value": pd.to_numeric(long_df["value"], errors="coerce"),
+                        }
+                    )
+                )
+        return pd.concat(frames, ignore_index=True)
+
+    def get_movers(self, team):
+        latest = self.values.columns[-1]
+        team_rows = self.values.index.get_level_values("team") == team
+        movers = pd.DataFrame(
+            {
+                "value": self.values.loc[team_rows, latest],
+                "rank": self.ranks.loc[team_rows, latest],
+                "rank_change": self.rank_changes.loc[team_rows, latest],
+                "value_change": self.value_changes.loc[team_rows, latest],
+                "entered": self.entered.loc[team_rows, latest],
+                "exited": self.exited.loc[team_rows, latest],
+                "streak": self.streaks[team_rows],
+            }
+        )
+        if len(self.values.columns) < 2:
+            movers["entered"] = False
+            movers["exited"] = False
+        return movers.droplevel("team")
+
+    def get_latest(self, title):
+        latest = self.values.loc[title, self.values.columns[-1]].dropna()
+        return latest.sort_values(ascending=False)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Generate a presentation with key stats for an MLR team."
@@ -286,10 +469,23 @@ def main():
         "team",
         help="Team name spelt and capitalize the exact way it is referenced in Oval Insights file",
     )
+    parser.add_argument(
+        "--history",
+        nargs="+",
+        default=[],
+        help="Earlier weekly Team Season Report files, used to flag stats that moved into or out of the top/bottom 3",
+    )
+    parser.add_argument(
+        "--native-charts",
+        action="store_true",
+        help="Build the graphs as editable PowerPoint charts instead of images",
+    )
     args = parser.parse_args()
-    tr = TeamReport(args.team, args.excel_file)
+    tr = TeamReport(args.team, args.excel_file, native_charts=args.native_charts)
     # print(tr.get_outlier_stats())
     tr.get_outlier_stats()
+    if args.history:
+        tr.flag_trends(SeasonTrend(args.history + [args.excel_file]))
     tr.draw_stats()
     tr.add_graphs_to_pres()
 